@@ -0,0 +1,11 @@
+from .synthetic import (
+    SyntheticDocument, SyntheticDocumentGenerator, DOCUMENT_KINDS,
+    KIND_CARTA_CALCULO, KIND_EPI, KIND_GENERIC, create_sheet, create_text_document,
+)
+from .common import summarize, percentile, write_results, get_environment_info
+
+__all__ = [
+    'SyntheticDocument', 'SyntheticDocumentGenerator', 'DOCUMENT_KINDS',
+    'KIND_CARTA_CALCULO', 'KIND_EPI', 'KIND_GENERIC', 'create_sheet', 'create_text_document',
+    'summarize', 'percentile', 'write_results', 'get_environment_info',
+]
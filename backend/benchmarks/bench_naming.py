@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks da camada de nomeação (sem OCR), alimentada com TableDocuments
+criadas a partir de texto sintético:
+    fmt_str_file, remove_bad_chars
+    CartaCalculo.get_line_key / cidade / medidor
+    FichaEpi.get_date_doc
+    GenericDocument._get_value_with_str
+    FindNameInnerData.get_new_name (planilhas com N linhas)
+
+Cada caso é medido em vários tamanhos (linhas por documento ou linhas da planilha),
+o resultado traz ops/s de cada ponto e o expoente da curva de escala
+(tempo ~ tamanho^expoente, 1.0 = linear).
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_naming --lines 10,50,200,1000 --rows 100,1000,10000 \\
+        --output benchmark_naming.json
+
+Os pontos medidos são gravados no histórico, exceto com --no-history.
+"""
+from __future__ import annotations
+from typing import Any, Callable
+import argparse
+import math
+import os
+import random
+import statistics
+import tempfile
+import time
+import soup_files as sp
+from sheet_stream import TableDocuments
+from organize_stream import (
+    __version__, CartaCalculo, FilterData, FilterText, FindNameInnerData, GenericDocument,
+    fmt_str_file, remove_bad_chars,
+)
+from organize_stream.cartas import FichaEpi
+from benchmarks.common import (
+    get_environment_info, parse_int_list, parse_str_list, summarize, write_results
+)
+from benchmarks.history import add_history_arguments, record_history
+from benchmarks.synthetic import (
+    COL_EXTRA, COL_KEY, COL_NEW_NAME, KIND_CARTA_CALCULO, KIND_EPI, KIND_GENERIC,
+    SyntheticDocument, create_sheet, create_text_document,
+)
+
+# Parâmetro variado em cada caso.
+PARAM_LINES: str = 'lines_per_document'
+PARAM_ROWS: str = 'sheet_rows'
+PARAM_NAME_LENGTH: str = 'name_length'
+
+
+def create_table(kind: str, num_lines: int, *, seed: int = 0, num: int = 0) -> tuple[TableDocuments, str]:
+    """
+    Retorna (tabela com num_lines linhas de texto, chave do documento), como a tabela
+    gerada pelo OCR de um PDF com o caminho e a extensão preenchidos.
+    """
+    rnd = random.Random(f'{seed}-{kind}-{num}-{num_lines}')
+    lines, key, _ = create_text_document(kind, rnd, num, num_lines=num_lines)
+    file_path: str = os.path.join(tempfile.gettempdir(), 'organize_bench', f'{kind}_{num:05d}.pdf')
+    tb = TableDocuments.create_from_values(
+        lines, page_num='1', file_path=file_path, dir_path=os.path.dirname(file_path), file_type='.pdf'
+    )
+    return tb, key
+
+
+class MicroBench(object):
+    """
+    Mede uma função sem argumentos: calibra o número de chamadas para cada amostra
+    durar ao menos min_time segundos e coleta repeat amostras (segundos por chamada).
+    """
+
+    def __init__(self, *, repeat: int = 5, min_time: float = 0.2):
+        self.repeat: int = max(1, repeat)
+        self.min_time: float = min_time
+
+    def __calibrate(self, func: Callable[[], Any]) -> int:
+        loops: int = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(loops):
+                func()
+            elapsed = time.perf_counter() - start
+            if (elapsed >= self.min_time) or (loops >= 1_000_000):
+                return loops
+            # Estimativa do número de chamadas para atingir min_time, no mínimo dobra.
+            loops = max(loops * 2, int(loops * self.min_time / max(elapsed, 1e-9)))
+
+    def run(self, func: Callable[[], Any], *, ops: int = 1) -> dict[str, Any]:
+        """
+        Mede func, que executa ops operações em cada chamada.
+        """
+        loops: int = self.__calibrate(func)
+        samples: list[float] = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                func()
+            samples.append((time.perf_counter() - start) / (loops * ops))
+        best: float = min(samples)
+        return {
+            'loops': loops,
+            'ops_per_sec': (1 / statistics.median(samples)) if statistics.median(samples) > 0 else 0.0,
+            'best_ops_per_sec': (1 / best) if best > 0 else 0.0,
+            'seconds_per_op': summarize(samples),
+            'samples': samples,
+        }
+
+
+def scaling_exponent(points: list[dict[str, Any]]) -> float | None:
+    """
+    Inclinação (mínimos quadrados) de log(segundos por operação) x log(tamanho).
+    """
+    xs: list[float] = []
+    ys: list[float] = []
+    for p in points:
+        seconds: float = p['seconds_per_op']['p50']
+        if (p['value'] > 0) and (seconds > 0):
+            xs.append(math.log(p['value']))
+            ys.append(math.log(seconds))
+    if len(xs) < 2:
+        return None
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    den: float = sum((x - mean_x) ** 2 for x in xs)
+    if den == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / den
+
+
+def create_name_samples(length: int, *, count: int = 100, seed: int = 0) -> list[str]:
+    # Nomes como os gerados a partir das linhas do OCR: acentos, pontuação e espaços repetidos.
+    rnd = random.Random(f'{seed}-names-{length}')
+    chars: str = 'ABCDEFGHIJKLMNOPQRSTUVWXYZÁÉÍÓÚÇÃÕ0123456789  -/.:;,()'
+    return [f"A{''.join(rnd.choice(chars) for _ in range(max(0, length - 2)))}Z" for _ in range(count)]
+
+
+def bench_strings(bench: MicroBench, lengths: list[int], seed: int) -> list[dict[str, Any]]:
+    cases: list[dict[str, Any]] = []
+    for name, func in (('fmt_str_file', fmt_str_file), ('remove_bad_chars', remove_bad_chars)):
+        points: list[dict[str, Any]] = []
+        for length in lengths:
+            names = create_name_samples(length, seed=seed)
+
+            def _run(_names=names, _func=func):
+                for n in _names:
+                    _func(n)
+
+            # Uma operação = um nome formatado.
+            point = bench.run(_run, ops=len(names))
+            point['value'] = length
+            points.append(point)
+        cases.append({'case': name, 'param': PARAM_NAME_LENGTH, 'points': points})
+    return cases
+
+
+def bench_documents(bench: MicroBench, line_sizes: list[int], seed: int) -> list[dict[str, Any]]:
+    # (caso, tipo de documento, criação do documento a partir da tabela, operação medida)
+    specs: list[tuple[str, str, Callable[[TableDocuments], Any], Callable[[Any], Any]]] = [
+        ('CartaCalculo.get_line_key', KIND_CARTA_CALCULO, CartaCalculo.create, lambda d: d.get_line_key()),
+        ('CartaCalculo.cidade', KIND_CARTA_CALCULO, CartaCalculo.create, lambda d: d.cidade),
+        ('CartaCalculo.medidor', KIND_CARTA_CALCULO, CartaCalculo.create, lambda d: d.medidor),
+        ('FichaEpi.get_date_doc', KIND_EPI, FichaEpi.create, lambda d: d.get_date_doc()),
+        (
+            'GenericDocument._get_value_with_str', KIND_GENERIC,
+            lambda tb: GenericDocument(tb, filters=FilterText('PROTOCOLO')),
+            lambda d: d._get_value_with_str(d.tb),
+        ),
+    ]
+    cases: list[dict[str, Any]] = []
+    for name, kind, create, operation in specs:
+        points: list[dict[str, Any]] = []
+        for num_lines in line_sizes:
+            tb, _ = create_table(kind, num_lines, seed=seed)
+            doc = create(tb)
+            point = bench.run(lambda _doc=doc: operation(_doc))
+            point['value'] = num_lines
+            point['result'] = f'{operation(doc)}'
+            points.append(point)
+        cases.append({'case': name, 'param': PARAM_LINES, 'points': points})
+    return cases
+
+
+def bench_find_name(bench: MicroBench, row_sizes: list[int], *, num_lines: int, seed: int) -> list[dict[str, Any]]:
+    output_dir = sp.Directory(os.path.join(tempfile.gettempdir(), 'organize_bench', 'saida'))
+    cases: list[dict[str, Any]] = []
+    for kind, create in (
+                (KIND_CARTA_CALCULO, CartaCalculo.create),
+                (KIND_EPI, FichaEpi.create),
+                (KIND_GENERIC, lambda tb: GenericDocument(tb, filters=FilterText('PROTOCOLO'))),
+            ):
+        tb, key = create_table(kind, num_lines, seed=seed)
+        doc = create(tb)
+        reference = SyntheticDocument(
+            doc.file_path_origin, kind=kind, key=key, new_name=f'{kind.upper()} {key}', pages=1, lines=[]
+        )
+        index_points: list[dict[str, Any]] = []
+        points: list[dict[str, Any]] = []
+        for rows in row_sizes:
+            df = create_sheet([reference], extra_rows=max(0, rows - 1), seed=seed)
+
+            def _create_finder(_df=df) -> FindNameInnerData:
+                filters = FilterData(_df, col_find=COL_KEY, col_new_name=COL_NEW_NAME, cols_in_name=[COL_EXTRA])
+                # find_rows cria o índice da coluna col_find no primeiro uso.
+                filters.find_rows([])
+                return FindNameInnerData(output_dir, filters=filters)
+
+            # Custo de preparar a planilha (FilterData + índice), feito uma vez por tarefa.
+            point = bench.run(_create_finder)
+            point['value'] = rows
+            index_points.append(point)
+
+            finder = _create_finder()
+            point = bench.run(lambda _finder=finder: _finder.get_new_name(doc))
+            point['value'] = rows
+            point['result'] = finder.get_new_name(doc).get_output_file().get_name()
+            points.append(point)
+        cases.append({'case': f'FilterData.create[{kind}]', 'param': PARAM_ROWS, 'points': index_points})
+        cases.append({'case': f'FindNameInnerData.get_new_name[{kind}]', 'param': PARAM_ROWS, 'points': points})
+    return cases
+
+
+def print_case(case: dict[str, Any]) -> None:
+    exponent = case['scaling_exponent']
+    print(f"{case['case']} ({case['param']}) expoente={'-' if exponent is None else f'{exponent:.2f}'}")
+    for p in case['points']:
+        print(
+            f"    {p['value']:>8}  {p['ops_per_sec']:14.1f} ops/s  "
+            f"p50={p['seconds_per_op']['p50'] * 1e6:12.2f}us"
+        )
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Micro-benchmarks da camada de nomeação (sem OCR).')
+    parser.add_argument('--lines', type=parse_int_list, default=[10, 50, 200, 1000], help='linhas por documento')
+    parser.add_argument('--rows', type=parse_int_list, default=[100, 1000, 10000], help='linhas da planilha')
+    parser.add_argument('--name-lengths', type=parse_int_list, default=[16, 64, 256], help='caracteres por nome')
+    parser.add_argument('--doc-lines', type=int, default=50, help='linhas do documento em get_new_name')
+    parser.add_argument('--groups', type=parse_str_list, default=['strings', 'documents', 'find_name'])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='duração mínima de cada amostra (s)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark_naming.json', help="arquivo JSON ou '-' (saída padrão)")
+    add_history_arguments(parser)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    args = create_parser().parse_args(argv)
+    bench = MicroBench(repeat=args.repeat, min_time=args.min_time)
+    cases: list[dict[str, Any]] = []
+    if 'strings' in args.groups:
+        cases.extend(bench_strings(bench, args.name_lengths, args.seed))
+    if 'documents' in args.groups:
+        cases.extend(bench_documents(bench, args.lines, args.seed))
+    if 'find_name' in args.groups:
+        cases.extend(bench_find_name(bench, args.rows, num_lines=args.doc_lines, seed=args.seed))
+    for case in cases:
+        case['scaling_exponent'] = scaling_exponent(case['points'])
+        print_case(case)
+
+    data: dict[str, Any] = {
+        'benchmark': 'naming',
+        'version': __version__,
+        'environment': get_environment_info(),
+        'config': {k: v for k, v in vars(args).items() if k != 'output'},
+        'cases': cases,
+    }
+    write_results(data, args.output)
+    record_history(data, args)
+    return data
+
+
+if __name__ == '__main__':
+    main()
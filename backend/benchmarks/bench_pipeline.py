@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Benchmark do pipeline de OCR e nomeação com documentos sintéticos.
+
+Mede, para cada tipo de documento e tamanho de lote, a vazão (documentos/s) e a
+latência por documento de:
+    DocumentTextExtract.read_document (read_image para PNG)
+    CreateFileNames.add_disk_file
+    CreateFileNames.export_new_files_to_zip
+    FindNameInnerData.get_new_name
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_pipeline --batch-sizes 1,4,16 --pages 2 --noise 0.02 \\
+        --output benchmark_pipeline.json
+
+O cache de OCR fica desativado (ORGANIZE_OCR_CACHE=0) para que as repetições não
+meçam apenas leituras do cache, use --ocr-cache para ativá-lo.
+
+Cada execução é acrescentada ao histórico (benchmarks/history.py), use --no-history
+para não gravar e 'python -m benchmarks.history compare' para comparar execuções.
+"""
+from __future__ import annotations
+from typing import Any, Callable
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import convert_stream as cs
+import soup_files as sp
+from sheet_stream import ColumnsTable, ListColumnBody, TableDocuments
+from organize_stream import (
+    __version__, CartaCalculo, CreateFileNames, DictOriginInfo, DigitalizedDocument,
+    DocumentTextExtract, EnumDigitalDoc, FilterData, FilterText, FindNameInnerData, GenericDocument,
+)
+from organize_stream.cartas import FichaEpi
+from organize_stream.cache.ocr_cache import ENV_OCR_CACHE
+from benchmarks.common import (
+    get_environment_info, parse_int_list, parse_str_list, summarize, time_call, write_results
+)
+from benchmarks.history import add_history_arguments, record_history
+from benchmarks.synthetic import (
+    COL_EXTRA, COL_KEY, COL_NEW_NAME, DOCUMENT_KINDS, KIND_CARTA_CALCULO, KIND_EPI,
+    SyntheticDocument, SyntheticDocumentGenerator,
+)
+
+STAGE_READ: str = 'read_document'
+STAGE_ADD_FILE: str = 'add_disk_file'
+STAGE_EXPORT_ZIP: str = 'export_new_files_to_zip'
+STAGE_NEW_NAME: str = 'get_new_name'
+STAGES: tuple[str, ...] = (STAGE_READ, STAGE_ADD_FILE, STAGE_EXPORT_ZIP, STAGE_NEW_NAME)
+
+# Filtro dos documentos genéricos, a linha do protocolo gera o nome.
+GENERIC_FILTER: str = 'PROTOCOLO'
+
+
+def create_name_finder(kind: str) -> CreateFileNames:
+    if kind == KIND_CARTA_CALCULO:
+        return CreateFileNames(extractor=DocumentTextExtract(), lib_digitalized=EnumDigitalDoc.CARTA_CALCULO)
+    if kind == KIND_EPI:
+        return CreateFileNames(extractor=DocumentTextExtract(), lib_digitalized=EnumDigitalDoc.EPI)
+    return CreateFileNames(extractor=DocumentTextExtract(), filters=FilterText(GENERIC_FILTER))
+
+
+def create_digitalized(kind: str, tb: TableDocuments) -> DigitalizedDocument:
+    if kind == KIND_CARTA_CALCULO:
+        return CartaCalculo.create(tb)
+    if kind == KIND_EPI:
+        return FichaEpi.create(tb)
+    return GenericDocument(tb, filters=FilterText(GENERIC_FILTER))
+
+
+def create_origin_info(doc: SyntheticDocument) -> DictOriginInfo:
+    # Mesmo formato dos uploads gravados no disco pelas rotas do servidor.
+    info = DictOriginInfo()
+    info.set_filename_with_extension(doc.file.basename())
+    info.set_name(doc.file.name())
+    info.set_extension(doc.file.extension())
+    info.set_abspath(doc.file)
+    return info
+
+
+def read_synthetic(extractor: DocumentTextExtract, doc: SyntheticDocument) -> TableDocuments:
+    if doc.file.extension() == '.png':
+        return extractor.read_image(cs.ImageObject.create_from_file(doc.file))
+    return extractor.read_document(cs.DocumentPdf.create_from_file(doc.file))
+
+
+class StageRunner(object):
+    """
+    Executa uma etapa warmup + repeat vezes, descartando as primeiras warmup execuções.
+    Cada execução processa o lote inteiro e registra o tempo total e o de cada item.
+    """
+
+    def __init__(self, *, repeat: int, warmup: int):
+        self.repeat: int = max(1, repeat)
+        self.warmup: int = max(0, warmup)
+
+    def run(
+                self,
+                items: list[Any],
+                func: Callable[[Any], Any], *,
+                setup: Callable[[], None] = None,
+            ) -> tuple[list[float], list[float], int, list[Any]]:
+        """
+        Retorna (tempo de cada lote, latência de cada item, erros, resultados da última execução).
+        """
+        batch_seconds: list[float] = []
+        latencies: list[float] = []
+        errors: int = 0
+        results: list[Any] = []
+        for num in range(self.warmup + self.repeat):
+            if setup is not None:
+                setup()
+            measured: bool = num >= self.warmup
+            results = []
+            total: float = 0
+            for item in items:
+                try:
+                    seconds, value = time_call(func, item)
+                except Exception as err:
+                    print(f'DEBUG: {__class__.__name__} falha no item {item}: {err}')
+                    if measured:
+                        errors += 1
+                    results.append(None)
+                    continue
+                total += seconds
+                results.append(value)
+                if measured:
+                    latencies.append(seconds)
+            if measured:
+                batch_seconds.append(total)
+        return batch_seconds, latencies, errors, results
+
+
+def create_result(
+            *,
+            kind: str,
+            fmt: str,
+            batch_size: int,
+            stage: str,
+            batch_seconds: list[float],
+            latencies: list[float],
+            errors: int,
+            **extra: Any,
+        ) -> dict[str, Any]:
+    median_batch: float = statistics.median(batch_seconds) if len(batch_seconds) > 0 else 0
+    result: dict[str, Any] = {
+        'kind': kind,
+        'format': fmt,
+        'batch_size': batch_size,
+        'stage': stage,
+        'repeat': len(batch_seconds),
+        'errors': errors,
+        'throughput': (batch_size / median_batch) if median_batch > 0 else 0.0,
+        'batch_seconds': summarize(batch_seconds),
+        'latency': summarize(latencies),
+        # Amostras brutas para o teste t do benchmarks.history.
+        'samples': latencies,
+    }
+    result.update(extra)
+    return result
+
+
+def run_batch(
+            kind: str,
+            docs: list[SyntheticDocument],
+            generator: SyntheticDocumentGenerator, *,
+            fmt: str,
+            runner: StageRunner,
+            stages: list[str],
+            sheet_rows: int,
+        ) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    batch_size: int = len(docs)
+    tables: list[TableDocuments | None] = []
+
+    if (STAGE_READ in stages) or (STAGE_NEW_NAME in stages):
+        extractor = DocumentTextExtract()
+        batch_seconds, latencies, errors, tables = runner.run(docs, lambda d: read_synthetic(extractor, d))
+        if STAGE_READ in stages:
+            results.append(create_result(
+                kind=kind, fmt=fmt, batch_size=batch_size, stage=STAGE_READ,
+                batch_seconds=batch_seconds, latencies=latencies, errors=errors,
+                pages=sum(d.pages for d in docs),
+            ))
+
+    if (STAGE_ADD_FILE in stages) or (STAGE_EXPORT_ZIP in stages):
+        # Um CreateFileNames novo por execução, o último é usado na exportação do zip.
+        finders: list[CreateFileNames] = []
+        infos: list[DictOriginInfo] = [create_origin_info(d) for d in docs]
+        batch_seconds, latencies, errors, _ = runner.run(
+            infos,
+            lambda info: finders[-1].add_disk_file(info),
+            setup=lambda: finders.append(create_name_finder(kind)),
+        )
+        name_finder: CreateFileNames = finders[-1]
+        named: int = name_finder.get_list_key_files().length
+        if STAGE_ADD_FILE in stages:
+            results.append(create_result(
+                kind=kind, fmt=fmt, batch_size=batch_size, stage=STAGE_ADD_FILE,
+                batch_seconds=batch_seconds, latencies=latencies, errors=errors, named=named,
+            ))
+        if STAGE_EXPORT_ZIP in stages:
+            batch_seconds, _, errors, zips = runner.run([name_finder], lambda f: f.export_new_files_to_zip())
+            zip_bytes: int = 0
+            if (len(zips) > 0) and (zips[-1] is not None):
+                zip_bytes = zips[-1].getbuffer().nbytes
+            # A exportação processa o lote inteiro em uma chamada: latência = tempo do lote.
+            results.append(create_result(
+                kind=kind, fmt=fmt, batch_size=batch_size, stage=STAGE_EXPORT_ZIP,
+                batch_seconds=batch_seconds, latencies=list(batch_seconds), errors=errors,
+                named=named, zip_bytes=zip_bytes,
+            ))
+
+    if STAGE_NEW_NAME in stages:
+        df = generator.create_sheet(docs, extra_rows=sheet_rows)
+        name_data = FindNameInnerData(
+            generator.output_dir,
+            filters=FilterData(df, col_find=COL_KEY, col_new_name=COL_NEW_NAME, cols_in_name=[COL_EXTRA]),
+        )
+        digitalized: list[DigitalizedDocument] = []
+        for doc, tb in zip(docs, tables):
+            if (tb is None) or (tb.length == 0):
+                continue
+            tb.set_column(ListColumnBody(ColumnsTable.FILETYPE, [doc.file.extension()] * tb.length))
+            digitalized.append(create_digitalized(kind, tb))
+        batch_seconds, latencies, errors, keys = runner.run(digitalized, name_data.get_new_name)
+        matched: int = len([k for k in keys if (k is not None) and (k.get_output_file().get_name() is not None)])
+        results.append(create_result(
+            kind=kind, fmt=fmt, batch_size=batch_size, stage=STAGE_NEW_NAME,
+            batch_seconds=batch_seconds, latencies=latencies, errors=errors,
+            sheet_rows=len(df.index), matched=matched,
+        ))
+    return results
+
+
+def print_result(result: dict[str, Any]) -> None:
+    print(
+        f"{result['kind']:<14} {result['format']:<4} n={result['batch_size']:<4} {result['stage']:<24} "
+        f"{result['throughput']:10.2f} docs/s  p50={result['latency']['p50'] * 1000:9.2f}ms  "
+        f"p95={result['latency']['p95'] * 1000:9.2f}ms  erros={result['errors']}"
+    )
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Benchmark do pipeline de OCR/nomeação com documentos sintéticos.')
+    parser.add_argument('--kinds', type=parse_str_list, default=list(DOCUMENT_KINDS), help='carta_calculo,epi,generic')
+    parser.add_argument('--batch-sizes', type=parse_int_list, default=[1, 4, 16], help='ex: 1,4,16')
+    parser.add_argument('--stages', type=parse_str_list, default=list(STAGES), help=','.join(STAGES))
+    parser.add_argument('--format', dest='fmt', choices=['pdf', 'png'], default='pdf')
+    parser.add_argument('--pages', type=int, default=1, help='páginas por PDF')
+    parser.add_argument('--noise', type=float, default=0.0, help='fração de pixels com ruído (0 a 1)')
+    parser.add_argument('--dpi', type=int, default=150, help='resolução das páginas renderizadas')
+    parser.add_argument('--text-layer', action='store_true', help='grava o texto na camada de texto do PDF')
+    parser.add_argument('--sheet-rows', type=int, default=1000, help='linhas extras na planilha do get_new_name')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--ocr-cache', action='store_true', help='mantém o cache de OCR ativo')
+    parser.add_argument('--workdir', default=None, help='diretório dos documentos gerados (padrão: temporário)')
+    parser.add_argument('--keep-files', action='store_true', help='não remove os documentos gerados')
+    parser.add_argument('--output', default='benchmark_pipeline.json', help="arquivo JSON ou '-' (saída padrão)")
+    add_history_arguments(parser)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    args = create_parser().parse_args(argv)
+    # Lido pelo DocumentTextExtract ao ser criado.
+    os.environ[ENV_OCR_CACHE] = '1' if args.ocr_cache else '0'
+    for kind in args.kinds:
+        if kind not in DOCUMENT_KINDS:
+            raise SystemExit(f'Tipo de documento inválido: {kind}, use um de {DOCUMENT_KINDS}')
+
+    workdir: str = args.workdir if args.workdir is not None else tempfile.mkdtemp(prefix='organize-bench-')
+    runner = StageRunner(repeat=args.repeat, warmup=args.warmup)
+    results: list[dict[str, Any]] = []
+    try:
+        for kind in args.kinds:
+            for batch_size in args.batch_sizes:
+                generator = SyntheticDocumentGenerator(
+                    sp.Directory(os.path.join(workdir, f'{kind}-{batch_size}')),
+                    seed=args.seed, pages=args.pages, noise=args.noise, dpi=args.dpi, text_layer=args.text_layer,
+                )
+                docs = generator.create_batch(kind, batch_size, fmt=args.fmt)
+                for result in run_batch(
+                            kind, docs, generator,
+                            fmt=args.fmt, runner=runner, stages=args.stages, sheet_rows=args.sheet_rows,
+                        ):
+                    print_result(result)
+                    results.append(result)
+    finally:
+        if (args.workdir is None) and (not args.keep_files):
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    data: dict[str, Any] = {
+        'benchmark': 'pipeline',
+        'version': __version__,
+        'environment': get_environment_info(),
+        'config': {k: v for k, v in vars(args).items() if k != 'output'},
+        'results': results,
+    }
+    write_results(data, args.output)
+    record_history(data, args)
+    return data
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import Any, Callable
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Percentil (0-100) com interpolação linear, retorna 0 para listas vazias.
+    """
+    if len(values) == 0:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return float(ordered[0])
+    pos: float = (len(ordered) - 1) * (pct / 100)
+    low: int = int(pos)
+    high: int = min(low + 1, len(ordered) - 1)
+    return float(ordered[low] + (ordered[high] - ordered[low]) * (pos - low))
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    """
+    Resumo das amostras (em segundos): média, desvio, mínimo, p50/p95/p99 e máximo.
+    """
+    if len(values) == 0:
+        return {'count': 0, 'mean': 0.0, 'stdev': 0.0, 'min': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    return {
+        'count': len(values),
+        'mean': statistics.fmean(values),
+        'stdev': statistics.stdev(values) if len(values) > 1 else 0.0,
+        'min': min(values),
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+        'max': max(values),
+    }
+
+
+def time_call(func: Callable[..., Any], *args, **kwargs) -> tuple[float, Any]:
+    """
+    Executa func e retorna (segundos, resultado).
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def parse_int_list(value: str) -> list[int]:
+    """Converte '1,4,16' em [1, 4, 16]."""
+    return [int(v) for v in value.split(',') if v.strip() != '']
+
+
+def parse_str_list(value: str) -> list[str]:
+    """Converte 'a, b' em ['a', 'b']."""
+    return [v.strip() for v in value.split(',') if v.strip() != '']
+
+
+# backend/organize_stream/__init__.py, lido sem importar o pacote (que exige o tesseract).
+_PACKAGE_INIT: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'organize_stream', '__init__.py')
+
+
+def get_package_version() -> str | None:
+    """
+    Retorna organize_stream.__version__ sem importar o pacote.
+    """
+    try:
+        with open(_PACKAGE_INIT, encoding='utf-8') as f:
+            found = re.search(r"^__version__\s*=\s*['\"]([^'\"]+)['\"]", f.read(), re.MULTILINE)
+    except OSError:
+        return None
+    return None if found is None else found.group(1)
+
+
+def get_environment_info() -> dict[str, Any]:
+    """
+    Informações da máquina/interpretador gravadas junto com os resultados.
+    """
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'hostname': platform.node(),
+    }
+
+
+def write_results(data: dict[str, Any], output: str) -> None:
+    """
+    Grava os resultados em JSON no arquivo output ('-' grava na saída padrão).
+    """
+    content: str = json.dumps(data, indent=2, ensure_ascii=False, default=str)
+    if output == '-':
+        sys.stdout.write(f'{content}\n')
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(f'{content}\n')
+    print(f'Resultados gravados em: {output}')
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Substituto do binário tesseract para os testes de carga sem OCR real. Aceita a
+mesma linha de comando usada pelo pytesseract:
+
+    tesseract <imagem> <saida> [-l lang] [--psm N] [-c chave=valor] [pdf|txt|hocr]
+
+e grava saida.txt/.pdf/.tsv/.hocr com um texto fixo que contém a linha
+'PROTOCOLO <hash da imagem>', então o pipeline de nomeação (padrão PROTOCOLO)
+gera um nome diferente para cada imagem. O PDF contém a imagem e o texto invisível,
+como o PDF pesquisável do tesseract.
+
+ORGANIZE_FAKE_OCR_DELAY (segundos) simula o custo do OCR em cada chamada.
+"""
+from __future__ import annotations
+import hashlib
+import os
+import sys
+import time
+
+try:
+    import pymupdf as fitz
+except ImportError:
+    import fitz
+
+ENV_FAKE_OCR_DELAY: str = 'ORGANIZE_FAKE_OCR_DELAY'
+FAKE_VERSION: str = 'tesseract 5.3.0 (organize-stream fake)'
+# Extensões de saída aceitas como último argumento (as demais opções são ignoradas).
+_OUTPUT_CONFIGS: set[str] = {'pdf', 'txt', 'hocr'}
+
+
+def create_script(bin_dir: str) -> str:
+    """
+    Cria o executável 'tesseract' em bin_dir, que chama este módulo com o Python
+    atual, e retorna o caminho. Coloque bin_dir no início do PATH para o
+    ocr_stream/pytesseract encontrarem o substituto.
+    """
+    os.makedirs(bin_dir, exist_ok=True)
+    path: str = os.path.join(bin_dir, 'tesseract')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'#!/bin/sh\nexec "{sys.executable}" "{os.path.abspath(__file__)}" "$@"\n')
+    os.chmod(path, 0o755)
+    return path
+
+
+def get_fake_lines(content: bytes) -> list[str]:
+    digest: str = hashlib.sha1(content).hexdigest()[:10].upper()
+    return [
+        'DOCUMENTO DIGITALIZADO',
+        f'PROTOCOLO {digest}',
+        'TEXTO GERADO PELO OCR SUBSTITUTO',
+    ]
+
+
+def write_pdf(image_path: str, lines: list[str], output: str) -> None:
+    doc = fitz.open()
+    try:
+        img = fitz.open(image_path)
+        rect = img[0].rect
+        img.close()
+        page = doc.new_page(width=rect.width, height=rect.height)
+        page.insert_image(page.rect, filename=image_path)
+        y: float = 40
+        for line in lines:
+            # render_mode=3: texto invisível sobre a imagem.
+            page.insert_text((20, y), line, fontsize=10, render_mode=3)
+            y += 14
+        doc.save(output, deflate=True)
+    finally:
+        doc.close()
+
+
+def write_tsv(lines: list[str], output: str) -> None:
+    header = 'level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext'
+    rows: list[str] = [header]
+    for line_num, line in enumerate(lines, start=1):
+        for word_num, word in enumerate(line.split(' '), start=1):
+            rows.append(f'5\t1\t1\t1\t{line_num}\t{word_num}\t{word_num * 60}\t{line_num * 20}\t50\t12\t95\t{word}')
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(rows) + '\n')
+
+
+def main(argv: list[str]) -> int:
+    if (len(argv) == 0) or (argv[0] in ('--version', '-v')):
+        print(FAKE_VERSION)
+        return 0
+    if argv[0] == '--list-langs':
+        print('List of available languages (2):\neng\npor')
+        return 0
+    if len(argv) < 2:
+        print('Usage: tesseract imagename outputbase [options...] [configfile...]', file=sys.stderr)
+        return 1
+
+    image_path, output_base = argv[0], argv[1]
+    configs: list[str] = [a for a in argv[2:] if a in _OUTPUT_CONFIGS]
+    if 'tessedit_create_tsv=1' in argv:
+        configs.append('tsv')
+    if len(configs) == 0:
+        configs.append('txt')
+
+    delay: float = float(os.environ.get(ENV_FAKE_OCR_DELAY, '0'))
+    if delay > 0:
+        time.sleep(delay)
+
+    with open(image_path, 'rb') as f:
+        lines = get_fake_lines(f.read())
+    for config in configs:
+        output: str = f'{output_base}.{config}'
+        if config == 'pdf':
+            write_pdf(image_path, lines, output)
+        elif config == 'tsv':
+            write_tsv(lines, output)
+        elif config == 'hocr':
+            words = ''.join(f"<span class='ocrx_word'>{line}</span>" for line in lines)
+            with open(output, 'w', encoding='utf-8') as f:
+                f.write(f"<html><body><div class='ocr_page'>{words}</div></body></html>\n")
+        else:
+            with open(output, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n\f')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
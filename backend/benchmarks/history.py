@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Histórico dos benchmarks e comparação entre execuções.
+
+Cada execução de bench_pipeline, bench_naming e load_test é acrescentada (uma linha
+JSON) ao arquivo de histórico, com a revisão do git, as informações da máquina, a
+versão do organize_stream e as amostras brutas de cada caso (segundos). O comando
+compare aplica o teste t de Welch caso a caso e sai com código 1 quando há uma
+regressão significativa (2 quando a base ou o candidato não existem), para ser
+usado como gate no CI.
+
+Uso (a partir de backend/):
+    python -m benchmarks.history list --benchmark pipeline
+    python -m benchmarks.history compare --benchmark naming --baseline previous --candidate latest
+    python -m benchmarks.history compare --benchmark pipeline --baseline version:2.4.6
+
+Referências aceitas em --baseline/--candidate:
+    latest, previous   última e penúltima execução do benchmark
+    id:<id>            uma execução
+    rev:<revisão>      execuções de um commit (prefixo do hash)
+    version:<versão>   execuções de uma versão do organize_stream
+Um valor sem prefixo é procurado como id, revisão e versão, nessa ordem. Quando a
+referência seleciona várias execuções, as amostras são somadas.
+
+O arquivo padrão é benchmarks/history.jsonl, ORGANIZE_BENCH_HISTORY muda o caminho.
+"""
+from __future__ import annotations
+from typing import Any
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import uuid
+from benchmarks.common import get_environment_info, parse_str_list, write_results
+
+ENV_BENCH_HISTORY: str = 'ORGANIZE_BENCH_HISTORY'
+DEFAULT_HISTORY_FILE: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'history.jsonl')
+# Diretório de trabalho dos comandos git (backend/).
+_BACKEND_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REF_LATEST: str = 'latest'
+REF_PREVIOUS: str = 'previous'
+
+EXIT_REGRESSION: int = 1
+EXIT_ERROR: int = 2
+
+STATUS_REGRESSION: str = 'regression'
+STATUS_IMPROVEMENT: str = 'improvement'
+STATUS_UNCHANGED: str = 'unchanged'
+STATUS_INSUFFICIENT: str = 'insufficient'
+STATUS_MISSING: str = 'missing'
+
+# Opções que não mudam o que é medido, ignoradas ao comparar as configurações.
+_IGNORED_CONFIG: set[str] = {'history', 'no_history', 'workdir', 'keep_files', 'server_pid'}
+
+
+def get_history_file() -> str:
+    return os.environ.get(ENV_BENCH_HISTORY, DEFAULT_HISTORY_FILE)
+
+
+def _git(*args: str) -> str | None:
+    try:
+        proc = subprocess.run(
+            ['git', *args], cwd=_BACKEND_DIR, capture_output=True, text=True, timeout=60, check=True
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return proc.stdout.strip()
+
+
+def get_git_info() -> dict[str, Any]:
+    """
+    Revisão, branch e se há alterações não commitadas (dirty) no repositório.
+    """
+    revision: str | None = _git('rev-parse', 'HEAD')
+    if revision is None:
+        return {'revision': None, 'branch': None, 'dirty': None}
+    status: str | None = _git('status', '--porcelain', '--untracked-files=no')
+    return {
+        'revision': revision,
+        'branch': _git('rev-parse', '--abbrev-ref', 'HEAD'),
+        'dirty': None if status is None else (status != ''),
+    }
+
+
+def extract_samples(data: dict[str, Any]) -> dict[str, list[float]]:
+    """
+    Amostras brutas (segundos, menor é melhor) de cada caso dos resultados de um
+    benchmark, com uma chave estável entre execuções.
+    """
+    samples: dict[str, list[float]] = {}
+    benchmark: str = data.get('benchmark', '')
+    if benchmark == 'pipeline':
+        for r in data['results']:
+            key = f"{r['kind']}/{r['format']}/n={r['batch_size']}/{r['stage']}"
+            samples[key] = list(r.get('samples', []))
+    elif benchmark == 'naming':
+        for case in data['cases']:
+            for p in case['points']:
+                samples[f"{case['case']}/{case['param']}={p['value']}"] = list(p.get('samples', []))
+    elif benchmark == 'load_test':
+        for r in data['results']:
+            for operation, values in r['operations'].items():
+                samples[f"{r['scenario']}/{operation}"] = list(values.get('samples', []))
+    else:
+        raise ValueError(f'Benchmark desconhecido: {benchmark}')
+    return samples
+
+
+def create_entry(data: dict[str, Any]) -> dict[str, Any]:
+    environment: dict[str, Any] = data.get('environment') or get_environment_info()
+    return {
+        'id': uuid.uuid4().hex[:12],
+        'created': environment.get('created'),
+        'benchmark': data['benchmark'],
+        'version': data.get('version'),
+        'git': get_git_info(),
+        'environment': environment,
+        'config': data.get('config', {}),
+        'samples': extract_samples(data),
+    }
+
+
+def append_history(data: dict[str, Any], history_file: str | None = None) -> dict[str, Any]:
+    """
+    Acrescenta os resultados de um benchmark ao histórico e retorna a entrada gravada.
+    """
+    path: str = history_file if history_file is not None else get_history_file()
+    entry = create_entry(data)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+    revision: str = (entry['git']['revision'] or '-')[:10]
+    print(f"Histórico: execução {entry['id']} (revisão {revision}) gravada em {path}")
+    return entry
+
+
+def load_history(history_file: str | None = None, *, benchmark: str | None = None) -> list[dict[str, Any]]:
+    """
+    Entradas do histórico em ordem de gravação, opcionalmente de um só benchmark.
+    """
+    path: str = history_file if history_file is not None else get_history_file()
+    entries: list[dict[str, Any]] = []
+    if not os.path.isfile(path):
+        return entries
+    with open(path, encoding='utf-8') as f:
+        for num, line in enumerate(f, start=1):
+            if line.strip() == '':
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as err:
+                print(f'DEBUG: linha {num} inválida em {path}: {err}')
+                continue
+            if (benchmark is None) or (entry.get('benchmark') == benchmark):
+                entries.append(entry)
+    return entries
+
+
+def add_history_arguments(parser: argparse.ArgumentParser) -> None:
+    """Opções --history/--no-history dos executores dos benchmarks."""
+    parser.add_argument('--history', default=None, help=f'arquivo do histórico (padrão: ${ENV_BENCH_HISTORY} ou {DEFAULT_HISTORY_FILE})')
+    parser.add_argument('--no-history', action='store_true', help='não grava a execução no histórico')
+
+
+def record_history(data: dict[str, Any], args: argparse.Namespace) -> dict[str, Any] | None:
+    if args.no_history:
+        return None
+    return append_history(data, args.history)
+
+
+def select_runs(entries: list[dict[str, Any]], ref: str) -> list[dict[str, Any]]:
+    """
+    Execuções selecionadas pela referência (ver a documentação do módulo).
+    """
+    if ref == REF_LATEST:
+        return entries[-1:]
+    if ref == REF_PREVIOUS:
+        return entries[-2:-1]
+    prefix, _, value = ref.partition(':')
+    if prefix == 'id':
+        return [e for e in entries if e['id'] == value]
+    if prefix == 'rev':
+        return [e for e in entries if (e['git'].get('revision') or '').startswith(value)]
+    if prefix == 'version':
+        return [e for e in entries if e.get('version') == value]
+    for selector in ('id', 'rev', 'version'):
+        found = select_runs(entries, f'{selector}:{ref}')
+        if len(found) > 0:
+            return found
+    return []
+
+
+def pool_samples(runs: list[dict[str, Any]]) -> dict[str, list[float]]:
+    pooled: dict[str, list[float]] = {}
+    for run in runs:
+        for key, values in run['samples'].items():
+            pooled.setdefault(key, []).extend(values)
+    return pooled
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    # Fração continuada da função beta incompleta (método de Lentz).
+    tiny: float = 1e-300
+    qab, qap, qam = a + b, a + 1, a - 1
+    c: float = 1.0
+    d: float = 1 - qab * x / qap
+    d = 1 / (d if abs(d) > tiny else tiny)
+    h: float = d
+    for m in range(1, 301):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1 + aa * d
+        d = 1 / (d if abs(d) > tiny else tiny)
+        c = 1 + aa / c
+        c = c if abs(c) > tiny else tiny
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1 + aa * d
+        d = 1 / (d if abs(d) > tiny else tiny)
+        c = 1 + aa / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-12:
+            break
+    return h
+
+
+def regularized_beta(a: float, b: float, x: float) -> float:
+    """Função beta incompleta regularizada I_x(a, b)."""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    ln_front: float = (
+        math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x)
+    )
+    if x < (a + 1) / (a + b + 2):
+        return math.exp(ln_front) * _betacf(a, b, x) / a
+    return 1 - math.exp(ln_front) * _betacf(b, a, 1 - x) / b
+
+
+def welch_t_test(a: list[float], b: list[float]) -> tuple[float, float, float]:
+    """
+    Teste t de Welch (variâncias diferentes) entre as amostras a e b. Retorna
+    (t, graus de liberdade, p bicaudal), t > 0 quando a média de b é maior.
+    """
+    if (len(a) < 2) or (len(b) < 2):
+        raise ValueError('O teste t exige ao menos duas amostras em cada grupo')
+    mean_a, mean_b = statistics.fmean(a), statistics.fmean(b)
+    se_a: float = statistics.variance(a) / len(a)
+    se_b: float = statistics.variance(b) / len(b)
+    se: float = se_a + se_b
+    if se == 0:
+        # Amostras constantes: qualquer diferença entre as médias é significativa.
+        return (0.0, float(len(a) + len(b) - 2), 1.0) if mean_a == mean_b else (
+            math.copysign(math.inf, mean_b - mean_a), float(len(a) + len(b) - 2), 0.0
+        )
+    t: float = (mean_b - mean_a) / math.sqrt(se)
+    df: float = se ** 2 / ((se_a ** 2) / (len(a) - 1) + (se_b ** 2) / (len(b) - 1))
+    p: float = regularized_beta(df / 2, 0.5, df / (df + t * t))
+    return t, df, min(1.0, max(0.0, p))
+
+
+def compare_samples(
+            baseline: dict[str, list[float]],
+            candidate: dict[str, list[float]],
+            *,
+            alpha: float = 0.05,
+            threshold: float = 0.10,
+        ) -> list[dict[str, Any]]:
+    """
+    Compara caso a caso (amostras em segundos, menor é melhor). Uma regressão exige
+    p < alpha e a média do candidato threshold (fração) acima da média da base.
+    """
+    rows: list[dict[str, Any]] = []
+    for key in sorted(set(baseline) | set(candidate)):
+        base, cand = baseline.get(key, []), candidate.get(key, [])
+        row: dict[str, Any] = {
+            'case': key,
+            'baseline_n': len(base),
+            'candidate_n': len(cand),
+            'baseline_mean': statistics.fmean(base) if len(base) > 0 else None,
+            'candidate_mean': statistics.fmean(cand) if len(cand) > 0 else None,
+            'change': None,
+            'p_value': None,
+        }
+        if (len(base) == 0) or (len(cand) == 0):
+            row['status'] = STATUS_MISSING
+            rows.append(row)
+            continue
+        if row['baseline_mean'] > 0:
+            row['change'] = row['candidate_mean'] / row['baseline_mean'] - 1
+        if (len(base) < 2) or (len(cand) < 2) or (row['change'] is None):
+            row['status'] = STATUS_INSUFFICIENT
+            rows.append(row)
+            continue
+        _, _, row['p_value'] = welch_t_test(base, cand)
+        if (row['p_value'] < alpha) and (row['change'] > threshold):
+            row['status'] = STATUS_REGRESSION
+        elif (row['p_value'] < alpha) and (row['change'] < -threshold):
+            row['status'] = STATUS_IMPROVEMENT
+        else:
+            row['status'] = STATUS_UNCHANGED
+        rows.append(row)
+    return rows
+
+
+def _describe_runs(runs: list[dict[str, Any]]) -> str:
+    parts: list[str] = []
+    for run in runs:
+        git = run.get('git', {})
+        revision: str = (git.get('revision') or '-')[:10]
+        parts.append(f"{run['id']} rev={revision}{'+' if git.get('dirty') else ''} v{run.get('version')}")
+    return ', '.join(parts)
+
+
+def _check_compatible(baseline: list[dict[str, Any]], candidate: list[dict[str, Any]]) -> list[str]:
+    # Máquinas ou configurações diferentes tornam a comparação pouco confiável.
+    warnings: list[str] = []
+    machine_fields = ('machine', 'processor', 'cpu_count', 'python', 'hostname')
+    machines = {tuple(r['environment'].get(k) for k in machine_fields) for r in (*baseline, *candidate)}
+    if len(machines) > 1:
+        warnings.append('as execuções foram feitas em máquinas ou interpretadores diferentes')
+    configs = {
+        json.dumps({k: v for k, v in r.get('config', {}).items() if k not in _IGNORED_CONFIG}, sort_keys=True)
+        for r in (*baseline, *candidate)
+    }
+    if len(configs) > 1:
+        warnings.append('as execuções usaram configurações diferentes')
+    return warnings
+
+
+def print_comparison(rows: list[dict[str, Any]]) -> None:
+    print(f"{'caso':<60} {'base':>12} {'atual':>12} {'variação':>9} {'p':>8}  status")
+    for row in rows:
+        base = '-' if row['baseline_mean'] is None else f"{row['baseline_mean'] * 1000:.3f}ms"
+        cand = '-' if row['candidate_mean'] is None else f"{row['candidate_mean'] * 1000:.3f}ms"
+        change = '-' if row['change'] is None else f"{row['change'] * 100:+.1f}%"
+        p_value = '-' if row['p_value'] is None else f"{row['p_value']:.4f}"
+        print(f"{row['case']:<60} {base:>12} {cand:>12} {change:>9} {p_value:>8}  {row['status']}")
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    for entry in load_history(args.history, benchmark=args.benchmark):
+        git = entry.get('git', {})
+        print(
+            f"{entry['id']}  {entry.get('created')}  {entry['benchmark']:<10} v{entry.get('version')}  "
+            f"rev={(git.get('revision') or '-')[:10]}{'+' if git.get('dirty') else ''}  "
+            f"{git.get('branch') or '-'}  casos={len(entry.get('samples', {}))}"
+        )
+    return 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    entries = load_history(args.history, benchmark=args.benchmark)
+    baseline = select_runs(entries, args.baseline)
+    candidate = select_runs(entries, args.candidate)
+    if len(baseline) == 0:
+        print(f'ERRO: nenhuma execução de {args.benchmark} para a base: {args.baseline}', file=sys.stderr)
+        return EXIT_ERROR
+    if len(candidate) == 0:
+        print(f'ERRO: nenhuma execução de {args.benchmark} para o candidato: {args.candidate}', file=sys.stderr)
+        return EXIT_ERROR
+    # Ex: version:2.4.7 como base também seleciona a última execução dessa versão.
+    candidate_ids = {r['id'] for r in candidate}
+    baseline = [r for r in baseline if r['id'] not in candidate_ids]
+    if len(baseline) == 0:
+        print('ERRO: a base e o candidato selecionam as mesmas execuções', file=sys.stderr)
+        return EXIT_ERROR
+
+    print(f'Base:      {_describe_runs(baseline)}')
+    print(f'Candidato: {_describe_runs(candidate)}')
+    for warning in _check_compatible(baseline, candidate):
+        print(f'AVISO: {warning}')
+    rows = compare_samples(
+        pool_samples(baseline), pool_samples(candidate), alpha=args.alpha, threshold=args.threshold
+    )
+    if args.cases is not None:
+        rows = [r for r in rows if any(c in r['case'] for c in args.cases)]
+    print_comparison(rows)
+
+    regressions = [r for r in rows if r['status'] == STATUS_REGRESSION]
+    improvements = [r for r in rows if r['status'] == STATUS_IMPROVEMENT]
+    print(
+        f'{len(regressions)} regressões, {len(improvements)} melhorias em {len(rows)} casos '
+        f'(alpha={args.alpha}, limite={args.threshold * 100:.1f}%)'
+    )
+    if args.output is not None:
+        write_results({
+            'benchmark': args.benchmark,
+            'baseline': [r['id'] for r in baseline],
+            'candidate': [r['id'] for r in candidate],
+            'alpha': args.alpha,
+            'threshold': args.threshold,
+            'cases': rows,
+        }, args.output)
+    return EXIT_REGRESSION if len(regressions) > 0 else 0
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Histórico dos benchmarks e comparação entre execuções.')
+    parser.add_argument('--history', default=None, help=f'arquivo do histórico (padrão: ${ENV_BENCH_HISTORY} ou {DEFAULT_HISTORY_FILE})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = commands.add_parser('list', help='lista as execuções gravadas')
+    list_parser.add_argument('--benchmark', default=None, help='pipeline, naming ou load_test')
+    list_parser.set_defaults(func=cmd_list)
+
+    compare_parser = commands.add_parser('compare', help='compara duas execuções (código 1 se houver regressão)')
+    compare_parser.add_argument('--benchmark', required=True, help='pipeline, naming ou load_test')
+    compare_parser.add_argument('--baseline', default=REF_PREVIOUS, help='referência da base (padrão: previous)')
+    compare_parser.add_argument('--candidate', default=REF_LATEST, help='referência do candidato (padrão: latest)')
+    compare_parser.add_argument('--alpha', type=float, default=0.05, help='nível de significância do teste t')
+    compare_parser.add_argument('--threshold', type=float, default=0.10, help='variação mínima da média (fração)')
+    compare_parser.add_argument(
+        '--cases', type=parse_str_list, default=None, help='compara só os casos que contêm um destes textos'
+    )
+    compare_parser.add_argument('--output', default=None, help="grava a comparação em JSON ('-' saída padrão)")
+    compare_parser.set_defaults(func=cmd_compare)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = create_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,649 @@
+#!/usr/bin/env python3
+"""
+Teste de carga das rotas do servidor (rt_ocr, rt_split_pdf, rt_join_pdf e
+rt_process_pattern + /progress + /download) com documentos sintéticos.
+
+Alvos:
+    --target inprocess     importa server.app e chama o ASGI diretamente (padrão)
+    --target http://host:porta
+                           envia as requisições para um uvicorn já iniciado
+    --spawn                inicia um uvicorn local (server:app) e testa via HTTP
+
+Com --ocr fake (padrão) o binário tesseract é substituído por benchmarks/fake_tesseract.py
+(sem OCR real, sem rede), use --ocr real para usar o tesseract instalado.
+
+O relatório traz, para cada cenário e operação, vazão, latência p50/p95/p99,
+taxa de erros, códigos HTTP e o pico de memória (RSS) do processo do servidor.
+
+Uso (a partir de backend/):
+    python -m benchmarks.load_test --scenarios ocr,split,join,pattern --requests 40 \\
+        --concurrency 8 --output load_test.json
+
+As latências de cada operação também vão para o histórico (--history/--no-history).
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlsplit
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+import soup_files as sp
+from benchmarks.common import (
+    get_environment_info, get_package_version, parse_str_list, summarize, write_results
+)
+from benchmarks.fake_tesseract import ENV_FAKE_OCR_DELAY, create_script
+from benchmarks.history import add_history_arguments, record_history
+from benchmarks.synthetic import KIND_GENERIC, SyntheticDocumentGenerator
+
+# Diretório backend/ (server.py) e o JSON com as rotas usado pelo frontend.
+BACKEND_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FILE_ROUTES: str = os.path.join(os.path.dirname(BACKEND_DIR), 'frontend', 'assets', 'data', 'ips.json')
+
+# Variáveis de ambiente lidas pelo servidor.
+ENV_TESS_FILE: str = 'ORGANIZE_TESS_FILE'
+ENV_OCR_CACHE: str = 'ORGANIZE_OCR_CACHE'
+ENV_TASK_ROOT: str = 'ORGANIZE_TASK_ROOT'
+
+SCENARIOS: tuple[str, ...] = ('ocr', 'split', 'join', 'pattern')
+# Padrão de texto enviado ao rt_process_pattern, presente nos documentos genéricos e no OCR substituto.
+PATTERN: str = 'PROTOCOLO'
+
+TARGET_INPROCESS: str = 'inprocess'
+
+
+def encode_multipart(
+            fields: list[tuple[str, str]],
+            files: list[tuple[str, str, bytes, str]],
+        ) -> tuple[bytes, str]:
+    """
+    Corpo multipart/form-data com os campos (nome, valor) e arquivos
+    (campo, nome do arquivo, bytes, content-type). Retorna (corpo, content-type).
+    """
+    boundary: str = f'organize-{uuid.uuid4().hex}'
+    parts: list[bytes] = []
+    for name, value in fields:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    for field, filename, content, content_type in files:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode()
+        )
+        parts.append(content)
+        parts.append(b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+def read_rss_bytes(pid: int | None = None, *, field: str = 'VmRSS') -> int | None:
+    """
+    Lê VmRSS (atual) ou VmHWM (pico) de /proc/<pid>/status, None fora do Linux.
+    """
+    path: str = f"/proc/{'self' if pid is None else pid}/status"
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.startswith(f'{field}:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    if (pid is None) and (field == 'VmHWM'):
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except ImportError:
+            return None
+    return None
+
+
+class RssSampler(object):
+    """
+    Lê o RSS do processo do servidor a cada interval segundos e guarda o maior valor.
+    """
+
+    def __init__(self, pid: int | None, *, interval: float = 0.1):
+        self.pid: int | None = pid
+        self.interval: float = interval
+        self.max_bytes: int = 0
+        self.__task: asyncio.Task | None = None
+
+    async def __run(self) -> None:
+        while True:
+            current = read_rss_bytes(self.pid)
+            if (current is not None) and (current > self.max_bytes):
+                self.max_bytes = current
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        self.__task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        if self.__task is not None:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+
+
+class AsgiClient(object):
+    """
+    Cliente que chama a aplicação ASGI no mesmo processo (sem rede), incluindo os
+    eventos de startup/shutdown do lifespan. O corpo da requisição é enviado em
+    blocos de chunk_size bytes, como o uvicorn faz.
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[None]], *, chunk_size: int = 64 * 1024):
+        self.app = app
+        self.chunk_size: int = chunk_size
+        self.__lifespan_in: asyncio.Queue | None = None
+        self.__lifespan_out: asyncio.Queue | None = None
+        self.__lifespan_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self.__lifespan_in, self.__lifespan_out = asyncio.Queue(), asyncio.Queue()
+        scope = {'type': 'lifespan', 'asgi': {'version': '3.0'}, 'state': {}}
+        self.__lifespan_task = asyncio.create_task(
+            self.app(scope, self.__lifespan_in.get, self.__lifespan_out.put)
+        )
+        await self.__lifespan_in.put({'type': 'lifespan.startup'})
+        message = await self.__lifespan_out.get()
+        if message['type'] != 'lifespan.startup.complete':
+            raise RuntimeError(f"Falha no startup da aplicação: {message.get('message')}")
+
+    async def stop(self) -> None:
+        if self.__lifespan_task is None:
+            return
+        await self.__lifespan_in.put({'type': 'lifespan.shutdown'})
+        await self.__lifespan_out.get()
+        await self.__lifespan_task
+
+    async def request(
+                self, method: str, path: str, *, body: bytes = b'', headers: dict[str, str] = None,
+                on_chunk: Callable[[bytes], None] = None,
+            ) -> tuple[int, bytes]:
+        """
+        Retorna (status, corpo da resposta). Com on_chunk os blocos da resposta são
+        entregues à função e não ficam na memória (o corpo retornado fica vazio).
+        """
+        headers = dict(headers or {})
+        headers.setdefault('host', 'testserver')
+        headers['content-length'] = str(len(body))
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': method,
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': b'',
+            'root_path': '',
+            'headers': [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            'client': ('127.0.0.1', 50000),
+            'server': ('testserver', 80),
+        }
+        sent_body: bool = False
+        offset: int = 0
+        finished = asyncio.Event()
+        status: int = 500
+        chunks: list[bytes] = []
+
+        async def receive() -> dict[str, Any]:
+            nonlocal sent_body, offset
+            if not sent_body:
+                chunk: bytes = body[offset:offset + self.chunk_size]
+                offset += len(chunk)
+                sent_body = offset >= len(body)
+                return {'type': 'http.request', 'body': chunk, 'more_body': not sent_body}
+            # O cliente só "desconecta" depois de receber a resposta inteira.
+            await finished.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message: dict[str, Any]) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body':
+                if on_chunk is not None:
+                    on_chunk(message.get('body', b''))
+                else:
+                    chunks.append(message.get('body', b''))
+                if not message.get('more_body', False):
+                    finished.set()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            finished.set()
+        return status, b''.join(chunks)
+
+
+class HttpClient(object):
+    """
+    Cliente HTTP (http.client) para um servidor uvicorn, cada requisição usa uma
+    conexão própria em uma thread do pool.
+    """
+
+    def __init__(self, base_url: str, *, max_workers: int, timeout: float = 600):
+        parts = urlsplit(base_url)
+        self.host: str = parts.hostname or '127.0.0.1'
+        self.port: int = parts.port or 80
+        self.timeout: float = timeout
+        self.__pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='organize-load')
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        self.__pool.shutdown(wait=False)
+
+    def __request(self, method: str, path: str, body: bytes, headers: dict[str, str]) -> tuple[int, bytes]:
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            conn.request(method, path, body=body if body else None, headers=headers)
+            resp = conn.getresponse()
+            return resp.status, resp.read()
+        finally:
+            conn.close()
+
+    async def request(
+                self, method: str, path: str, *, body: bytes = b'', headers: dict[str, str] = None
+            ) -> tuple[int, bytes]:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.__pool, self.__request, method, path, body, dict(headers or {})
+        )
+
+
+class LoadRecorder(object):
+    """
+    Latência, código HTTP e erros de cada operação (ex: ocr, pattern_submit, progress).
+    """
+
+    def __init__(self):
+        self.__latencies: dict[str, list[float]] = {}
+        self.__status: dict[str, dict[str, int]] = {}
+        self.__errors: dict[str, int] = {}
+
+    def record(self, operation: str, seconds: float, status: int | str, ok: bool) -> None:
+        self.__latencies.setdefault(operation, []).append(seconds)
+        codes = self.__status.setdefault(operation, {})
+        codes[f'{status}'] = codes.get(f'{status}', 0) + 1
+        self.__errors[operation] = self.__errors.get(operation, 0) + (0 if ok else 1)
+
+    def count_ok(self, operation: str) -> int:
+        return len(self.__latencies.get(operation, [])) - self.__errors.get(operation, 0)
+
+    def to_dict(self, wall_seconds: float) -> dict[str, Any]:
+        operations: dict[str, Any] = {}
+        for operation, latencies in self.__latencies.items():
+            errors: int = self.__errors.get(operation, 0)
+            operations[operation] = {
+                'count': len(latencies),
+                'errors': errors,
+                'error_rate': errors / len(latencies) if len(latencies) > 0 else 0.0,
+                'throughput': (len(latencies) - errors) / wall_seconds if wall_seconds > 0 else 0.0,
+                'status_codes': self.__status.get(operation, {}),
+                'latency': summarize(latencies),
+                'samples': latencies,
+            }
+        return operations
+
+
+class LoadScenarios(object):
+    """
+    Requisições de cada cenário, enviando sempre os mesmos arquivos sintéticos.
+    """
+
+    def __init__(
+                self,
+                client: AsgiClient | HttpClient,
+                routes: dict[str, Any],
+                recorder: LoadRecorder, *,
+                images: list[tuple[str, bytes]],
+                pdfs: list[tuple[str, bytes]],
+                poll_interval: float,
+                task_timeout: float,
+            ):
+        self.client: AsgiClient | HttpClient = client
+        self.routes: dict[str, Any] = routes
+        self.recorder: LoadRecorder = recorder
+        self.images: list[tuple[str, bytes]] = images
+        self.pdfs: list[tuple[str, bytes]] = pdfs
+        self.poll_interval: float = poll_interval
+        self.task_timeout: float = task_timeout
+
+    async def __timed(
+                self, operation: str, method: str, path: str, *,
+                body: bytes = b'', content_type: str = None,
+                check: Callable[[int, bytes], bool] = None,
+            ) -> tuple[int | None, bytes]:
+        headers: dict[str, str] = {} if content_type is None else {'content-type': content_type}
+        start = time.perf_counter()
+        try:
+            status, content = await self.client.request(method, path, body=body, headers=headers)
+        except Exception as err:
+            self.recorder.record(operation, time.perf_counter() - start, type(err).__name__, False)
+            return None, b''
+        try:
+            ok: bool = (200 <= status < 300) and ((check is None) or check(status, content))
+        except ValueError:
+            # Corpo inválido (ex: JSON), conta como erro.
+            ok = False
+        self.recorder.record(operation, time.perf_counter() - start, status, ok)
+        return status, content
+
+    async def __post_files(
+                self, operation: str, route: str, field: str, files: list[tuple[str, bytes]],
+                content_type: str, check: Callable[[int, bytes], bool],
+                fields: list[tuple[str, str]] = None,
+            ) -> tuple[int | None, bytes]:
+        body, multipart_type = encode_multipart(
+            fields if fields is not None else [],
+            [(field, name, content, content_type) for name, content in files],
+        )
+        return await self.__timed(
+            operation, 'POST', f"/{self.routes[route]}", body=body, content_type=multipart_type, check=check
+        )
+
+    async def ocr(self) -> None:
+        await self.__post_files('ocr', 'rt_ocr', 'files', self.images, 'image/png', _is_zip)
+
+    async def split(self) -> None:
+        await self.__post_files('split', 'rt_split_pdf', 'files', self.pdfs, 'application/pdf', _is_zip)
+
+    async def join(self) -> None:
+        await self.__post_files('join', 'rt_join_pdf', 'files', self.pdfs, 'application/pdf', _is_pdf)
+
+    async def pattern(self) -> None:
+        """
+        Envia os PDFs para rt_process_pattern, acompanha /progress até a tarefa
+        terminar e baixa o zip em /download (latência total em pattern_end_to_end).
+        """
+        start = time.perf_counter()
+        status, content = await self.__post_files(
+            'pattern_submit', 'rt_process_pattern', 'pdfs', self.pdfs, 'application/pdf',
+            lambda _s, c: 'task_id' in json.loads(c), fields=[('pattern', PATTERN)],
+        )
+        if (status is None) or (status != 200):
+            self.recorder.record('pattern_end_to_end', time.perf_counter() - start, f'{status}', False)
+            return
+        task_id: str = json.loads(content)['task_id']
+
+        done: bool = False
+        while (time.perf_counter() - start) < self.task_timeout:
+            status, content = await self.__timed('progress', 'GET', f'/progress/{task_id}')
+            if (status == 200) and json.loads(content).get('done', False):
+                done = True
+                break
+            await asyncio.sleep(self.poll_interval)
+        if not done:
+            self.recorder.record('pattern_end_to_end', time.perf_counter() - start, 'timeout', False)
+            return
+        status, _ = await self.__timed('download', 'GET', f'/download/{task_id}', check=_is_zip)
+        self.recorder.record('pattern_end_to_end', time.perf_counter() - start, f'{status}', status == 200)
+
+    def get_scenario(self, name: str) -> Callable[[], Awaitable[None]]:
+        return getattr(self, name)
+
+
+def _is_zip(_status: int, content: bytes) -> bool:
+    return content[:2] == b'PK'
+
+
+def _is_pdf(_status: int, content: bytes) -> bool:
+    return content[:5] == b'%PDF-'
+
+
+async def run_scenario(
+            scenarios: LoadScenarios, name: str, *, requests: int, concurrency: int
+        ) -> float:
+    """
+    Executa requests vezes o cenário com concurrency requisições simultâneas,
+    retorna a duração total (segundos).
+    """
+    pending = iter(range(requests))
+    func = scenarios.get_scenario(name)
+
+    async def worker() -> None:
+        # O iterador é compartilhado pelos workers (mesmo loop, sem concorrência real).
+        for _ in pending:
+            await func()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(max(1, concurrency))])
+    return time.perf_counter() - start
+
+
+def create_payloads(workdir: str, args: argparse.Namespace) -> tuple[list[tuple[str, bytes]], list[tuple[str, bytes]]]:
+    """
+    Gera as imagens (rt_ocr) e os PDFs digitalizados (demais rotas) enviados em cada requisição.
+    """
+    generator = SyntheticDocumentGenerator(
+        sp.Directory(os.path.join(workdir, 'payloads')),
+        seed=args.seed, pages=args.pages, noise=args.noise, dpi=args.dpi,
+    )
+    images = [
+        (d.file.basename(), d.file.path.read_bytes())
+        for d in generator.create_batch(KIND_GENERIC, args.files, fmt='png')
+    ]
+    pdfs = [
+        (d.file.basename(), d.file.path.read_bytes())
+        for d in generator.create_batch(KIND_GENERIC, args.files, fmt='pdf')
+    ]
+    return images, pdfs
+
+
+def prepare_environment(workdir: str, args: argparse.Namespace) -> dict[str, str]:
+    """
+    Variáveis de ambiente do servidor: tesseract substituto no PATH (--ocr fake),
+    cache de OCR desativado e diretório das tarefas dentro de workdir.
+    """
+    env: dict[str, str] = {}
+    if args.ocr == 'fake':
+        tess_file: str = create_script(os.path.join(workdir, 'bin'))
+        env['PATH'] = f"{os.path.dirname(tess_file)}{os.pathsep}{os.environ.get('PATH', '')}"
+        env[ENV_TESS_FILE] = tess_file
+        env[ENV_FAKE_OCR_DELAY] = f'{args.fake_ocr_delay}'
+    if not args.ocr_cache:
+        env[ENV_OCR_CACHE] = '0'
+    env.setdefault(ENV_TASK_ROOT, os.environ.get(ENV_TASK_ROOT, os.path.join(workdir, 'tasks')))
+    return env
+
+
+def read_routes() -> dict[str, Any]:
+    with open(FILE_ROUTES, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def warn_shadowed_routes(routes: dict[str, Any]) -> list[tuple[str, str]]:
+    """
+    Avisa sobre as rotas (rt_*) que usam o mesmo caminho: o servidor atende só a
+    registrada primeiro no server.py e as requisições da outra recebem a resposta errada.
+    """
+    shadowed: list[tuple[str, str]] = []
+    seen: dict[str, str] = {}
+    for key, path in routes.items():
+        if not key.startswith('rt_'):
+            continue
+        if path in seen:
+            shadowed.append((seen[path], key))
+            print(f'AVISO: {seen[path]} e {key} usam o mesmo caminho /{path}, o servidor atende só uma das duas rotas')
+        else:
+            seen[path] = key
+    return shadowed
+
+
+def start_uvicorn(env: dict[str, str], *, port: int, log_file: str, timeout: float = 120) -> subprocess.Popen:
+    """
+    Inicia 'uvicorn server:app' em backend/ e espera /metrics responder.
+    """
+    full_env = dict(os.environ)
+    full_env.update(env)
+    log = open(log_file, 'wb')
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'server:app', '--host', '127.0.0.1', '--port', f'{port}'],
+        cwd=BACKEND_DIR, env=full_env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    log.close()
+    start = time.monotonic()
+    while (time.monotonic() - start) < timeout:
+        if proc.poll() is not None:
+            raise RuntimeError(f'O uvicorn terminou com o código {proc.returncode}, veja {log_file}')
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/metrics')
+            if conn.getresponse().status == 200:
+                conn.close()
+                return proc
+            conn.close()
+        except OSError:
+            pass
+        time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError(f'O uvicorn não respondeu em {timeout}s, veja {log_file}')
+
+
+async def run_load(args: argparse.Namespace, workdir: str) -> dict[str, Any]:
+    env: dict[str, str] = prepare_environment(workdir, args)
+    images, pdfs = create_payloads(workdir, args)
+    server_proc: subprocess.Popen | None = None
+    server_pid: int | None = args.server_pid
+
+    if args.spawn:
+        server_proc = start_uvicorn(env, port=args.port, log_file=os.path.join(workdir, 'uvicorn.log'))
+        server_pid = server_proc.pid
+        client = HttpClient(f'http://127.0.0.1:{args.port}', max_workers=args.concurrency)
+        routes = read_routes()
+        target = f'spawn:http://127.0.0.1:{args.port}'
+    elif args.target == TARGET_INPROCESS:
+        # O servidor lê as variáveis ao ser importado, no mesmo processo do teste.
+        os.environ.update(env)
+        if BACKEND_DIR not in sys.path:
+            sys.path.insert(0, BACKEND_DIR)
+        import server
+        client = AsgiClient(server.app)
+        routes = server.route_info
+        target = TARGET_INPROCESS
+    else:
+        client = HttpClient(args.target, max_workers=args.concurrency)
+        routes = read_routes()
+        target = args.target
+
+    warn_shadowed_routes(routes)
+    results: list[dict[str, Any]] = []
+    sampler = RssSampler(server_pid)
+    # Sem o pid de um servidor externo não há como medir a memória.
+    measure_rss: bool = (target == TARGET_INPROCESS) or (server_pid is not None)
+    try:
+        await client.start()
+        if measure_rss:
+            sampler.start()
+        for name in args.scenarios:
+            recorder = LoadRecorder()
+            scenarios = LoadScenarios(
+                client, routes, recorder, images=images, pdfs=pdfs,
+                poll_interval=args.poll_interval, task_timeout=args.task_timeout,
+            )
+            wall: float = await run_scenario(scenarios, name, requests=args.requests, concurrency=args.concurrency)
+            main_op: str = 'pattern_end_to_end' if name == 'pattern' else name
+            result = {
+                'scenario': name,
+                'requests': args.requests,
+                'concurrency': args.concurrency,
+                'files_per_request': args.files,
+                'wall_seconds': wall,
+                'throughput': recorder.count_ok(main_op) / wall if wall > 0 else 0.0,
+                'operations': recorder.to_dict(wall),
+            }
+            print_result(result)
+            results.append(result)
+    finally:
+        await sampler.stop()
+        await client.stop()
+        peak_rss: int | None = read_rss_bytes(server_pid, field='VmHWM') if measure_rss else None
+        if server_proc is not None:
+            server_proc.terminate()
+            try:
+                server_proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                server_proc.kill()
+
+    return {
+        'benchmark': 'load_test',
+        'version': get_package_version(),
+        'environment': get_environment_info(),
+        'target': target,
+        'config': {k: v for k, v in vars(args).items() if k != 'output'},
+        'peak_rss_bytes': peak_rss,
+        'rss_max_sampled_bytes': sampler.max_bytes if measure_rss else None,
+        'results': results,
+    }
+
+
+def print_result(result: dict[str, Any]) -> None:
+    print(
+        f"{result['scenario']}: {result['throughput']:.2f} req/s em {result['wall_seconds']:.1f}s "
+        f"(concorrência {result['concurrency']})"
+    )
+    for operation, values in result['operations'].items():
+        lat = values['latency']
+        print(
+            f"    {operation:<20} n={values['count']:<5} erros={values['error_rate'] * 100:5.1f}%  "
+            f"p50={lat['p50'] * 1000:9.1f}ms  p95={lat['p95'] * 1000:9.1f}ms  p99={lat['p99'] * 1000:9.1f}ms"
+        )
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Teste de carga das rotas do servidor.')
+    parser.add_argument('--target', default=TARGET_INPROCESS, help="'inprocess' ou a URL de um uvicorn")
+    parser.add_argument('--spawn', action='store_true', help='inicia um uvicorn local para o teste')
+    parser.add_argument('--port', type=int, default=5055, help='porta do uvicorn iniciado com --spawn')
+    parser.add_argument('--server-pid', type=int, default=None, help='pid do servidor externo (medição do RSS)')
+    parser.add_argument('--scenarios', type=parse_str_list, default=list(SCENARIOS), help=','.join(SCENARIOS))
+    parser.add_argument('--requests', type=int, default=20, help='requisições por cenário')
+    parser.add_argument('--concurrency', type=int, default=4, help='requisições simultâneas')
+    parser.add_argument('--files', type=int, default=2, help='arquivos enviados em cada requisição')
+    parser.add_argument('--pages', type=int, default=2, help='páginas de cada PDF')
+    parser.add_argument('--noise', type=float, default=0.0)
+    parser.add_argument('--dpi', type=int, default=100, help='resolução das páginas sintéticas')
+    parser.add_argument('--ocr', choices=['fake', 'real'], default='fake')
+    parser.add_argument('--fake-ocr-delay', type=float, default=0.0, help='segundos de cada chamada ao OCR substituto')
+    parser.add_argument('--ocr-cache', action='store_true', help='mantém o cache de OCR ativo')
+    parser.add_argument('--poll-interval', type=float, default=0.5, help='intervalo das consultas a /progress')
+    parser.add_argument('--task-timeout', type=float, default=600, help='tempo máximo de cada tarefa rt_process_pattern')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workdir', default=None, help='diretório dos arquivos do teste (padrão: temporário)')
+    parser.add_argument('--output', default='load_test.json', help="arquivo JSON ou '-' (saída padrão)")
+    add_history_arguments(parser)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> dict[str, Any]:
+    args = create_parser().parse_args(argv)
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            raise SystemExit(f'Cenário inválido: {name}, use um de {SCENARIOS}')
+    workdir: str = args.workdir if args.workdir is not None else tempfile.mkdtemp(prefix='organize-load-')
+    try:
+        data: dict[str, Any] = asyncio.run(run_load(args, workdir))
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+    write_results(data, args.output)
+    record_history(data, args)
+    return data
+
+
+if __name__ == '__main__':
+    main()
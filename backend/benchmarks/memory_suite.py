@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Pico de memória das rotas do servidor e da exportação do zip com entradas grandes
+geradas pelo SyntheticDocumentGenerator:
+
+    join         rt_join_pdf com muitos PDFs (--join-files x --join-pages)
+    split        rt_split_pdf com um PDF de --split-pages páginas
+    pattern      rt_process_pattern com centenas de imagens + /progress + /download
+    ocr          rt_ocr com --ocr-images imagens
+    zip_export   CreateFileNames.export_new_files_to_zip (zip em BytesIO)
+    zip_file     CreateFileNames.export_new_files_to_zip_file (zip gravado no disco)
+
+As rotas são chamadas no mesmo processo (AsgiClient do load_test, executor das rotas
+em threads), cada caso mede:
+    tracemalloc_peak   pico das alocações do Python acima do que já estava alocado
+    rss_growth         pico do RSS (VmHWM, zerado antes de cada caso) menos o RSS inicial
+O tracemalloc não vê a memória alocada pelas bibliotecas em C (MuPDF, Pillow), por
+isso o RSS também é medido. O tesseract roda em outro processo e não entra na conta.
+
+Cada caso tem um limite (MB) para as duas medidas, o script sai com código 1 quando
+algum limite é ultrapassado e com 2 quando um caso falha. Os limites padrão podem ser
+trocados com --budget ou com ORGANIZE_MEMORY_BUDGETS, no formato:
+    caso=tracemalloc_mb[:rss_mb],caso=...     ex: join=64:256,split=:128
+
+Uso (a partir de backend/):
+    python -m benchmarks.memory_suite --cases join,split,zip_export --output memory_suite.json
+    python -m benchmarks.memory_suite --budget pattern=80:400 --pattern-images 300
+"""
+from __future__ import annotations
+from typing import Any, Callable
+import argparse
+import asyncio
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import soup_files as sp
+from benchmarks.common import get_environment_info, get_package_version, parse_str_list, write_results
+from benchmarks.load_test import (
+    BACKEND_DIR, PATTERN, AsgiClient, encode_multipart, prepare_environment, read_rss_bytes,
+    warn_shadowed_routes,
+)
+from benchmarks.synthetic import KIND_GENERIC, SyntheticDocument, SyntheticDocumentGenerator
+
+ENV_MEMORY_BUDGETS: str = 'ORGANIZE_MEMORY_BUDGETS'
+ENV_ROUTE_EXECUTOR: str = 'ORGANIZE_ROUTE_EXECUTOR'
+ENV_UPLOAD_MAX_MB: str = 'ORGANIZE_UPLOAD_MAX_MB'
+
+CASE_JOIN: str = 'join'
+CASE_SPLIT: str = 'split'
+CASE_PATTERN: str = 'pattern'
+CASE_OCR: str = 'ocr'
+CASE_ZIP_EXPORT: str = 'zip_export'
+CASE_ZIP_FILE: str = 'zip_file'
+CASES: tuple[str, ...] = (CASE_JOIN, CASE_SPLIT, CASE_PATTERN, CASE_OCR, CASE_ZIP_EXPORT, CASE_ZIP_FILE)
+
+# Limites padrão (MB) de cada caso: (tracemalloc, crescimento do RSS), None = sem limite.
+# Cerca de 3x o medido com as entradas padrão, folga para a variação entre máquinas.
+DEFAULT_BUDGETS: dict[str, tuple[float | None, float | None]] = {
+    CASE_JOIN: (24, 96),
+    CASE_SPLIT: (16, 64),
+    CASE_PATTERN: (24, 128),
+    CASE_OCR: (16, 64),
+    CASE_ZIP_EXPORT: (16, 64),
+    CASE_ZIP_FILE: (8, 32),
+}
+
+EXIT_BUDGET: int = 1
+EXIT_ERROR: int = 2
+
+_MB: int = 1024 * 1024
+
+
+def parse_budgets(value: str) -> dict[str, tuple[float | None, float | None]]:
+    """
+    Converte 'join=64:256,split=:128' em {'join': (64, 256), 'split': (None, 128)}.
+    """
+    budgets: dict[str, tuple[float | None, float | None]] = {}
+    for item in parse_str_list(value):
+        case, sep, limits = item.partition('=')
+        case = case.strip()
+        if (sep == '') or (case not in CASES):
+            raise ValueError(f'Limite inválido: {item}, use caso=tracemalloc_mb[:rss_mb] com um caso de {CASES}')
+        traced, _, rss = limits.partition(':')
+        budgets[case] = (
+            float(traced) if traced.strip() != '' else None,
+            float(rss) if rss.strip() != '' else None,
+        )
+    return budgets
+
+
+def get_budgets(overrides: list[str]) -> dict[str, tuple[float | None, float | None]]:
+    """
+    Limites padrão, atualizados por ORGANIZE_MEMORY_BUDGETS e depois pelas opções --budget.
+    """
+    budgets = dict(DEFAULT_BUDGETS)
+    budgets.update(parse_budgets(os.environ.get(ENV_MEMORY_BUDGETS, '')))
+    for value in overrides:
+        budgets.update(parse_budgets(value))
+    return budgets
+
+
+def reset_peak_rss() -> bool:
+    """
+    Zera o VmHWM do processo (Linux >= 4.0), retorna False quando não é possível.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        return False
+    return True
+
+
+class MemoryProbe(object):
+    """
+    Mede o pico de memória do bloco with: tracemalloc (acima do que já estava
+    alocado ao entrar) e RSS (VmHWM zerado na entrada, ou a maior leitura de uma
+    thread que amostra o RSS a cada interval segundos quando não há como zerar).
+    """
+
+    def __init__(self, *, interval: float = 0.02, trace: bool = True):
+        self.interval: float = interval
+        self.trace: bool = trace
+        self.traced_peak_bytes: int | None = None
+        self.rss_before_bytes: int | None = None
+        self.rss_peak_bytes: int | None = None
+        self.rss_method: str | None = None
+        self.seconds: float = 0
+        self.__traced_start: int = 0
+        self.__hwm_reset: bool = False
+        self.__sampled_max: int = 0
+        self.__stop = threading.Event()
+        self.__thread: threading.Thread | None = None
+        self.__start: float = 0
+
+    def __sample(self) -> None:
+        while not self.__stop.is_set():
+            current = read_rss_bytes()
+            if (current is not None) and (current > self.__sampled_max):
+                self.__sampled_max = current
+            self.__stop.wait(self.interval)
+
+    def __enter__(self) -> MemoryProbe:
+        gc.collect()
+        if self.trace:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self.__traced_start = tracemalloc.get_traced_memory()[0]
+        self.rss_before_bytes = read_rss_bytes()
+        self.__hwm_reset = reset_peak_rss()
+        self.__thread = threading.Thread(target=self.__sample, name='organize-memory-probe', daemon=True)
+        self.__thread.start()
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.seconds = time.perf_counter() - self.__start
+        if self.trace:
+            self.traced_peak_bytes = max(0, tracemalloc.get_traced_memory()[1] - self.__traced_start)
+        self.__stop.set()
+        self.__thread.join()
+        hwm = read_rss_bytes(field='VmHWM') if self.__hwm_reset else None
+        if hwm is not None:
+            self.rss_peak_bytes, self.rss_method = max(hwm, self.__sampled_max), 'vmhwm'
+        elif self.__sampled_max > 0:
+            self.rss_peak_bytes, self.rss_method = self.__sampled_max, 'sampled'
+
+    @property
+    def rss_growth_bytes(self) -> int | None:
+        if (self.rss_peak_bytes is None) or (self.rss_before_bytes is None):
+            return None
+        return max(0, self.rss_peak_bytes - self.rss_before_bytes)
+
+
+class BodySink(object):
+    """Conta os bytes da resposta sem mantê-los na memória (guarda só o início)."""
+
+    def __init__(self):
+        self.size: int = 0
+        self.head: bytes = b''
+
+    def __call__(self, chunk: bytes) -> None:
+        if len(self.head) < 8:
+            self.head += chunk[:8 - len(self.head)]
+        self.size += len(chunk)
+
+
+def read_files(docs: list[SyntheticDocument]) -> list[tuple[str, bytes]]:
+    return [(d.file.basename(), d.file.path.read_bytes()) for d in docs]
+
+
+class MemorySuite(object):
+    """
+    Gera as entradas de cada caso, executa o caso dentro de um MemoryProbe e
+    compara o resultado com os limites.
+    """
+
+    def __init__(self, args: argparse.Namespace, workdir: str, budgets: dict[str, tuple[float | None, float | None]]):
+        self.args: argparse.Namespace = args
+        self.workdir: str = workdir
+        self.budgets: dict[str, tuple[float | None, float | None]] = budgets
+        self.client: AsgiClient | None = None
+        self.routes: dict[str, Any] = {}
+
+    def create_generator(self, name: str, *, pages: int = 1, text_layer: bool = False) -> SyntheticDocumentGenerator:
+        return SyntheticDocumentGenerator(
+            sp.Directory(os.path.join(self.workdir, 'inputs', name)),
+            seed=self.args.seed, pages=pages, noise=self.args.noise, dpi=self.args.dpi, text_layer=text_layer,
+        )
+
+    async def post_files(
+                self, route: str, field: str, files: list[tuple[str, bytes]], content_type: str, *,
+                fields: list[tuple[str, str]] = None, probe: MemoryProbe,
+            ) -> tuple[int, BodySink]:
+        """
+        Envia os arquivos para a rota dentro do probe, o corpo multipart é montado
+        antes para não entrar na medição. Retorna (status, sink com o tamanho da resposta).
+        """
+        body, multipart_type = encode_multipart(
+            fields if fields is not None else [],
+            [(field, name, content, content_type) for name, content in files],
+        )
+        sink = BodySink()
+        with probe:
+            status, _ = await self.client.request(
+                'POST', f'/{self.routes[route]}', body=body, headers={'content-type': multipart_type}, on_chunk=sink,
+            )
+        return status, sink
+
+    async def case_join(self, probe: MemoryProbe) -> dict[str, Any]:
+        files = read_files(self.create_generator(CASE_JOIN, pages=self.args.join_pages).create_batch(
+            KIND_GENERIC, self.args.join_files, fmt='pdf'
+        ))
+        status, sink = await self.post_files('rt_join_pdf', 'files', files, 'application/pdf', probe=probe)
+        return {
+            'files': len(files), 'pages': len(files) * self.args.join_pages,
+            'input_bytes': sum(len(c) for _, c in files),
+            'status': status, 'response_bytes': sink.size, 'ok': (status == 200) and sink.head.startswith(b'%PDF-'),
+        }
+
+    async def case_split(self, probe: MemoryProbe) -> dict[str, Any]:
+        files = read_files(self.create_generator(CASE_SPLIT, pages=self.args.split_pages).create_batch(
+            KIND_GENERIC, 1, fmt='pdf'
+        ))
+        status, sink = await self.post_files('rt_split_pdf', 'files', files, 'application/pdf', probe=probe)
+        return {
+            'files': 1, 'pages': self.args.split_pages, 'input_bytes': len(files[0][1]),
+            'status': status, 'response_bytes': sink.size, 'ok': (status == 200) and sink.head.startswith(b'PK'),
+        }
+
+    async def case_ocr(self, probe: MemoryProbe) -> dict[str, Any]:
+        files = read_files(self.create_generator(CASE_OCR).create_batch(KIND_GENERIC, self.args.ocr_images, fmt='png'))
+        status, sink = await self.post_files('rt_ocr', 'files', files, 'image/png', probe=probe)
+        return {
+            'files': len(files), 'input_bytes': sum(len(c) for _, c in files),
+            'status': status, 'response_bytes': sink.size, 'ok': (status == 200) and sink.head.startswith(b'PK'),
+        }
+
+    async def case_pattern(self, probe: MemoryProbe) -> dict[str, Any]:
+        """
+        Envia as imagens, acompanha /progress até a tarefa terminar e baixa o zip,
+        tudo dentro do probe (a tarefa roda em uma thread do JobScheduler).
+        """
+        files = read_files(
+            self.create_generator(CASE_PATTERN).create_batch(KIND_GENERIC, self.args.pattern_images, fmt='png')
+        )
+        body, multipart_type = encode_multipart(
+            [('pattern', PATTERN)], [('images', name, content, 'image/png') for name, content in files]
+        )
+        input_bytes: int = sum(len(c) for _, c in files)
+        del files
+        result: dict[str, Any] = {'files': self.args.pattern_images, 'input_bytes': input_bytes, 'ok': False}
+        sink = BodySink()
+        with probe:
+            status, content = await self.client.request(
+                'POST', f"/{self.routes['rt_process_pattern']}", body=body, headers={'content-type': multipart_type}
+            )
+            result['status'] = status
+            task_id: str | None = json.loads(content).get('task_id') if status == 200 else None
+            start = time.perf_counter()
+            done: bool = False
+            while (task_id is not None) and ((time.perf_counter() - start) < self.args.task_timeout):
+                status, content = await self.client.request('GET', f'/progress/{task_id}')
+                if (status == 200) and json.loads(content).get('done', False):
+                    done = True
+                    break
+                await asyncio.sleep(self.args.poll_interval)
+            if done:
+                status, _ = await self.client.request('GET', f'/download/{task_id}', on_chunk=sink)
+                result.update({'status': status, 'ok': (status == 200) and sink.head.startswith(b'PK')})
+            elif task_id is not None:
+                result['status'] = 'timeout'
+        result['response_bytes'] = sink.size
+        return result
+
+    def __zip_export(self, probe: MemoryProbe, name: str, export: Callable[[Any], Any]) -> dict[str, Any]:
+        # Importados aqui: o organize_stream exige o tesseract no PATH (preparado em run).
+        from benchmarks.bench_pipeline import create_name_finder, create_origin_info
+
+        docs = self.create_generator(name, text_layer=True).create_batch(KIND_GENERIC, self.args.zip_files, fmt='pdf')
+        name_finder = create_name_finder(KIND_GENERIC)
+        for doc in docs:
+            name_finder.add_disk_file(create_origin_info(doc))
+        named: int = name_finder.get_list_key_files().length
+        with probe:
+            output = export(name_finder)
+            output_bytes: int = 0 if output is None else (
+                output.getbuffer().nbytes if hasattr(output, 'getbuffer') else output.path.stat().st_size
+            )
+            del output
+        return {
+            'files': len(docs), 'named': named, 'input_bytes': sum(d.file.path.stat().st_size for d in docs),
+            'response_bytes': output_bytes, 'ok': (named > 0) and (output_bytes > 0),
+        }
+
+    async def case_zip_export(self, probe: MemoryProbe) -> dict[str, Any]:
+        return self.__zip_export(probe, CASE_ZIP_EXPORT, lambda f: f.export_new_files_to_zip())
+
+    async def case_zip_file(self, probe: MemoryProbe) -> dict[str, Any]:
+        output_zip = sp.File(os.path.join(self.workdir, 'resultado.zip'))
+        return self.__zip_export(probe, CASE_ZIP_FILE, lambda f: f.export_new_files_to_zip_file(output_zip))
+
+    def check_budget(self, case: str, probe: MemoryProbe) -> list[str]:
+        traced_mb, rss_mb = self.budgets.get(case, (None, None))
+        failures: list[str] = []
+        if (traced_mb is not None) and (probe.traced_peak_bytes is not None):
+            if probe.traced_peak_bytes > traced_mb * _MB:
+                failures.append(f'tracemalloc {probe.traced_peak_bytes / _MB:.1f}MB > {traced_mb}MB')
+        if (rss_mb is not None) and (probe.rss_growth_bytes is not None):
+            if probe.rss_growth_bytes > rss_mb * _MB:
+                failures.append(f'rss {probe.rss_growth_bytes / _MB:.1f}MB > {rss_mb}MB')
+        return failures
+
+    async def run_case(self, case: str) -> dict[str, Any]:
+        probe = MemoryProbe(trace=not self.args.no_tracemalloc)
+        try:
+            result: dict[str, Any] = await getattr(self, f'case_{case}')(probe)
+        except Exception as err:
+            print(f'DEBUG: falha no caso {case}: {err}')
+            result = {'ok': False, 'error': f'{type(err).__name__}: {err}'}
+        traced_mb, rss_mb = self.budgets.get(case, (None, None))
+        result.update({
+            'case': case,
+            'seconds': probe.seconds,
+            'tracemalloc_peak_bytes': probe.traced_peak_bytes,
+            'rss_before_bytes': probe.rss_before_bytes,
+            'rss_peak_bytes': probe.rss_peak_bytes,
+            'rss_growth_bytes': probe.rss_growth_bytes,
+            'rss_method': probe.rss_method,
+            'budget_mb': {'tracemalloc': traced_mb, 'rss': rss_mb},
+            'failures': self.check_budget(case, probe) if result['ok'] else [],
+        })
+        return result
+
+    async def run(self) -> list[dict[str, Any]]:
+        # O servidor lê as variáveis ao ser importado, no mesmo processo da medição.
+        os.environ.update(prepare_environment(self.workdir, self.args))
+        # Threads: o trabalho das rotas fica no processo medido.
+        os.environ[ENV_ROUTE_EXECUTOR] = 'thread'
+        os.environ[ENV_UPLOAD_MAX_MB] = f'{self.args.upload_max_mb}'
+        if BACKEND_DIR not in sys.path:
+            sys.path.insert(0, BACKEND_DIR)
+        import server
+
+        self.client = AsgiClient(server.app)
+        self.routes = server.route_info
+        warn_shadowed_routes(self.routes)
+        results: list[dict[str, Any]] = []
+        await self.client.start()
+        try:
+            for case in self.args.cases:
+                result = await self.run_case(case)
+                print_result(result)
+                results.append(result)
+        finally:
+            await self.client.stop()
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+        return results
+
+
+def _format_mb(value: int | None) -> str:
+    return '-' if value is None else f'{value / _MB:8.1f}MB'
+
+
+def print_result(result: dict[str, Any]) -> None:
+    if not result['ok']:
+        status = f"FALHOU ({result.get('error') or result.get('status')})"
+    elif len(result['failures']) > 0:
+        status = f"ACIMA DO LIMITE: {'; '.join(result['failures'])}"
+    else:
+        status = 'ok'
+    print(
+        f"{result['case']:<11} tracemalloc={_format_mb(result['tracemalloc_peak_bytes'])}  "
+        f"rss+={_format_mb(result['rss_growth_bytes'])}  pico rss={_format_mb(result['rss_peak_bytes'])}  "
+        f"{result['seconds']:7.1f}s  {status}"
+    )
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Pico de memória das rotas e da exportação do zip.')
+    parser.add_argument('--cases', type=parse_str_list, default=list(CASES), help=','.join(CASES))
+    parser.add_argument(
+        '--budget', action='append', default=[],
+        help=f'caso=tracemalloc_mb[:rss_mb], pode ser repetido (também em ${ENV_MEMORY_BUDGETS})',
+    )
+    parser.add_argument('--join-files', type=int, default=40, help='PDFs enviados ao rt_join_pdf')
+    parser.add_argument('--join-pages', type=int, default=5, help='páginas de cada PDF do rt_join_pdf')
+    parser.add_argument('--split-pages', type=int, default=100, help='páginas do PDF do rt_split_pdf')
+    parser.add_argument('--pattern-images', type=int, default=200, help='imagens enviadas ao rt_process_pattern')
+    parser.add_argument('--ocr-images', type=int, default=10, help='imagens enviadas ao rt_ocr')
+    parser.add_argument('--zip-files', type=int, default=200, help='documentos da exportação do zip')
+    parser.add_argument('--dpi', type=int, default=100, help='resolução das páginas sintéticas')
+    parser.add_argument('--noise', type=float, default=0.0)
+    parser.add_argument('--ocr', choices=['fake', 'real'], default='fake')
+    parser.add_argument('--fake-ocr-delay', type=float, default=0.0, help='segundos de cada chamada ao OCR substituto')
+    parser.add_argument('--ocr-cache', action='store_true', help='mantém o cache de OCR ativo')
+    parser.add_argument('--upload-max-mb', type=int, default=4096, help='limite dos uploads do servidor no teste')
+    parser.add_argument('--poll-interval', type=float, default=0.5, help='intervalo das consultas a /progress')
+    parser.add_argument('--task-timeout', type=float, default=1800, help='tempo máximo da tarefa rt_process_pattern')
+    parser.add_argument('--no-tracemalloc', action='store_true', help='mede só o RSS (sem o custo do tracemalloc)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workdir', default=None, help='diretório dos arquivos do teste (padrão: temporário)')
+    parser.add_argument('--output', default='memory_suite.json', help="arquivo JSON ou '-' (saída padrão)")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = create_parser().parse_args(argv)
+    for name in args.cases:
+        if name not in CASES:
+            raise SystemExit(f'Caso inválido: {name}, use um de {CASES}')
+    try:
+        budgets = get_budgets(args.budget)
+    except ValueError as err:
+        raise SystemExit(f'{err}')
+
+    workdir: str = args.workdir if args.workdir is not None else tempfile.mkdtemp(prefix='organize-memory-')
+    try:
+        results: list[dict[str, Any]] = asyncio.run(MemorySuite(args, workdir, budgets).run())
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    write_results({
+        'benchmark': 'memory',
+        'version': get_package_version(),
+        'environment': get_environment_info(),
+        'config': {k: v for k, v in vars(args).items() if k not in ('output', 'budget')},
+        'budgets_mb': {case: {'tracemalloc': t, 'rss': r} for case, (t, r) in budgets.items()},
+        'results': results,
+    }, args.output)
+
+    failed = [r['case'] for r in results if not r['ok']]
+    exceeded = [r['case'] for r in results if len(r['failures']) > 0]
+    if len(failed) > 0:
+        print(f"ERRO: casos com falha: {', '.join(failed)}", file=sys.stderr)
+        return EXIT_ERROR
+    if len(exceeded) > 0:
+        print(f"Limites de memória ultrapassados: {', '.join(exceeded)}", file=sys.stderr)
+        return EXIT_BUDGET
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
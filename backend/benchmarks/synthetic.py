@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Gerador de documentos sintéticos (cartas de cálculo, fichas EPI e documentos
+genéricos) usados nos benchmarks. O texto é renderizado em PNG/PDF com o mesmo
+layout que os filtros de organize_stream procuram (UC/TOI/LIVRO/LOCALIDADE/MEDIDOR,
+MATRICULA + data por extenso, PROTOCOLO), com ruído e número de páginas configuráveis.
+"""
+from __future__ import annotations
+from io import BytesIO
+import random
+import numpy as np
+import pandas as pd
+import soup_files as sp
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+try:
+    import pymupdf as fitz
+except ImportError:
+    import fitz
+
+# Tipos de documento, os mesmos valores de organize_stream.EnumDigitalDoc.
+KIND_GENERIC: str = 'generic'
+KIND_CARTA_CALCULO: str = 'carta_calculo'
+KIND_EPI: str = 'epi'
+DOCUMENT_KINDS: tuple[str, ...] = (KIND_CARTA_CALCULO, KIND_EPI, KIND_GENERIC)
+
+# Colunas da planilha gerada para FilterData/FindNameInnerData.
+COL_KEY: str = 'CHAVE'
+COL_NEW_NAME: str = 'NOVO_NOME'
+COL_EXTRA: str = 'SETOR'
+
+# Tamanho A4 em pontos (PDF).
+_A4_POINTS: tuple[float, float] = (595.0, 842.0)
+
+_LOCALIDADES: list[str] = ['NOVA MAMORE', 'GUAJARA MIRIM', 'VISTA ALEGRE', 'EXTREMA']
+_DIAS: list[str] = ['segunda-feira', 'terca-feira', 'quarta-feira', 'quinta-feira', 'sexta-feira']
+_MESES: list[str] = [
+    'janeiro', 'fevereiro', 'abril', 'maio', 'junho', 'julho',
+    'agosto', 'setembro', 'outubro', 'novembro', 'dezembro',
+]
+_NOMES: list[str] = [
+    'ANA', 'BRUNO', 'CARLOS', 'DANIELA', 'EDUARDO', 'FERNANDA', 'GABRIEL',
+    'HELENA', 'IGOR', 'JULIANA', 'LUCAS', 'MARIANA', 'PAULO', 'RAFAELA',
+]
+_SOBRENOMES: list[str] = ['SILVA', 'SOUZA', 'OLIVEIRA', 'PEREIRA', 'LIMA', 'COSTA', 'RIBEIRO', 'ALVES']
+_SETORES: list[str] = ['COMERCIAL', 'MANUTENCAO', 'LEITURA', 'ALMOXARIFADO', 'JURIDICO']
+_PALAVRAS: list[str] = [
+    'consumo', 'energia', 'leitura', 'faturamento', 'cliente', 'unidade', 'periodo',
+    'valor', 'registro', 'medicao', 'tarifa', 'referencia', 'servico', 'contrato',
+    'equipamento', 'entrega', 'responsavel', 'conforme', 'anexo', 'documento',
+]
+
+
+class SyntheticDocument(object):
+    """
+    Documento gerado: arquivo, tipo, chave de busca (presente no texto e na planilha)
+    e o nome esperado na planilha.
+    """
+
+    def __init__(self, file: sp.File, *, kind: str, key: str, new_name: str, pages: int, lines: list[str]):
+        self.file: sp.File = file
+        self.kind: str = kind
+        self.key: str = key
+        self.new_name: str = new_name
+        self.pages: int = pages
+        self.lines: list[str] = lines
+
+    def __repr__(self):
+        return f'{__class__.__name__}({self.kind}, {self.key}, {self.file.basename()})'
+
+
+def _random_name(rnd: random.Random) -> str:
+    return f'{rnd.choice(_NOMES)} {rnd.choice(_SOBRENOMES)} {rnd.choice(_SOBRENOMES)}'
+
+
+def create_filler_lines(rnd: random.Random, count: int) -> list[str]:
+    """
+    Linhas de texto sem palavras-chave, usadas para completar as páginas.
+    """
+    return [' '.join(rnd.choice(_PALAVRAS) for _ in range(rnd.randint(5, 9))) for _ in range(count)]
+
+
+def create_document_lines(kind: str, rnd: random.Random, num: int) -> tuple[list[str], str, str]:
+    """
+    Retorna (linhas da primeira página, chave, novo nome) de um documento do tipo kind.
+    """
+    if kind == KIND_CARTA_CALCULO:
+        uc = f'{rnd.randint(1000000, 9999999)}'
+        toi = f'{rnd.randint(100000, 999999)}'
+        lines = [
+            'CARTA AO CLIENTE - CALCULO DE RECUPERACAO DE CONSUMO',
+            f'UC {uc} TOI {toi}',
+            f'LIVRO {rnd.randint(1, 99):02d} POSTAGEM {rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/2024',
+            f'LOCALIDADE {rnd.choice(_LOCALIDADES)}',
+            f'MEDIDOR {rnd.randint(10000000, 99999999)}',
+        ]
+        return lines, uc, f'CARTA {uc}'
+    if kind == KIND_EPI:
+        matr = f'{rnd.randint(10000, 99999)}'
+        lines = [
+            'FICHA DE CONTROLE DE ENTREGA DE EPI',
+            'MATRICULA E NOME DO EMPREGADO',
+            f'{matr} {_random_name(rnd)}',
+            f'SETOR {rnd.choice(_SETORES)}',
+        ]
+        return lines, matr, f'EPI {matr}'
+    if kind == KIND_GENERIC:
+        protocolo = f'{rnd.randint(2019, 2025)}{num:06d}'
+        lines = [
+            'DOCUMENTO DIGITALIZADO',
+            f'PROTOCOLO {protocolo}',
+            f'INTERESSADO {_random_name(rnd)}',
+        ]
+        return lines, protocolo, f'DOC {protocolo}'
+    raise ValueError(f'Tipo de documento inválido: {kind}, use um de {DOCUMENT_KINDS}')
+
+
+def _create_date_line(rnd: random.Random) -> str:
+    # Data por extenso no rodapé, lida por FichaEpi.get_date_doc().
+    return (
+        f'Porto Velho, {rnd.choice(_DIAS)}, {rnd.randint(1, 28)} de '
+        f'{rnd.choice(_MESES)} de {rnd.randint(2019, 2025)}'
+    )
+
+
+def create_text_document(kind: str, rnd: random.Random, num: int, *, num_lines: int) -> tuple[list[str], str, str]:
+    """
+    Retorna (linhas, chave, novo nome) de um documento com num_lines linhas de texto,
+    sem renderizar páginas (como o texto já extraído pelo OCR).
+    """
+    lines, key, new_name = create_document_lines(kind, rnd, num)
+    lines = lines + create_filler_lines(rnd, max(0, num_lines - len(lines)))
+    if kind == KIND_EPI:
+        lines[-1] = _create_date_line(rnd)
+    return lines, key, new_name
+
+
+def _load_font(size: int) -> ImageFont.ImageFont:
+    try:
+        return ImageFont.truetype('DejaVuSans.ttf', size)
+    except OSError:
+        return ImageFont.load_default(size=size)
+
+
+def apply_noise(img: Image.Image, noise: float, rnd: random.Random) -> Image.Image:
+    """
+    Simula uma digitalização: rotação de até 2*noise graus, desfoque e a fração
+    noise dos pixels trocada por preto/branco (sal e pimenta). noise=0 não altera a imagem.
+    """
+    if noise <= 0:
+        return img
+    img = img.rotate(rnd.uniform(-2 * noise, 2 * noise), expand=False, fillcolor=255)
+    img = img.filter(ImageFilter.GaussianBlur(radius=min(1.5, noise * 3)))
+    gen = np.random.default_rng(rnd.randint(0, 2 ** 32 - 1))
+    arr = np.array(img, dtype=np.uint8)
+    mask = gen.random(arr.shape) < noise
+    arr[mask] = gen.choice(np.array([0, 255], dtype=np.uint8), size=int(mask.sum()))
+    return Image.fromarray(arr, mode='L')
+
+
+def render_page_image(lines: list[str], *, dpi: int = 150, noise: float = 0.0, rnd: random.Random = None) -> Image.Image:
+    """
+    Renderiza as linhas em uma página A4 em tons de cinza com a resolução dpi.
+    """
+    if rnd is None:
+        rnd = random.Random(0)
+    width, height = int(8.27 * dpi), int(11.69 * dpi)
+    img = Image.new('L', (width, height), color=255)
+    draw = ImageDraw.Draw(img)
+    font = _load_font(max(10, int(dpi * 0.16)))
+    margin: int = int(dpi * 0.8)
+    line_height: int = int(dpi * 0.3)
+    y: int = margin
+    for line in lines:
+        if y > height - margin:
+            break
+        draw.text((margin, y), line, fill=0, font=font)
+        y += line_height
+    return apply_noise(img, noise, rnd)
+
+
+def image_to_png_bytes(img: Image.Image) -> bytes:
+    buff = BytesIO()
+    img.save(buff, format='PNG')
+    return buff.getvalue()
+
+
+def create_sheet(documents: list[SyntheticDocument], *, extra_rows: int = 0, seed: int = 0) -> pd.DataFrame:
+    """
+    Planilha com uma linha por documento (CHAVE, NOVO_NOME, SETOR) mais extra_rows
+    linhas que não aparecem em nenhum documento, embaralhadas com a mesma semente.
+    """
+    rnd = random.Random(f'{seed}-sheet')
+    data: dict[str, list[str]] = {COL_KEY: [], COL_NEW_NAME: [], COL_EXTRA: []}
+    for doc in documents:
+        data[COL_KEY].append(doc.key)
+        data[COL_NEW_NAME].append(doc.new_name)
+        data[COL_EXTRA].append(rnd.choice(_SETORES))
+    for num in range(extra_rows):
+        data[COL_KEY].append(f'X{num:08d}')
+        data[COL_NEW_NAME].append(f'SEM DOCUMENTO {num}')
+        data[COL_EXTRA].append(rnd.choice(_SETORES))
+    df = pd.DataFrame(data)
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+class SyntheticDocumentGenerator(object):
+    """
+    Gera documentos sintéticos em output_dir. Com text_layer=False os PDFs contêm
+    apenas a imagem das páginas (como um documento digitalizado, exige OCR), com
+    text_layer=True o texto é gravado na camada de texto do PDF.
+    """
+
+    def __init__(
+                self,
+                output_dir: sp.Directory, *,
+                seed: int = 0,
+                pages: int = 1,
+                noise: float = 0.0,
+                dpi: int = 150,
+                text_layer: bool = False,
+                lines_per_page: int = 30,
+            ):
+        self.output_dir: sp.Directory = output_dir
+        self.output_dir.mkdir()
+        self.seed: int = seed
+        self.pages: int = max(1, pages)
+        self.noise: float = noise
+        self.dpi: int = dpi
+        self.text_layer: bool = text_layer
+        self.lines_per_page: int = lines_per_page
+        self.__count: int = 0
+
+    def create_pages(self, kind: str, rnd: random.Random, num: int) -> tuple[list[list[str]], str, str]:
+        """
+        Retorna (linhas de cada página, chave, novo nome). As palavras-chave ficam na
+        primeira página, a data da ficha EPI fica no rodapé da última página.
+        """
+        first, key, new_name = create_document_lines(kind, rnd, num)
+        pages: list[list[str]] = [first + create_filler_lines(rnd, self.lines_per_page - len(first))]
+        for _ in range(self.pages - 1):
+            pages.append(create_filler_lines(rnd, self.lines_per_page))
+        if kind == KIND_EPI:
+            pages[-1][-1] = _create_date_line(rnd)
+        return pages, key, new_name
+
+    def __write_pdf(self, pages: list[list[str]], rnd: random.Random, file: sp.File) -> None:
+        doc = fitz.open()
+        try:
+            for lines in pages:
+                page = doc.new_page(width=_A4_POINTS[0], height=_A4_POINTS[1])
+                if self.text_layer:
+                    y: float = 60
+                    for line in lines:
+                        page.insert_text((50, y), line, fontsize=11)
+                        y += 22
+                else:
+                    img = render_page_image(lines, dpi=self.dpi, noise=self.noise, rnd=rnd)
+                    page.insert_image(page.rect, stream=image_to_png_bytes(img))
+            doc.save(file.absolute(), deflate=True)
+        finally:
+            doc.close()
+
+    def create_document(self, kind: str, *, fmt: str = 'pdf') -> SyntheticDocument:
+        """
+        Cria um documento do tipo kind no formato fmt ('pdf' ou 'png', o PNG contém
+        apenas a primeira página).
+        """
+        num: int = self.__count
+        self.__count += 1
+        rnd = random.Random(f'{self.seed}-{kind}-{num}')
+        pages, key, new_name = self.create_pages(kind, rnd, num)
+        file: sp.File = self.output_dir.join_file(f'{kind}_{num:05d}.{fmt}')
+        if fmt == 'pdf':
+            self.__write_pdf(pages, rnd, file)
+        elif fmt == 'png':
+            pages = pages[:1]
+            if kind == KIND_EPI:
+                pages[0][-1] = _create_date_line(rnd)
+            render_page_image(pages[0], dpi=self.dpi, noise=self.noise, rnd=rnd).save(file.absolute())
+        else:
+            raise ValueError(f'Formato inválido: {fmt}, use pdf ou png')
+        return SyntheticDocument(
+            file, kind=kind, key=key, new_name=new_name, pages=len(pages), lines=[l for p in pages for l in p]
+        )
+
+    def create_batch(self, kind: str, size: int, *, fmt: str = 'pdf') -> list[SyntheticDocument]:
+        return [self.create_document(kind, fmt=fmt) for _ in range(size)]
+
+    def create_sheet(self, documents: list[SyntheticDocument], *, extra_rows: int = 0) -> pd.DataFrame:
+        return create_sheet(documents, extra_rows=extra_rows, seed=self.seed)
@@ -7,7 +7,7 @@ from .type_utils import (
     DictKeyWordFiles, DiskFile, DictFileInfo, DictOriginInfo, DictOutputInfo
 )
 from .read import (
-    read_image, read_document, create_tb_from_names
+    read_image, read_document, create_tb_from_names, OcrProfile, OcrRegion
 )
 from .find import (
     SearchableText, FindNameInnerText, FindNameInnerData, NameFinder,
@@ -17,6 +17,7 @@ from .document import (
     ExtractNameInnerData, ExtractNameInnerText, CreateFileNames
 )
 from .cartas import CartaCalculo, GenericDocument
+from .ocr_pool import TesseractEnginePool, get_engine_pool
 
 
 
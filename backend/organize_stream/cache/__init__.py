@@ -0,0 +1,3 @@
+from .ocr_cache import OcrCache, ensure_private_dir, get_default_cache_dir, get_default_ocr_cache
+
+__all__ = ['OcrCache', 'ensure_private_dir', 'get_default_cache_dir', 'get_default_ocr_cache']
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from collections import OrderedDict
+import json
+import os
+import stat
+import tempfile
+import threading
+from sheet_stream import TableDocuments, ListColumnBody, ListString
+from sheet_stream.type_utils import get_hash_from_bytes
+from organize_stream.utils import sp
+
+# Variáveis de ambiente para configurar o cache padrão.
+ENV_OCR_CACHE: str = 'ORGANIZE_OCR_CACHE'
+ENV_OCR_CACHE_DIR: str = 'ORGANIZE_OCR_CACHE_DIR'
+ENV_OCR_CACHE_MAX_MB: str = 'ORGANIZE_OCR_CACHE_MAX_MB'
+
+
+class OcrCache(object):
+    """
+    Cache em disco das tabelas geradas pelo OCR.
+
+    Cada entrada é um arquivo .json nomeado pela hash do conteúdo (bytes do arquivo
+    ou da página) somada às configurações usadas no OCR (DPI, idioma, ...). Quando o
+    tamanho total passa de max_bytes as entradas usadas há mais tempo são removidas.
+    """
+
+    def __init__(self, cache_dir: sp.Directory, *, max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir: sp.Directory = cache_dir
+        self.cache_dir.mkdir()
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.__lock = threading.Lock()
+        # Chave -> tamanho em bytes, na ordem de uso (a primeira é a menos usada).
+        self.__entries: OrderedDict[str, int] = OrderedDict()
+        self.__total_bytes: int = 0
+        self.__load_entries()
+
+    def __load_entries(self) -> None:
+        files: list[tuple[float, str, int]] = []
+        for name in os.listdir(self.cache_dir.absolute()):
+            if not name.endswith('.json'):
+                continue
+            try:
+                st = os.stat(os.path.join(self.cache_dir.absolute(), name))
+            except OSError:
+                continue
+            files.append((st.st_mtime, name[:-5], st.st_size))
+        files.sort()
+        for _, key, size in files:
+            self.__entries[key] = size
+            self.__total_bytes += size
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.cache_dir.absolute(), f'{key}.json')
+
+    @staticmethod
+    def create_key(content: bytes, **settings: object) -> str:
+        """
+        Gera a chave do cache a partir dos bytes do arquivo/página e das configurações do OCR.
+        """
+        _settings: str = ';'.join(f'{k}={settings[k]}' for k in sorted(settings.keys()))
+        return f'{get_hash_from_bytes(content)}-{get_hash_from_bytes(_settings.encode("utf-8"))[:12]}'
+
+    @property
+    def length(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self.__total_bytes
+
+    def get(self, key: str) -> TableDocuments | None:
+        path = self.__path(key)
+        try:
+            with open(path, 'rt', encoding='utf-8') as f:
+                data: dict[str, list[str]] = json.load(f)
+            tb = TableDocuments([ListColumnBody(col, ListString(values)) for col, values in data.items()])
+        except FileNotFoundError:
+            with self.__lock:
+                self.misses += 1
+                self.__remove_entry(key)
+            return None
+        except Exception as err:
+            print(f'DEBUG: {__class__.__name__} entrada inválida {key}: {err}')
+            with self.__lock:
+                self.misses += 1
+                self.__remove_entry(key)
+            self.__remove_file(path)
+            return None
+
+        with self.__lock:
+            self.hits += 1
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+        try:
+            # Atualiza a data de modificação, usada na ordem LRU entre processos.
+            os.utime(path)
+        except OSError:
+            pass
+        return tb
+
+    def set(self, key: str, tb: TableDocuments) -> None:
+        if tb.length == 0:
+            return
+        data: dict[str, list[str]] = {str(col): list(tb[col]) for col in tb.keys()}
+        path = self.__path(key)
+        try:
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir.absolute())
+            with os.fdopen(fd, 'wt', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except Exception as err:
+            print(f'DEBUG: {__class__.__name__} falha ao gravar {key}: {err}')
+            return
+
+        with self.__lock:
+            self.__remove_entry(key)
+            self.__entries[key] = size
+            self.__total_bytes += size
+            expired: list[str] = self.__pop_expired()
+        for old_key in expired:
+            self.__remove_file(self.__path(old_key))
+
+    def __remove_entry(self, key: str) -> None:
+        size = self.__entries.pop(key, None)
+        if size is not None:
+            self.__total_bytes -= size
+
+    def __pop_expired(self) -> list[str]:
+        expired: list[str] = []
+        while (self.__total_bytes > self.max_bytes) and (len(self.__entries) > 1):
+            key, size = self.__entries.popitem(last=False)
+            self.__total_bytes -= size
+            self.evictions += 1
+            expired.append(key)
+        return expired
+
+    @staticmethod
+    def __remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        with self.__lock:
+            keys = list(self.__entries.keys())
+            self.__entries.clear()
+            self.__total_bytes = 0
+        for key in keys:
+            self.__remove_file(self.__path(key))
+
+    def stats(self) -> dict[str, int]:
+        with self.__lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self.__entries),
+                'bytes': self.__total_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+_DEFAULT_CACHE: OcrCache | None = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_default_cache_dir() -> str:
+    """
+    Diretório padrão do cache, privado do usuário atual: $XDG_CACHE_HOME/organize_stream/ocr_cache
+    (padrão ~/.cache/organize_stream/ocr_cache).
+    """
+    cache_home: str = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'organize_stream', 'ocr_cache')
+
+
+def ensure_private_dir(path: str) -> bool:
+    """
+    Cria o diretório com modo 0700 e confirma que ele pode guardar o cache: não é um
+    link, pertence ao usuário atual e outros usuários não podem gravar nele (as
+    entradas são carregadas sem validação, uma entrada plantada mudaria o resultado do OCR).
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if os.path.islink(path):
+        print(f'DEBUG: o diretório do cache de OCR é um link: {path}')
+        return False
+    if not hasattr(os, 'getuid'):
+        # Windows: o diretório padrão já fica no perfil do usuário.
+        return True
+    st = os.stat(path)
+    if st.st_uid != os.getuid():
+        print(f'DEBUG: o diretório do cache de OCR pertence a outro usuário: {path}')
+        return False
+    if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        print(f'DEBUG: outros usuários podem gravar no diretório do cache de OCR: {path}')
+        return False
+    if st.st_mode & 0o077:
+        os.chmod(path, 0o700)
+    return True
+
+
+def get_default_ocr_cache() -> OcrCache | None:
+    """
+    Retorna o cache compartilhado pelos extratores, ou None se ele foi desativado
+    com ORGANIZE_OCR_CACHE=0. O diretório (padrão: get_default_cache_dir()) e o tamanho
+    máximo podem ser definidos em ORGANIZE_OCR_CACHE_DIR e ORGANIZE_OCR_CACHE_MAX_MB,
+    o cache também é desativado se o diretório não for privado (ensure_private_dir).
+    """
+    global _DEFAULT_CACHE
+    if os.environ.get(ENV_OCR_CACHE, '1').lower() in ('0', 'false', 'no'):
+        return None
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            cache_dir = os.environ.get(ENV_OCR_CACHE_DIR) or get_default_cache_dir()
+            max_mb = int(os.environ.get(ENV_OCR_CACHE_MAX_MB, '512'))
+            try:
+                if not ensure_private_dir(cache_dir):
+                    print(f'DEBUG: cache de OCR desativado, diretório inseguro: {cache_dir}')
+                    return None
+                _DEFAULT_CACHE = OcrCache(sp.Directory(cache_dir), max_bytes=max_mb * 1024 * 1024)
+            except Exception as err:
+                print(f'DEBUG: cache de OCR desativado: {err}')
+                return None
+        return _DEFAULT_CACHE
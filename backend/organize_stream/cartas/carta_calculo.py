@@ -3,11 +3,11 @@ import soup_files as sp
 from organize_stream import fmt_str_file
 from organize_stream.type_utils import DigitalizedDocument, FilterText
 from organize_stream.utils import remove_bad_chars
+from organize_stream.read import OcrProfile, OcrRegion
 from sheet_stream import (
     ArrayString, ListColumnBody, TableDocuments,
     BAD_STRING_CHARS, ListString, ColumnsTable, ConvertStringDate, LibDate
 )
-import pandas as pd
 
 
 class CartaCalculo(DigitalizedDocument):
@@ -20,6 +20,15 @@ class CartaCalculo(DigitalizedDocument):
             case=False,
         )
 
+    # Regiões com UC/TOI/LIVRO/LOCALIDADE/MEDIDOR, se não gerarem um nome a página inteira passa pelo OCR.
+    ocr_profile = OcrProfile(
+        'carta_calculo',
+        [
+            OcrRegion('cabecalho', (0.0, 0.0, 1.0, 0.35)),
+            OcrRegion('dados_uc', (0.0, 0.35, 1.0, 0.6)),
+        ]
+    )
+
     def __init__(self, tb: TableDocuments, *, filters: FilterText):
         super().__init__(tb, filters=filters)
 
@@ -119,6 +128,26 @@ class CartaCalculo(DigitalizedDocument):
             final_line = f'{final_line}-{cidade}'
         return remove_bad_chars(final_line)
 
+    def is_complete(self) -> bool:
+        """
+        True quando a tabela contém UC, TOI ou TOL, medidor e cidade. A carta possui
+        TOI ou TOL, então o TOL não é exigido quando o TOI já foi encontrado: um TOL
+        (ou uma localidade com prioridade maior no dicionário) em uma página posterior
+        não entra no nome com early_exit. Os demais campos usam a primeira linha que
+        os contém e não mudam com as páginas seguintes.
+        """
+        lines = self.get_document_lines
+        words = ArrayString([])
+        for txt in ('UC', 'TOI', 'TOL'):
+            line = lines.find_text(txt)
+            if line is not None:
+                words.extend(line.split(' '))
+        if words.get_next_string('UC') is None:
+            return False
+        if (words.get_next_string('TOI') is None) and (words.get_next_string('TOL') is None):
+            return False
+        return (self.medidor is not None) and (self.cidade is not None)
+
     def get_lines_keys(self) -> ArrayString:
         lines = self.get_document_lines
         content: ArrayString = ArrayString([])
@@ -143,48 +172,24 @@ class CartaCalculo(DigitalizedDocument):
 
 class GenericDocument(DigitalizedDocument):
 
+    # Sem layout fixo, sempre aplica OCR na página inteira.
+    ocr_profile: OcrProfile | None = None
+
     def __init__(self, tb: TableDocuments, *, filters: FilterText):
         super().__init__(tb, filters=filters)
 
     def _get_value_with_str(self, tb: TableDocuments) -> str | None:
         list_new_names: ListString = ListString([])
-        tb_txt_file: pd.DataFrame = pd.DataFrame.from_dict(tb)
-        df = tb_txt_file[[ColumnsTable.TEXT, ColumnsTable.FILE_PATH]].astype('str')
-
-        # Divide padrões múltiplos separados por "|"
-        patterns = [p.strip() for p in self.filters.find_txt.split('|') if p.strip()]
-        if not patterns:
+        matcher = self.filters.get_matcher()
+        if matcher is None:
             print(f'{__class__.__name__}: Nenhum padrão de busca válido informado.')
             return None
 
-        # Define padrão regex dependendo de "iqual"
-        if self.filters.iqual:
-            # AQUI estava: '^(' + '|'.join(patterns) + ')$'
-            regex_pattern = '^(?:' + '|'.join(patterns) + ')$'  # Mude para (?:...)
-        else:
-            # AQUI estava: '(' + '|'.join(patterns) + ')'
-            regex_pattern = '(?:' + '|'.join(patterns) + ')'  # Mude para (?:...)
-
-        # Filtra linhas no DataFrame
-        mask: pd.Series = df[ColumnsTable.TEXT].str.contains(
-            regex_pattern,
-            case=self.filters.case,
-            regex=True,
-            na=False
-        )
-        matched_df = df[mask]
-        total_matches = len(matched_df)
-
-        if total_matches == 0:
-            return None
-
         # Para cada linha encontrada, gera nome limpo e adiciona à lista de movimentação
-        for _, row in matched_df.iterrows():
-            current_line: str = row[ColumnsTable.TEXT]
-            if self.uniq_key_words.length > 0:
-                for i in self.uniq_key_words:
-                    if not i.upper() in current_line.upper():
-                        continue
+        for line in tb.get_column(ColumnsTable.TEXT):
+            current_line: str = f'{line}'
+            if matcher.search(current_line) is None:
+                continue
             # Usa o texto da linha como base do novo nome
             current_output_name: str = fmt_str_file(current_line.strip())
             if len(current_output_name) < 4:
@@ -214,6 +219,15 @@ class GenericDocument(DigitalizedDocument):
 
 class FichaEpi(GenericDocument):
 
+    # Regiões com MATR/NOME e a linha da data da ficha.
+    ocr_profile = OcrProfile(
+        'ficha_epi',
+        [
+            OcrRegion('identificacao', (0.0, 0.0, 1.0, 0.3)),
+            OcrRegion('data', (0.0, 0.75, 1.0, 1.0)),
+        ]
+    )
+
     def __init__(self, tb: TableDocuments, *, filters: FilterText):
         super().__init__(tb, filters=filters)
         self.dias = [
@@ -255,6 +269,10 @@ class FichaEpi(GenericDocument):
     def get_nome(self) -> str | None:
         return self.tb.get_column(ColumnsTable.TEXT).get_next_string('MATR')
 
+    def is_complete(self) -> bool:
+        # Nome (linha após MATR) e data da ficha.
+        return (self.get_nome() is not None) and (self.get_date_doc() is not None)
+
     def get_date_doc(self) -> str | None:
         lines = self.get_document_lines
         _date_line: str = None
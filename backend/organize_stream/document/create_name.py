@@ -14,10 +14,11 @@ from organize_stream.type_utils import (
 )
 from organize_stream.find import FindNameInnerText, FindNameInnerData
 from organize_stream.utils import (sp, cs)
-from organize_stream.read import create_tb_from_names
+from organize_stream.read import create_tb_from_names, OcrProfile
 from organize_stream.text_extract import DocumentTextExtract
 from organize_stream.cartas import CartaCalculo, GenericDocument, FichaEpi
 from organize_stream.erros import *
+from organize_stream.metrics import NAMING_SECONDS, ZIP_WRITE_SECONDS
 import shutil
 import zipfile
 import pandas as pd
@@ -161,6 +162,8 @@ class CreateFileNames(object):
                     [DictKeyWordFiles, sp.Directory], tuple[DictOriginInfo, DictOutputInfo | None, bool]
                 ] = None,
                 func_move_file: Callable[[DictKeyWordFiles], bool] = None,
+                early_exit: bool = True,
+                use_ocr_profile: bool = False,
             ):
         super().__init__()
         if func_save_file is None:
@@ -177,6 +180,13 @@ class CreateFileNames(object):
         self.extractor: DocumentTextExtract = extractor
         self.extractor.apply_threshold = False
         self.filters = filters
+        # Interrompe o OCR dos PDFs quando as páginas lidas já contêm todos os campos do nome
+        # (DigitalizedDocument.is_complete()), use False para forçar o OCR de todas as páginas.
+        self.early_exit: bool = early_exit
+        # Opcional: documentos com layout fixo (CartaCalculo, FichaEpi) aplicam OCR primeiro apenas
+        # nas regiões do perfil, a página inteira é lida se as regiões não contiverem todos os campos do nome.
+        self.use_ocr_profile: bool = use_ocr_profile
+        self.__profile_extractor: DocumentTextExtract | None = None
         # Dicionário para gravar o status de exportação dos arquivos,
         # sendo que as chaves apontam para o arquivo de origem DynamicFile() e
         # os valores apontam para uma tupla, (DestFilePath, bool).
@@ -188,7 +198,14 @@ class CreateFileNames(object):
         }
         self._list_key_filenames: ListItems[DictKeyWordFiles] = ListItems()
         self._list_key_filenames.set_list_type(DictKeyWordFiles)
-        self.__temp_dir: sp.Directory = sp.Directory(tempfile.mkdtemp())
+        # Criado apenas quando usado, evita um diretório vazio em /tmp para cada objeto.
+        self.__temp_dir: sp.Directory | None = None
+
+    @property
+    def temp_dir(self) -> sp.Directory:
+        if self.__temp_dir is None:
+            self.__temp_dir = sp.Directory(tempfile.mkdtemp())
+        return self.__temp_dir
 
     def clear(self):
         self._dict_exported_info.clear()
@@ -200,7 +217,21 @@ class CreateFileNames(object):
     def get_list_key_files(self) -> ListItems[DictKeyWordFiles]:
         return self._list_key_filenames
 
-    def create_output_info(self, tb: TableDocuments) -> DictOutputInfo | None:
+    def create_digitalized(self, tb: TableDocuments) -> DigitalizedDocument:
+        """
+        Retorna o documento digitalizado (lib_digitalized) da tabela.
+        """
+        if self.lib_digitalized == EnumDigitalDoc.GENERIC:
+            return GenericDocument(tb, filters=self.filters)
+        elif self.lib_digitalized == EnumDigitalDoc.CARTA_CALCULO:
+            return CartaCalculo.create(tb)
+        elif self.lib_digitalized == EnumDigitalDoc.EPI:
+            return FichaEpi.create(tb)
+        raise InvalidTDigitalizedDocument(f'{__class__.__name__} Documento inválido: {self.lib_digitalized}')
+
+    # Chamado uma vez por arquivo, com a tabela final (as tabelas parciais usam is_complete()).
+    @NAMING_SECONDS.time(stage='create_output_info')
+    def create_output_info(self, tb: TableDocuments, *, verbose: bool = True) -> DictOutputInfo | None:
         """
         Recebe uma tabela e retorna um dicionário de chave/valor com os dados
         do arquivo de origem e destino, incluindo extensão de arquivo.
@@ -209,31 +240,28 @@ class CreateFileNames(object):
         enquanto as informações do arquivo de destino são do tipo: DiskOutputInfo
 
         Tais valores podem ser nulos ou vazios se TableDocuments.length for igual 0.
+
+        :param verbose: se False não exibe as mensagens de falha (usado nas tabelas parciais).
         """
         if tb.length == 0:
             # raise TableFileEmptyError('A tabela de arquivos não pode estar vazia.')
             return None
 
-        _doc: DigitalizedDocument
-        if self.lib_digitalized == EnumDigitalDoc.GENERIC:
-            _doc = GenericDocument(tb, filters=self.filters)
-        elif self.lib_digitalized == EnumDigitalDoc.CARTA_CALCULO:
-            _doc = CartaCalculo.create(tb)
-        elif self.lib_digitalized == EnumDigitalDoc.EPI:
-            _doc = FichaEpi.create(tb)
-        else:
-            raise InvalidTDigitalizedDocument(f'{__class__.__name__} Documento inválido: {self.lib_digitalized}')
-
+        _doc: DigitalizedDocument = self.create_digitalized(tb)
         output_info = DictOutputInfo()
         # Proteger o objeto gerado contra valores de str padrão.
         filename_str = _doc.get_output_name_str()
         src_extension = _doc.extension_file
         if (filename_str is None) or (filename_str == 'nan') or (filename_str == ''):
+            if not verbose:
+                return None
             print(
                 f'{__class__.__name__} Falha, o documento digitalizado não gerou um nome de saída =>> {tb.get_row(0)}'
                 )
             return None
         if (src_extension is None) or (src_extension == '') and (src_extension == 'nan'):
+            if not verbose:
+                return None
             print(
                 f'''
                     {__class__.__name__} Falha, a tabela não possui extensão de arquivo na coluna:
@@ -293,17 +321,65 @@ class CreateFileNames(object):
         self._add_log_status(key_word_file, _status)
         return key_word_file.get_origin_file(), key_word_file.get_output_file(), _status
 
+    def get_ocr_profile(self) -> OcrProfile | None:
+        if not self.use_ocr_profile:
+            return None
+        if self.lib_digitalized == EnumDigitalDoc.CARTA_CALCULO:
+            return CartaCalculo.ocr_profile
+        elif self.lib_digitalized == EnumDigitalDoc.EPI:
+            return FichaEpi.ocr_profile
+        return None
+
+    def _get_profile_extractor(self, profile: OcrProfile) -> DocumentTextExtract:
+        """
+        Extrator com as mesmas configurações de self.extractor, mas aplicando OCR
+        apenas nas regiões do perfil.
+        """
+        if self.__profile_extractor is None:
+            self.__profile_extractor = DocumentTextExtract(
+                self.extractor.recognize_image,
+                dpi=self.extractor.dpi,
+                apply_threshold=False,
+                notify_observers=False,
+                func_read_image=profile,
+                max_workers=self.extractor.max_workers,
+                ocr_cache=self.extractor.ocr_cache,
+                use_text_layer=self.extractor.use_text_layer,
+                dpi_steps=self.extractor.dpi_steps,
+            )
+        self.__profile_extractor.pbar = self.extractor.pbar
+        self.__profile_extractor.stats = self.extractor.stats
+        return self.__profile_extractor
+
+    @staticmethod
+    def _set_filetype(tb: TableDocuments, extension: str | None) -> None:
+        if (extension is None) or (tb.length == 0):
+            return
+        _new = [extension] * tb.get_column(ColumnsTable.TEXT).length
+        tb.set_column(ListColumnBody(ColumnsTable.FILETYPE.value, _new))
+
+    def read_image_table(
+                self, image: cs.ImageObject, extension: str | None
+            ) -> tuple[TableDocuments, DictOutputInfo | None]:
+        """
+        Extrai a tabela da imagem e gera as informações do arquivo destino.
+        """
+        profile: OcrProfile | None = self.get_ocr_profile()
+        if profile is not None:
+            tb = self._get_profile_extractor(profile).read_image(image)
+            self._set_filetype(tb, extension)
+            if self._is_complete(tb):
+                return tb, self.create_output_info(tb)
+        tb = self.extractor.read_image(image)
+        self._set_filetype(tb, extension)
+        return tb, self.create_output_info(tb)
+
     def read_image(self, file: DiskFile | cs.ImageObject) -> DictKeyWordFiles:
         """
             Gera um objeto DictKeyWordFiles() que pode ser exportado/salvo no disco posteriormente.
         """
         image_info: tuple[DictOriginInfo, cs.ImageObject] = _get_info_from_img(file)
-        tb = self.extractor.read_image(image_info[1])
-        if tb.get_column(ColumnsTable.FILETYPE).length == 0:
-            _new = [image_info[0].get_extension()] * tb.get_column(ColumnsTable.TEXT).length
-            tb.set_column(ListColumnBody(ColumnsTable.FILETYPE.value, _new))
-            
-        dest_info: DictOutputInfo | None = self.create_output_info(tb)
+        dest_info: DictOutputInfo | None = self.read_image_table(image_info[1], image_info[0].get_extension())[1]
         __kw = DictKeyWordFiles()
         __kw.set_origin_file(image_info[0])
         if dest_info is not None:
@@ -312,6 +388,48 @@ class CreateFileNames(object):
             __kw.set_output_file(DictOutputInfo())
         return __kw
 
+    def _is_complete(self, tb: TableDocuments) -> bool:
+        if tb.length == 0:
+            return False
+        return self.create_digitalized(tb).is_complete()
+
+    def _read_document_table(
+                self, extractor: DocumentTextExtract, document: cs.DocumentPdf, extension: str | None
+            ) -> TableDocuments:
+        if (not self.early_exit) or (self.lib_digitalized == EnumDigitalDoc.GENERIC):
+            # GenericDocument usa todas as linhas encontradas no nome, o documento é lido por inteiro.
+            tb = extractor.read_document(document)
+            self._set_filetype(tb, extension)
+            return tb
+
+        def _is_complete(_tb: TableDocuments) -> bool:
+            self._set_filetype(_tb, extension)
+            return self._is_complete(_tb)
+
+        tb = extractor.read_document_until(document, _is_complete)
+        self._set_filetype(tb, extension)
+        return tb
+
+    def read_document_table(
+                self, document: cs.DocumentPdf, extension: str | None
+            ) -> tuple[TableDocuments, DictOutputInfo | None]:
+        """
+        Extrai a tabela do documento e gera as informações do arquivo destino.
+
+        Com early_exit=True as páginas são lidas em ordem e a leitura termina na
+        primeira tabela parcial com todos os campos do nome (is_complete()), as
+        páginas restantes não passam pelo OCR. Com use_ocr_profile=True as regiões
+        do perfil são lidas antes da página inteira, que só é ignorada se as regiões
+        contiverem todos os campos do nome.
+        """
+        profile: OcrProfile | None = self.get_ocr_profile()
+        if profile is not None:
+            tb = self._read_document_table(self._get_profile_extractor(profile), document, extension)
+            if self._is_complete(tb):
+                return tb, self.create_output_info(tb)
+        tb = self._read_document_table(self.extractor, document, extension)
+        return tb, self.create_output_info(tb)
+
     def read_document(self, file: DiskFile | cs.DocumentPdf) -> DictKeyWordFiles:
         """
             Gera um KeyWordsFileName que pode ser exportado/salvo no disco posteriormente.
@@ -319,12 +437,7 @@ class CreateFileNames(object):
         pdf_info: tuple[DictOriginInfo, cs.DocumentPdf] = _get_info_from_pdf(file)
         __kw = DictKeyWordFiles()
         __kw.set_origin_file(pdf_info[0])
-        tb = self.extractor.read_document(pdf_info[1])
-        if tb.get_column(ColumnsTable.FILETYPE).length == 0:
-            _new = [pdf_info[0].get_extension()] * tb.get_column(ColumnsTable.TEXT).length
-            tb.set_column(ListColumnBody(ColumnsTable.FILETYPE.value, _new))
-        
-        dest_info = self.create_output_info(tb)
+        dest_info: DictOutputInfo | None = self.read_document_table(pdf_info[1], pdf_info[0].get_extension())[1]
         if dest_info is not None:
             __kw.set_output_file(dest_info)
         else:
@@ -360,18 +473,27 @@ class CreateFileNames(object):
     def add_disk_file(self, disk_file: DictFileInfo):
         if disk_file.get_extension() is None:
             raise DiskFileInvalidError(f'Use: Adicione uma extensão de arquivo em DiskFileInfo')
-        if disk_file.get_file_bytes() is None:
-            raise DiskFileInvalidError(f'Use: Adicione bytes ao DiskFileInfo')
+        # Os arquivos gravados no disco (uploads) são lidos pelo caminho, sem carregar os bytes.
+        src_file: sp.File | None = disk_file.get_abspath()
+        if (disk_file.get_file_bytes() is None) and ((src_file is None) or (not src_file.exists())):
+            raise DiskFileInvalidError(f'Use: Adicione bytes ou o caminho do arquivo ao DiskFileInfo')
         
         key_info = DictKeyWordFiles()
         key_info.set_origin_file(disk_file)
         tb: TableDocuments = None
+        dict_output: DictOutputInfo | None = None
         if disk_file.get_extension() in ['.png', '.jpg', '.jpeg', '.svg']:
-            image_obj = cs.ImageObject.create_from_bytes(disk_file.get_file_bytes())
-            tb = self.extractor.read_image(image_obj)
+            if disk_file.get_file_bytes() is not None:
+                image_obj = cs.ImageObject.create_from_bytes(disk_file.get_file_bytes())
+            else:
+                image_obj = cs.ImageObject.create_from_file(src_file)
+            tb, dict_output = self.read_image_table(image_obj, disk_file.get_extension())
         elif disk_file.get_extension() in ['.pdf']:
-            doc_pdf = cs.DocumentPdf.create_from_bytes(BytesIO(disk_file.get_file_bytes()))
-            tb = self.extractor.read_document(doc_pdf)
+            if disk_file.get_file_bytes() is not None:
+                doc_pdf = cs.DocumentPdf.create_from_bytes(BytesIO(disk_file.get_file_bytes()))
+            else:
+                doc_pdf = cs.DocumentPdf.create_from_file(src_file)
+            tb, dict_output = self.read_document_table(doc_pdf, disk_file.get_extension())
         else:
             print(f'{__class__.__name__} DEBUG: Falha ao tentar identificar o documento =>> {disk_file.get_name()}')
             return
@@ -385,10 +507,10 @@ class CreateFileNames(object):
         
         # Antes de gerar o dicionário com as informações de destino, precisamos adicionar
         # A extensão de arquivo a tabela gerada.
-        _new = [disk_file.get_extension()] * tb.get_column(ColumnsTable.TEXT.value).length
-        tb.set_column(ListColumnBody(ColumnsTable.FILETYPE, _new))
-        
-        dict_output: DictOutputInfo | None = self.create_output_info(tb)
+        if dict_output is None:
+            _new = [disk_file.get_extension()] * tb.get_column(ColumnsTable.TEXT.value).length
+            tb.set_column(ListColumnBody(ColumnsTable.FILETYPE, _new))
+            dict_output = self.create_output_info(tb)
         if dict_output is None:
             print(f'{__class__.__name__} Falha ao tentar gerar o nome do arquivo de destino => {disk_file.get_name()}')
             return
@@ -422,6 +544,40 @@ class CreateFileNames(object):
         __df = pd.DataFrame(__data)
         return __df.astype('str')
 
+    def _write_zip(self, zipf: zipfile.ZipFile) -> None:
+        """
+        Adiciona ao zip os arquivos processados com o novo nome. Arquivos que estão
+        no disco são copiados pelo caminho, sem carregar os bytes na memória.
+        """
+        key_file: DictKeyWordFiles
+        for key_file in self._list_key_filenames:
+            final_bytes: bytes | None = None
+            src_file: sp.File | None = None
+            if key_file.get_output_file().get_file_bytes() is not None:
+                final_bytes = key_file.get_output_file().get_file_bytes()
+            elif key_file.get_origin_file().get_file_bytes() is not None:
+                final_bytes = key_file.get_origin_file().get_file_bytes()
+            elif (key_file.get_origin_file().get_abspath() is not None) and \
+                    key_file.get_origin_file().get_abspath().exists():
+                src_file = key_file.get_origin_file().get_abspath()
+            if (final_bytes is None) and (src_file is None):
+                self._add_log_status(key_file, False)
+                print(f'[PULANDO] ... bytes nulos {key_file.get_origin_file().get_filename_with_extension()}')
+                continue
+            if key_file.get_output_file().get_filename_with_extension() is None:
+                self._add_log_status(key_file, False)
+                print(
+                    f'Erro: nome destino é nulo {key_file.get_origin_file().get_filename_with_extension()}'
+                )
+                continue
+
+            dest_file_name: str = key_file.get_output_file().get_filename_with_extension()
+            if final_bytes is not None:
+                zipf.writestr(dest_file_name, final_bytes)
+            else:
+                zipf.write(src_file.absolute(), dest_file_name)
+            self._add_log_status(key_file, True)
+
     def export_new_files_to_zip(self) -> BytesIO | None:
         """
         Renomeia os arquivos e retorna BytesIO() com o conteúdo final zipado.
@@ -432,29 +588,9 @@ class CreateFileNames(object):
         print(f'Exportando: {self._list_key_filenames.length} arquivos')
 
         zip_buffer = BytesIO()
-        key_file: DictKeyWordFiles
         try:
             with zipfile.ZipFile(zip_buffer, "w") as zipf:
-                for key_file in self._list_key_filenames:
-                    final_bytes = None
-                    if key_file.get_output_file().get_file_bytes() is not None:
-                        final_bytes = key_file.get_output_file().get_file_bytes()
-                    elif key_file.get_origin_file().get_file_bytes() is not None:
-                        final_bytes = key_file.get_origin_file().get_file_bytes()
-                    if final_bytes is None:
-                        self._add_log_status(key_file, False)
-                        print(f'[PULANDO] ... bytes nulos {key_file.get_origin_file().get_filename_with_extension()}')
-                        continue
-                    if key_file.get_output_file().get_filename_with_extension() is None:
-                        self._add_log_status(key_file, False)
-                        print(
-                            f'Erro: nome destino é nulo {key_file.get_origin_file().get_filename_with_extension()}'
-                        )
-                        continue
-
-                    dest_file_name: str = key_file.get_output_file().get_filename_with_extension()
-                    zipf.writestr(dest_file_name, final_bytes)
-                    self._add_log_status(key_file, True)
+                self._write_zip(zipf)
         except Exception as err:
             print(f'{__class__.__name__}: {err}')
             return None
@@ -462,6 +598,23 @@ class CreateFileNames(object):
             zip_buffer.seek(0)
             return zip_buffer
 
+    def export_new_files_to_zip_file(self, output_zip: sp.File) -> sp.File | None:
+        """
+        Renomeia os arquivos e grava o zip diretamente no disco (output_zip).
+        """
+        if self._list_key_filenames.length == 0:
+            print(f'DEBUG: {__class__.__name__} nenhuma tabela disponível para exportar!')
+            return None
+        print(f'Exportando: {self._list_key_filenames.length} arquivos')
+
+        try:
+            with ZIP_WRITE_SECONDS.time(job='organize_documents'), zipfile.ZipFile(output_zip.absolute(), "w") as zipf:
+                self._write_zip(zipf)
+        except Exception as err:
+            print(f'{__class__.__name__}: {err}')
+            return None
+        return output_zip
+
 
 class ExtractName(ObserverTableExtraction):
 
@@ -26,3 +26,15 @@ class DiskFileInvalidError(Exception):
 
     def __init__(self, *args):
         super().__init__(*args)
+
+
+class QueueFullError(Exception):
+
+    def __init__(self, *args):
+        super().__init__(*args)
+
+
+class UploadTooLargeError(Exception):
+
+    def __init__(self, *args):
+        super().__init__(*args)
@@ -5,6 +5,7 @@ import os.path
 from abc import ABC, abstractmethod
 import pandas as pd
 from organize_stream.erros import *
+from organize_stream.metrics import NAMING_SECONDS
 from organize_stream.type_utils import (
     DigitalizedDocument, FilterData, DictOriginInfo, DictOutputInfo, DictKeyWordFiles
 
@@ -200,28 +201,9 @@ class FindNameInnerData(NameFinder):
         return get_column_values(df, col)
 
     def get_include_names(self, idx: int) -> str | None:
-        if len(self.filter_data.cols_in_name) == 0:
-            return None
-
-        values = ArrayString([])
-        for col in self.filter_data.cols_in_name:
-            try:
-                current_text = self.filter_data.src_df[col].astype('str').values.tolist()[idx]
-            except Exception as e:
-                pass
-            else:
-                if (current_text == 'nan') or (current_text == 'NaN') \
-                        or (current_text == 'NaD') or (current_text == 'NaT') \
-                        or (current_text == '') or (current_text is None) or (current_text == 'None'):
-                    continue
-                values.append(current_text)
-        if values.length == 0:
-            return None
-        new_name = ''
-        for i in values:
-            new_name = f'{new_name}-{i}'
-        return new_name
+        return self.filter_data.get_include_names(idx)
 
+    @NAMING_SECONDS.time(stage='get_new_name')
     def get_new_name(self, digitalized: DigitalizedDocument) -> DictKeyWordFiles:
         extension_file: str | None = digitalized.extension_file
         origin_path: sp.File | None = digitalized.file_path_origin
@@ -239,20 +221,16 @@ class FindNameInnerData(NameFinder):
         dict_out_file.set_directory(self.output_dir)
         dict_out_file.set_extension(origin_path.extension())
 
-        # Lista de valores da coluna texto.
-        list_values_find: ArrayString = self.get_values(self.filter_data.src_df, self.filter_data.col_find)
         # Lista de valores da coluna com novos nomes de arquivo.
-        content_new_names: ArrayString = self.get_values(self.filter_data.src_df, self.filter_data.col_new_name)
+        content_new_names: list[str] = self.filter_data.values_new_name
         # Lista de valores com as linhas de texto do arquivo em formato list[str].
         lines_in_doc: ArrayString = ArrayString(digitalized.get_lines_keys())
 
-        line_df: str
         idx_df: int
         output_name: str = None
-        for idx_df, line_df in enumerate(list_values_find):
-            if not lines_in_doc.contains(line_df, case=False, iqual=False):
-                continue
-
+        # Linhas da planilha (em ordem) cujo valor de col_find aparece no documento,
+        # obtidas com uma única passagem pelo texto (veja FilterData.match_index).
+        for idx_df in self.filter_data.find_rows(lines_in_doc):
             output_name = content_new_names[idx_df]
             if (output_name == 'nan') or (output_name is None):
                 output_name = ''
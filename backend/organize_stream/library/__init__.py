@@ -1,2 +1,8 @@
 from .common import *
+from .task_state import *
+from .task_dirs import *
+from .task_events import *
+from .uploads import *
+from .zip_stream import *
+from .route_executor import *
 from .progress_route import *
\ No newline at end of file
@@ -1,26 +1,171 @@
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
-from typing import Any
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from collections import deque
+from typing import Any, AsyncIterator, Callable
 from io import BytesIO
+import asyncio
+import cProfile
 import tempfile
+import threading
+import time
 import convert_stream as cs
 import zipfile
 import os
 import soup_files as sp
 from organize_stream.document import CreateFileNames, ExtractNameInnerData
+from organize_stream.text_extract import DocumentTextExtract
 from organize_stream.type_utils import (
     FilterData, FilterText, EnumDigitalDoc, DictOriginInfo, DictOutputInfo
 )
+from organize_stream.erros import QueueFullError
+from organize_stream.metrics import (
+    ACTIVE_TASKS, QUEUED_TASKS, QUEUE_WAIT_SECONDS, JOB_SECONDS, ZIP_WRITE_SECONDS,
+)
+from organize_stream.library.task_state import (
+    TaskStateBackend, ProgressState, get_task_state_backend,
+)
+from organize_stream.library.task_dirs import create_task_dir
+from organize_stream.library.task_profile import (
+    add_profile_to_zip, start_task_profile, stop_task_profile,
+)
+from organize_stream.library.task_events import (
+    TaskEvent, TaskSubscription, format_sse, get_task_event_bus, publish_task_event, create_event_pbar,
+)
 from sheet_stream import ListItems
 
 # Define o roteador para as rotas de progresso
 router = APIRouter()
-TASK_PROGRESS_STATE: dict[str, dict[str, Any]] = {}
+
+# Variáveis de ambiente da fila de processamento.
+ENV_JOB_WORKERS: str = 'ORGANIZE_JOB_WORKERS'
+ENV_JOB_QUEUE_SIZE: str = 'ORGANIZE_JOB_QUEUE_SIZE'
+# Intervalo (segundos) da leitura do estado no stream de eventos quando nenhum evento chega.
+SSE_POLL_INTERVAL: float = 2.0
 
 
-def create_progress_with_id(task_id: str) -> dict[str, Any]:
+class JobScheduler(object):
     """
-        Cria um progresso vazio e adiciona no dicionário global.
+    Fila FIFO limitada de tarefas, executadas por um número fixo de threads.
+
+    As rotas enviam as tarefas com submit(), se a fila estiver cheia QueueFullError
+    é lançado (a rota responde com HTTP 429). O estado de cada tarefa (veja
+    get_id_progress_state) recebe 'status' (queued/running/finished) e 'queue_position'.
+    """
+
+    def __init__(self, num_workers: int = 2, *, max_queue: int = 20):
+        if num_workers < 1:
+            raise ValueError(f'{__class__.__name__} num_workers precisa ser maior que 0')
+        self.num_workers: int = num_workers
+        self.max_queue: int = max_queue
+        # (task_id, função, args, kwargs, horário em que entrou na fila)
+        self.__queue: deque[tuple[str, Callable[..., None], tuple, dict[str, Any], float]] = deque()
+        self.__running: set[str] = set()
+        self.__cond = threading.Condition()
+        self.__workers: list[threading.Thread] = []
+
+    @property
+    def queue_length(self) -> int:
+        with self.__cond:
+            return len(self.__queue)
+
+    @property
+    def running_length(self) -> int:
+        with self.__cond:
+            return len(self.__running)
+
+    def is_full(self) -> bool:
+        with self.__cond:
+            return len(self.__queue) >= self.max_queue
+
+    def __start_workers(self) -> None:
+        # Chamado com o lock adquirido, as threads são criadas no primeiro submit().
+        if len(self.__workers) > 0:
+            return
+        for num in range(self.num_workers):
+            th = threading.Thread(target=self.__run_worker, name=f'organize-job-{num}', daemon=True)
+            th.start()
+            self.__workers.append(th)
+
+    def submit(self, task_id: str, func: Callable[..., None], /, *args, **kwargs) -> int:
+        """
+        Adiciona a tarefa no final da fila e retorna a posição (1 = próxima a executar).
+        """
+        with self.__cond:
+            if len(self.__queue) >= self.max_queue:
+                raise QueueFullError(f'{__class__.__name__} a fila está cheia ({self.max_queue} tarefas)')
+            self.__start_workers()
+            self.__queue.append((task_id, func, args, kwargs, time.monotonic()))
+            position = len(self.__queue)
+            QUEUED_TASKS.set(position)
+            state = get_id_progress_state(task_id)
+            if state is not None:
+                state.update({"status": "queued", "queue_position": position})
+            self.__cond.notify()
+        return position
+
+    def get_queue_position(self, task_id: str) -> int | None:
+        """
+        Posição da tarefa na fila (1 = próxima), 0 se já está em execução ou None.
+        """
+        with self.__cond:
+            if task_id in self.__running:
+                return 0
+            for num, item in enumerate(self.__queue):
+                if item[0] == task_id:
+                    return num + 1
+        return None
+
+    def __run_worker(self) -> None:
+        while True:
+            with self.__cond:
+                while len(self.__queue) == 0:
+                    self.__cond.wait()
+                task_id, func, args, kwargs, queued_at = self.__queue.popleft()
+                self.__running.add(task_id)
+                QUEUED_TASKS.set(len(self.__queue))
+            QUEUE_WAIT_SECONDS.observe(time.monotonic() - queued_at)
+            ACTIVE_TASKS.inc()
+            job_start: float = time.monotonic()
+            state = get_id_progress_state(task_id)
+            if state is not None:
+                state.update({"status": "running", "queue_position": 0})
+            try:
+                func(*args, **kwargs)
+            except Exception as err:
+                print(f'DEBUG: {__class__.__name__} a tarefa {task_id} falhou: {err}')
+                if state is not None:
+                    state.update({"done": True, "zip_path": None})
+            finally:
+                ACTIVE_TASKS.dec()
+                JOB_SECONDS.observe(time.monotonic() - job_start)
+                with self.__cond:
+                    self.__running.discard(task_id)
+                if state is not None:
+                    state.update({"status": "finished", "queue_position": None})
+
+
+_JOB_SCHEDULER: JobScheduler | None = None
+_JOB_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_job_scheduler() -> JobScheduler:
+    """
+    Retorna a fila compartilhada pelas rotas, configurada com ORGANIZE_JOB_WORKERS
+    (padrão 2) e ORGANIZE_JOB_QUEUE_SIZE (padrão 20).
+    """
+    global _JOB_SCHEDULER
+    with _JOB_SCHEDULER_LOCK:
+        if _JOB_SCHEDULER is None:
+            _JOB_SCHEDULER = JobScheduler(
+                int(os.environ.get(ENV_JOB_WORKERS, '2')),
+                max_queue=int(os.environ.get(ENV_JOB_QUEUE_SIZE, '20')),
+            )
+        return _JOB_SCHEDULER
+
+
+def create_progress_with_id(task_id: str) -> ProgressState:
+    """
+        Cria um progresso vazio e grava no backend de estado das tarefas.
     """
     new_state = {
         "current": 0,
@@ -29,14 +174,72 @@ def create_progress_with_id(task_id: str) -> dict[str, Any]:
         "zip_path": None,
         "task_id": task_id,
         "message": "Aguarde!",
+        "status": "created",
+        "queue_position": None,
+        "created_at": time.time(),
+    }
+    new_state["updated_at"] = new_state["created_at"]
+    backend: TaskStateBackend = get_task_state_backend()
+    backend.set(task_id, new_state)
+    return ProgressState(backend, task_id, new_state)
+
+
+def get_id_progress_state(task_id: str) -> ProgressState | None:
+    """
+    Obtém o estado de progresso para um ID de tarefa específico. As alterações
+    no dicionário retornado são gravadas no backend.
+    """
+    backend: TaskStateBackend = get_task_state_backend()
+    state: dict[str, Any] | None = backend.get(task_id)
+    if state is None:
+        return None
+    return ProgressState(backend, task_id, state)
+
+
+def delete_progress_state(task_id: str) -> None:
+    get_task_state_backend().delete(task_id)
+    get_task_event_bus().discard(task_id)
+
+
+def get_progress_snapshot(task_id: str) -> dict[str, Any] | None:
+    """
+    Resumo do estado da tarefa enviado ao frontend, None se a tarefa não existir.
+    """
+    current_progress = get_id_progress_state(task_id)
+    if current_progress is None:
+        return None
+    # A tarefa pode estar na fila de outro processo, nesse caso usa a posição gravada no estado.
+    queue_position: int | None = get_job_scheduler().get_queue_position(task_id)
+    if queue_position is None:
+        queue_position = current_progress.get("queue_position")
+    current: int = current_progress.get("current") or 0
+    total: int = current_progress.get("total") or 0
+    if total:
+        pbar = ((current + 1) / total) * 100
+    else:
+        pbar = 0
+    return {
+        "current": current,
+        "total": total,
+        "progress": pbar,
+        "done": current_progress.get("done", False),
+        "expired": current_progress.get("expired", False),
+        "task_id": task_id,
+        "status": current_progress.get("status"),
+        "queue_position": queue_position,
+        # Páginas lidas novamente com DPI maior (DPI adaptativo).
+        "pages_escalated": current_progress.get("pages_escalated", 0),
     }
-    TASK_PROGRESS_STATE[task_id] = new_state
-    return new_state
 
 
-def get_id_progress_state(task_id: str) -> dict[str, Any] | None:
-    """Obtém o estado de progresso para um ID de tarefa específico."""
-    return TASK_PROGRESS_STATE.get(task_id)
+def finish_task_with_zip(state: dict[str, Any], task_id: str, zip_path: str) -> None:
+    """
+    Grava o zip da tarefa e publica 'zip_ready' antes de marcar 'done': o stream de
+    eventos termina ao ler done=True e precisa encontrar o evento já publicado.
+    """
+    state["zip_path"] = zip_path
+    publish_task_event(task_id, 'zip_ready', task_id=task_id)
+    state["done"] = True
 
 
 # =============== ROTA PROGRESSO ==================
@@ -46,8 +249,8 @@ async def get_json_progress(task_id: str) -> JSONResponse:
         Retorna o status do processamento para o frontend.
     """
     # Obtém o estado usando o ID da tarefa na URL
-    current_progress = get_id_progress_state(task_id)
-    if current_progress is None:
+    snapshot = get_progress_snapshot(task_id)
+    if snapshot is None:
         return JSONResponse({
         "current": 0,
         "total": 0,
@@ -55,18 +258,61 @@ async def get_json_progress(task_id: str) -> JSONResponse:
         "done": False,
         "task_id": task_id,
     })
-        
-    if current_progress["total"]:
-        pbar = ((current_progress["current"] + 1) / current_progress["total"]) * 100
-    else:
-        pbar = 0
-    return JSONResponse({
-        "current": current_progress["current"],
-        "total": current_progress["total"],
-        "progress": pbar,
-        "done": current_progress["done"],
-        "task_id": task_id,
-    })
+    return JSONResponse(snapshot)
+
+
+async def iter_progress_events(task_id: str, *, last_seq: int = 0) -> AsyncIterator[str]:
+    """
+    Envia os eventos da tarefa (file_started, page, file_named, zip_ready) assim que
+    são publicados, e um evento 'progress' sempre que o estado muda. Sem eventos,
+    o estado é lido a cada SSE_POLL_INTERVAL segundos (tarefas em outro worker).
+    O stream termina com 'done' (ou 'not_found'), depois dos eventos já publicados.
+    """
+    subscription: TaskSubscription = get_task_event_bus().subscribe(task_id, last_seq=last_seq)
+    last_snapshot: dict[str, Any] | None = None
+    try:
+        while True:
+            task_event: TaskEvent | None = await subscription.get(SSE_POLL_INTERVAL)
+            if task_event is not None:
+                yield task_event.to_sse()
+                for queued_event in subscription.drain():
+                    yield queued_event.to_sse()
+            snapshot = get_progress_snapshot(task_id)
+            if snapshot is None:
+                yield format_sse('not_found', {"task_id": task_id})
+                break
+            finished: bool = snapshot["done"] or snapshot["expired"]
+            if finished:
+                # Eventos publicados antes de 'done' (ex: zip_ready) que ainda estão na fila do loop.
+                await asyncio.sleep(0)
+                for queued_event in subscription.drain():
+                    yield queued_event.to_sse()
+            if snapshot != last_snapshot:
+                last_snapshot = snapshot
+                yield format_sse('progress', snapshot)
+            elif (task_event is None) and (not finished):
+                # Comentário para manter a conexão aberta.
+                yield ': ping\n\n'
+            if finished:
+                yield format_sse('done', snapshot)
+                break
+    finally:
+        get_task_event_bus().unsubscribe(subscription)
+
+
+@router.get("/progress/{task_id}/events")
+async def stream_progress_events(task_id: str, request: Request) -> StreamingResponse:
+    """
+        Stream (Server-Sent Events) com o progresso da tarefa, substitui a consulta
+    repetida de /progress/{task_id}, que continua disponível.
+    """
+    last_event_id: str | None = request.headers.get('last-event-id')
+    last_seq: int = int(last_event_id) if (last_event_id is not None) and last_event_id.isdigit() else 0
+    return StreamingResponse(
+        iter_progress_events(task_id, last_seq=last_seq),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 def thread_images_to_pdfs(images: list[str], task_id: str) -> None:
@@ -74,17 +320,18 @@ def thread_images_to_pdfs(images: list[str], task_id: str) -> None:
     Recebe uma lista de imagens e junta tudo em arquivos pdf, o download final
     são arquivos .pdf dentro de um .zip
     """
-    # Criar diretório temporário para saída
-    temp_dir = tempfile.mkdtemp()
+    # Diretório da tarefa para saída (removido pelo TaskReaper após o TTL)
+    temp_dir = create_task_dir(task_id).absolute()
     _output_zip = os.path.join(temp_dir, "resultado.zip")
     pdf_stream = cs.PdfStream()
     current_progress: dict[str, Any] = get_id_progress_state(task_id)
 
     try:
         current_progress['total'] = len(images)
-        with zipfile.ZipFile(_output_zip, "w") as zipf:
+        with ZIP_WRITE_SECONDS.time(job='images_to_pdfs'), zipfile.ZipFile(_output_zip, "w") as zipf:
             for idx, path in enumerate(images):
                 current_progress["current"] = idx
+                publish_task_event(task_id, 'file_started', index=idx, total=len(images), name=os.path.basename(path))
                 with open(path, "rb") as fp:
                     raw_bytes = fp.read()
                 im = cs.ImageObject.create_from_bytes(raw_bytes)
@@ -96,7 +343,7 @@ def thread_images_to_pdfs(images: list[str], task_id: str) -> None:
                 pdf_stream.clear()
                 del doc
         # finalizou
-        current_progress.update({"done": True, "zip_path": _output_zip})
+        finish_task_with_zip(current_progress, task_id, _output_zip)
     except Exception as e:
         current_progress.update({"done": True, "zip_path": None})
         print(f"[ERRO] Worker falhou: {e}")
@@ -106,10 +353,20 @@ def thread_organize_documents(**kwargs: dict[str, Any]) -> None:
     """
     Recebe uma lista de imagens e junta tudo em arquivos pdf, o download final
     são arquivos .pdf dentro de um .zip
+
+    profile=True: a tarefa é executada com o cProfile e o relatório é adicionado
+    ao zip junto com dados.xlsx.
     """
-    # Criar diretório temporário para saída
-    temp_dir: sp.Directory = sp.Directory(tempfile.mkdtemp())
-    temp_dir.mkdir()
+    profiler: cProfile.Profile | None = start_task_profile(kwargs.get('profile', False))
+    try:
+        _organize_documents(profiler, **kwargs)
+    finally:
+        stop_task_profile(profiler)
+
+
+def _organize_documents(profiler: cProfile.Profile | None, **kwargs: dict[str, Any]) -> None:
+    # Diretório da tarefa para saída (removido pelo TaskReaper após o TTL)
+    temp_dir: sp.Directory = create_task_dir(kwargs['task_id'])
     _output_zip: str = temp_dir.join_file("resultado.zip").absolute()
     current_progress: dict[str, Any] = get_id_progress_state(kwargs['task_id'])
     current_progress['total'] = len(kwargs['images']) + len(kwargs['pdfs'])
@@ -117,18 +374,21 @@ def thread_organize_documents(**kwargs: dict[str, Any]) -> None:
     
     name_finder: CreateFileNames
     if kwargs['digitalized_type'] == 'EPIS':
-        name_finder = CreateFileNames(lib_digitalized=EnumDigitalDoc.EPI)
+        name_finder = CreateFileNames(extractor=DocumentTextExtract(), lib_digitalized=EnumDigitalDoc.EPI)
     elif kwargs['digitalized_type'] == 'CARTAS':
-        name_finder = CreateFileNames(lib_digitalized=EnumDigitalDoc.CARTA_CALCULO)
+        name_finder = CreateFileNames(extractor=DocumentTextExtract(), lib_digitalized=EnumDigitalDoc.CARTA_CALCULO)
     else:
         if kwargs['pattern'] is None:
             current_progress.update({"done": True, "zip_path": None})
             print(f"DEBUG: thread_organize_documents falhou, o filtro de texto é nulo!")
             return
         filter_text = FilterText(kwargs['pattern'])
-        name_finder = CreateFileNames(filters=filter_text)
+        name_finder = CreateFileNames(extractor=DocumentTextExtract(), filters=filter_text)
+    # Publica o progresso de cada página lida (OCR) no stream de eventos da tarefa, cada
+    # tarefa usa o próprio extrator para não compartilhar a barra de progresso.
+    name_finder.extractor.pbar, event_bar = create_event_pbar(kwargs['task_id'])
            
-    final_bytes: BytesIO | None
+    final_zip: sp.File | None
     try:
         count = 0
         documents: ListItems[DictOriginInfo] = kwargs['pdfs']
@@ -137,10 +397,21 @@ def thread_organize_documents(**kwargs: dict[str, Any]) -> None:
             current_progress["current"] = count
             count += 1
             print(f'{num+1}/{total}')
-            name_finder.add_disk_file(file_info) 
+            file_name: str | None = file_info.get_filename_with_extension()
+            publish_task_event(kwargs['task_id'], 'file_started', index=num, total=total, name=file_name)
+            event_bar.extra = {'file': file_name}
+            total_named: int = name_finder.get_list_key_files().length
+            name_finder.add_disk_file(file_info)
+            if name_finder.get_list_key_files().length > total_named:
+                new_name = name_finder.get_list_key_files()[-1].get_output_file().get_filename_with_extension()
+                publish_task_event(kwargs['task_id'], 'file_named', index=num, name=file_name, new_name=new_name)
+            else:
+                publish_task_event(kwargs['task_id'], 'file_skipped', index=num, name=file_name)
+            current_progress['pages_escalated'] = name_finder.extractor.escalated_pages
             
-        final_bytes: BytesIO | None = name_finder.export_new_files_to_zip()
-        if final_bytes is None:
+        # O zip é gravado direto no diretório da tarefa, a partir dos arquivos no disco.
+        final_zip = name_finder.export_new_files_to_zip_file(sp.File(_output_zip))
+        if final_zip is None:
             current_progress.update({"done": True, "zip_path": None})
             print(f"DEBUG: thread_organize_documents falhou, o arquivo zip é nulo!")
             return
@@ -151,19 +422,14 @@ def thread_organize_documents(**kwargs: dict[str, Any]) -> None:
         try:
             path_excel = temp_dir.join_file('dados.xlsx')
             name_finder.export_log_actions().to_excel(path_excel.absolute(), index=False)
-            final_bytes.seek(0)
-            with zipfile.ZipFile(final_bytes, 'a', zipfile.ZIP_DEFLATED) as zipf:
-                # writestr adiciona bytes na memória.
-                zipf.writestr('dados.xlsx', path_excel.path.read_bytes())
-            final_bytes.seek(0)
-            with open(_output_zip, 'wb') as fp:
-                fp.write(final_bytes.getvalue())
-            
+            with zipfile.ZipFile(_output_zip, 'a', zipfile.ZIP_DEFLATED) as zipf:
+                zipf.write(path_excel.absolute(), 'dados.xlsx')
+            add_profile_to_zip(profiler, _output_zip)
         except Exception as e:
             current_progress.update({"done": True, "zip_path": None})
             print(f"\n[ERRO] thread_organize_documents falhou ao tentar salvar o arquivo ZIP: {e}")
         else:
-            current_progress.update({"done": True, "zip_path": _output_zip})
+            finish_task_with_zip(current_progress, kwargs['task_id'], _output_zip)
             
             
   
@@ -174,10 +440,20 @@ def thread_organize_documents_with_sheet(**kwargs: dict[str, Any]) -> None:
     df: pd.Dataframe: aponta para um dataframe com dados base para o filtro de dados
     col_find: str: coluna onde o texto deve ser filtrado
     col_new_name: str: coluna que aponta para o novo nome de arquivo.
+    cols_in_name: list[str]: colunas incluídas no final do novo nome (opcional).
     files: list[File]: aponta para uma lista de arquivos.
     task_id: str: id do processo.
     output_dir: Directory: diretório destino dos arquivos.
+    profile: bool: executa com o cProfile e adiciona o relatório ao zip (opcional).
     """
+    profiler: cProfile.Profile | None = start_task_profile(kwargs.get('profile', False))
+    try:
+        _organize_documents_with_sheet(profiler, **kwargs)
+    finally:
+        stop_task_profile(profiler)
+
+
+def _organize_documents_with_sheet(profiler: cProfile.Profile | None, **kwargs: dict[str, Any]) -> None:
     # Diretório temporário para saída de dados.
     temp_dir: sp.Directory = kwargs["output_dir"]
     temp_dir.mkdir()
@@ -191,14 +467,23 @@ def thread_organize_documents_with_sheet(**kwargs: dict[str, Any]) -> None:
     # Renomear os arquivos
     try:
         filter_data = FilterData(
-            kwargs["df"], col_find=kwargs["col_find"], col_new_name=kwargs["col_new_name"], cols_in_name=[]
+            kwargs["df"],
+            col_find=kwargs["col_find"],
+            col_new_name=kwargs["col_new_name"],
+            cols_in_name=kwargs.get("cols_in_name", []),
         )
         find_name_inner_data: ExtractNameInnerData = ExtractNameInnerData(temp_dir, filters=filter_data)
         find_name_inner_data.save_tables = False
         find_name_inner_data.extractor.notify_observers = False
+        find_name_inner_data.extractor.pbar, event_bar = create_event_pbar(kwargs['task_id'])
         
         for num_prog, file_doc in enumerate(list_documents_files):
             progress_data['current'] = num_prog + 1
+            publish_task_event(
+                kwargs['task_id'], 'file_started',
+                index=num_prog, total=len(list_documents_files), name=file_doc.basename(),
+            )
+            event_bar.extra = {'file': file_doc.basename()}
             if file_doc.is_image():
                 tb_img = find_name_inner_data.extractor.read_image(file_doc)
                 if (tb_img is not None) and (tb_img.length > 0):
@@ -207,6 +492,7 @@ def thread_organize_documents_with_sheet(**kwargs: dict[str, Any]) -> None:
                 tb_pdf = find_name_inner_data.extractor.read_document(file_doc)
                 if (tb_pdf is not None) and (tb_pdf.length > 0):
                     find_name_inner_data.add_table(tb_pdf)
+                progress_data['pages_escalated'] = find_name_inner_data.extractor.escalated_pages
                     
         find_name_inner_data.export_final_table()      
         # Gerar uma lista de arquivos
@@ -216,15 +502,15 @@ def thread_organize_documents_with_sheet(**kwargs: dict[str, Any]) -> None:
         final_files.extend(input_files.sheets)
         
         #zip_buffer = BytesIO()
-        with zipfile.ZipFile(_output_zip, "w") as zipf:
+        with ZIP_WRITE_SECONDS.time(job='organize_documents_with_sheet'), zipfile.ZipFile(_output_zip, "w") as zipf:
             for doc_file in final_files:
-                _doc_bytes: bytes = doc_file.path.read_bytes()
-                zipf.writestr(doc_file.basename(), _doc_bytes)
+                zipf.write(doc_file.absolute(), doc_file.basename())
         #zip_buffer.seek(0)
+        add_profile_to_zip(profiler, _output_zip)
     except Exception as e:
         progress_data.update({"done": True, "zip_path": None})
         print(f"\n[ERRO] Falha ao tentar gerar o arquivo ZIP: {e}")
     else:
-        progress_data.update({"done": True, "zip_path": _output_zip})
+        finish_task_with_zip(progress_data, kwargs['task_id'], _output_zip)
     
         
\ No newline at end of file
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator, TypeVar
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+
+# Variáveis de ambiente do executor das rotas síncronas (OCR, conversão de PDF, ...).
+ENV_ROUTE_EXECUTOR: str = 'ORGANIZE_ROUTE_EXECUTOR'
+ENV_ROUTE_WORKERS: str = 'ORGANIZE_ROUTE_WORKERS'
+ENV_ROUTE_CONCURRENCY: str = 'ORGANIZE_ROUTE_CONCURRENCY'
+
+T = TypeVar('T')
+# Fim do gerador executado em uma thread (next(gen, _END)).
+_END = object()
+
+
+def _collect_items(
+            func: Callable[..., Iterator[T]], args: tuple, kwargs: dict[str, Any], start: int, size: int
+        ) -> list[T]:
+    # Executado no pool de processos: lê até size itens do gerador a partir de start.
+    items: list[T] = []
+    for item in func(*args, start=start, **kwargs):
+        items.append(item)
+        if len(items) >= size:
+            break
+    return items
+
+
+class RouteExecutor(object):
+    """
+    Executa o trabalho pesado (CPU) das rotas fora do loop do asyncio, em um pool
+    de threads ou de processos, com um limite de tarefas simultâneas por rota.
+
+    No modo 'process' as funções e os argumentos precisam ser serializáveis
+    (funções de módulo, caminhos de arquivos, ...), veja library/route_jobs.py.
+    """
+
+    def __init__(self, kind: str = 'thread', max_workers: int | None = None, *, concurrency: int = 2):
+        if kind not in ('thread', 'process'):
+            raise ValueError(f'{__class__.__name__} tipo de executor inválido: {kind}')
+        if concurrency < 1:
+            raise ValueError(f'{__class__.__name__} concurrency precisa ser maior que 0')
+        self.kind: str = kind
+        self.max_workers: int = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self.concurrency: int = concurrency
+        self.__executor: Executor | None = None
+        self.__semaphores: dict[str, asyncio.Semaphore] = {}
+        self.__lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        with self.__lock:
+            if self.__executor is None:
+                if self.kind == 'process':
+                    # 'spawn' para os processos não herdarem as threads do servidor.
+                    self.__executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context('spawn'),
+                    )
+                else:
+                    self.__executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix='organize-route',
+                    )
+            return self.__executor
+
+    def get_semaphore(self, route: str) -> asyncio.Semaphore:
+        """
+        Semáforo da rota, limita as tarefas da rota em execução ao mesmo tempo.
+        """
+        semaphore = self.__semaphores.get(route)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            self.__semaphores[route] = semaphore
+        return semaphore
+
+    async def run_blocking(self, route: str, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Executa func(*args, **kwargs) no executor, aguardando a vez da rota.
+        """
+        async with self.get_semaphore(route):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def iter_blocking(
+                self, route: str, func: Callable[..., Iterator[T]], *args, chunk_size: int = 4, **kwargs
+            ) -> AsyncIterator[T]:
+        """
+        Executa o gerador func(*args, **kwargs) no executor e retorna os itens um a um,
+        aguardando a vez da rota a cada item. No modo 'thread' o gerador é criado uma
+        única vez (ex: o PDF é aberto uma vez por requisição). No modo 'process' os itens
+        são lidos em blocos de chunk_size, func precisa aceitar start=<índice do item>.
+        """
+        loop = asyncio.get_running_loop()
+        if self.kind == 'process':
+            start: int = 0
+            while True:
+                async with self.get_semaphore(route):
+                    items: list[T] = await loop.run_in_executor(
+                        self.executor, _collect_items, func, args, kwargs, start, chunk_size
+                    )
+                for item in items:
+                    yield item
+                if len(items) < chunk_size:
+                    return
+                start += len(items)
+
+        gen: Iterator[T] = func(*args, **kwargs)
+        try:
+            while True:
+                async with self.get_semaphore(route):
+                    item = await loop.run_in_executor(self.executor, next, gen, _END)
+                if item is _END:
+                    return
+                yield item
+        finally:
+            try:
+                gen.close()
+            except ValueError:
+                # Cancelado enquanto a thread ainda lê o próximo item.
+                pass
+
+    def shutdown(self) -> None:
+        with self.__lock:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=False, cancel_futures=True)
+                self.__executor = None
+
+
+_ROUTE_EXECUTOR: RouteExecutor | None = None
+_ROUTE_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_route_executor() -> RouteExecutor:
+    """
+    Executor compartilhado pelas rotas: ORGANIZE_ROUTE_EXECUTOR=thread (padrão) ou process,
+    ORGANIZE_ROUTE_WORKERS (padrão: número de CPUs) e ORGANIZE_ROUTE_CONCURRENCY
+    (tarefas simultâneas por rota, padrão 2).
+    """
+    global _ROUTE_EXECUTOR
+    with _ROUTE_EXECUTOR_LOCK:
+        if _ROUTE_EXECUTOR is None:
+            kind: str = os.environ.get(ENV_ROUTE_EXECUTOR, 'thread').lower()
+            if kind not in ('thread', 'process'):
+                print(f'DEBUG: {ENV_ROUTE_EXECUTOR}={kind} inválido, usando threads.')
+                kind = 'thread'
+            workers: str | None = os.environ.get(ENV_ROUTE_WORKERS)
+            _ROUTE_EXECUTOR = RouteExecutor(
+                kind,
+                int(workers) if workers else None,
+                concurrency=int(os.environ.get(ENV_ROUTE_CONCURRENCY, '2')),
+            )
+        return _ROUTE_EXECUTOR
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Trabalho pesado das rotas síncronas do servidor, executado pelo RouteExecutor.
+As funções recebem apenas caminhos e valores simples para funcionarem também
+em um pool de processos.
+"""
+from __future__ import annotations
+from typing import Iterator
+import inspect
+import threading
+import convert_stream as cs
+import ocr_stream as ocr
+import soup_files as sp
+from organize_stream.read import render_page
+
+
+
+def _get_convert_dpi() -> int:
+    # DPI padrão de cs.ConvertPdfToImages.to_images(), usado pela rota antes da renderização por página.
+    param = inspect.signature(cs.ConvertPdfToImages.to_images).parameters.get('dpi')
+    if (param is None) or (not isinstance(param.default, int)):
+        return 300
+    return param.default
+
+
+# DPI das imagens geradas na conversão de PDF para imagens.
+CONVERT_PDF_DPI: int = _get_convert_dpi()
+# Reconhecedores reutilizados pelas chamadas do mesmo processo, a chave é o binário do tesseract.
+_RECOGNIZE_IMAGES: dict[str, ocr.RecognizeImage] = {}
+_RECOGNIZE_IMAGES_LOCK = threading.Lock()
+
+
+def get_recognize_image(tess_file: str) -> ocr.RecognizeImage:
+    with _RECOGNIZE_IMAGES_LOCK:
+        recognize_img = _RECOGNIZE_IMAGES.get(tess_file)
+        if recognize_img is None:
+            recognize_img = ocr.RecognizeImage(ocr.BinTesseract(sp.File(tess_file)))
+            _RECOGNIZE_IMAGES[tess_file] = recognize_img
+        return recognize_img
+
+
+def count_pdf_pages(file_path: str) -> int:
+    """
+    Abre o PDF e retorna o número de páginas (falha se o arquivo for inválido).
+    """
+    return cs.DocumentPdf.create_from_file(sp.File(file_path)).lenght
+
+
+def iter_pdf_pages_png(file_path: str, dpi: int = CONVERT_PDF_DPI, *, start: int = 0) -> Iterator[bytes]:
+    """
+    Abre o PDF uma única vez e gera os bytes PNG de cada página, a partir de start.
+    """
+    doc = cs.DocumentPdf.create_from_file(sp.File(file_path))
+    for page_idx in range(start, doc.lenght):
+        yield render_page(doc, page_idx, dpi=dpi)
+
+
+def iter_split_pdf_pages(file_path: str, *, start: int = 0) -> Iterator[bytes]:
+    """
+    Abre o PDF uma única vez e gera os bytes de um novo PDF para cada página, a partir de start.
+    """
+    doc = cs.DocumentPdf.create_from_file(sp.File(file_path))
+    for page_idx in range(start, doc.lenght):
+        yield cs.DocumentPdf.create_from_pages([doc.get_page(page_idx)]).to_bytes().getvalue()
+
+
+def check_image(file_path: str) -> tuple[int, int]:
+    """
+    Abre a imagem e retorna as dimensões (falha se o arquivo for inválido).
+    """
+    return cs.ImageObject.create_from_file(sp.File(file_path)).get_dimensions()
+
+
+def ocr_image_to_pdf(file_path: str, tess_file: str) -> bytes:
+    """
+    Aplica OCR na imagem e retorna os bytes do PDF pesquisável.
+    """
+    recognize_img: ocr.RecognizeImage = get_recognize_image(tess_file)
+    image = cs.ImageObject.create_from_file(sp.File(file_path))
+    return recognize_img.image_recognize(image).to_document().to_bytes().getvalue()
+
+
+def join_pdfs_to_file(file_paths: list[str], output_path: str) -> str:
+    """
+    Junta as páginas dos PDFs em um único arquivo gravado em output_path.
+    """
+    collection_pages: cs.CollectionPagePdf = cs.CollectionPagePdf([])
+    for file_path in file_paths:
+        collection_pages.add_pages(cs.DocumentPdf.create_from_file(sp.File(file_path)).to_pages())
+    cs.DocumentPdf.create_from_pages(collection_pages).to_file(sp.File(output_path))
+    return output_path
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import Any
+import os
+import shutil
+import tempfile
+import threading
+import time
+import soup_files as sp
+from organize_stream.library.task_state import TaskStateBackend, get_task_state_backend
+
+# Variáveis de ambiente dos diretórios temporários das tarefas.
+ENV_TASK_ROOT: str = 'ORGANIZE_TASK_ROOT'
+ENV_TASK_TTL: str = 'ORGANIZE_TASK_TTL_SECONDS'
+ENV_TASK_QUOTA_MB: str = 'ORGANIZE_TASK_QUOTA_MB'
+ENV_TASK_REAP_INTERVAL: str = 'ORGANIZE_TASK_REAP_INTERVAL'
+ENV_TASK_GRACE: str = 'ORGANIZE_TASK_GRACE_SECONDS'
+ENV_TASK_STATE_GRACE: str = 'ORGANIZE_TASK_STATE_GRACE_SECONDS'
+ENV_TASK_STALE: str = 'ORGANIZE_TASK_STALE_SECONDS'
+
+# Diretórios das requisições em andamento (spools req-* abertos), nunca removidos pelo TaskReaper.
+_ACTIVE_DIRS: set[str] = set()
+_ACTIVE_DIRS_LOCK = threading.Lock()
+
+
+def get_tasks_root() -> sp.Directory:
+    """
+    Diretório comum com uma pasta por tarefa (uploads, arquivos gerados e resultado.zip).
+    """
+    root = sp.Directory(
+        os.environ.get(ENV_TASK_ROOT, os.path.join(tempfile.gettempdir(), 'organize_stream', 'tasks'))
+    )
+    root.mkdir()
+    return root
+
+
+def create_task_dir(task_id: str) -> sp.Directory:
+    """
+    Cria (se necessário) e retorna o diretório da tarefa, removido pelo TaskReaper após o TTL.
+    """
+    task_dir = get_tasks_root().concat(task_id)
+    task_dir.mkdir()
+    return task_dir
+
+
+def set_task_dir_active(name: str, active: bool) -> None:
+    """
+    Marca (active=True) ou libera o diretório 'name' da raiz das tarefas. Os
+    diretórios marcados ainda estão em uso pela requisição e não são removidos.
+    """
+    with _ACTIVE_DIRS_LOCK:
+        if active:
+            _ACTIVE_DIRS.add(name)
+        else:
+            _ACTIVE_DIRS.discard(name)
+
+
+def is_task_dir_active(name: str) -> bool:
+    with _ACTIVE_DIRS_LOCK:
+        return name in _ACTIVE_DIRS
+
+
+def _get_dir_stats(path: str) -> tuple[int, float]:
+    """
+    Retorna o tamanho total e a modificação mais recente (do diretório ou de
+    qualquer arquivo dentro dele).
+    """
+    total = 0
+    latest: float = os.stat(path).st_mtime
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                st = os.stat(os.path.join(root, name))
+            except OSError:
+                continue
+            total += st.st_size
+            latest = max(latest, st.st_mtime)
+    return total, latest
+
+
+class TaskReaper(object):
+    """
+    Thread que remove os diretórios das tarefas expiradas (mais antigos que ttl) e,
+    se o total passar de max_bytes, os diretórios mais antigos primeiro. Tarefas
+    em andamento, spools abertos (set_task_dir_active) e diretórios modificados
+    há menos de grace segundos não são removidos.
+
+    O estado das tarefas removidas recebe 'expired': True (o download passa a
+    retornar HTTP 410) e é apagado do backend após state_grace segundos.
+
+    Uma tarefa sem atualização do estado ('updated_at', ou a modificação do
+    diretório nos estados antigos) há mais de stale segundos deixa de ser
+    considerada em andamento: o processo que a executava terminou sem marcar
+    'done' (ex: reinício do servidor com o backend sqlite).
+    """
+
+    def __init__(
+                self,
+                root: sp.Directory, *,
+                ttl: float = 6 * 3600,
+                max_bytes: int = 2048 * 1024 * 1024,
+                interval: float = 60,
+                grace: float = 300,
+                state_grace: float = 3600,
+                stale: float = 6 * 3600,
+                backend: TaskStateBackend | None = None,
+            ):
+        self.root: sp.Directory = root
+        self.ttl: float = ttl
+        self.max_bytes: int = max_bytes
+        self.interval: float = interval
+        self.grace: float = grace
+        self.state_grace: float = state_grace
+        self.stale: float = stale
+        self.backend: TaskStateBackend = backend if backend is not None else get_task_state_backend()
+        self.__stop = threading.Event()
+        self.__thread: threading.Thread | None = None
+
+    def __is_running(self, state: dict[str, Any] | None, mtime: float, now: float) -> bool:
+        if state is None:
+            return False
+        if state.get("done", False) or state.get("expired", False):
+            return False
+        heartbeat = state.get("updated_at", state.get("created_at"))
+        if heartbeat is None:
+            heartbeat = mtime
+        return (now - heartbeat) <= self.stale
+
+    def __remove_task(self, task_id: str, path: str, now: float) -> None:
+        shutil.rmtree(path, ignore_errors=True)
+        self.backend.update(task_id, {"expired": True, "done": True, "zip_path": None, "expired_at": now})
+
+    def __delete_expired_states(self, now: float) -> None:
+        for task_id in self.backend.keys():
+            state = self.backend.get(task_id)
+            if (state is None) or (not state.get("expired", False)):
+                continue
+            expired_at = state.get("expired_at")
+            if (expired_at is None) or ((now - expired_at) > self.state_grace):
+                self.backend.delete(task_id)
+
+    def reap_once(self, now: float | None = None) -> list[str]:
+        """
+        Executa uma limpeza e retorna os ids das tarefas removidas.
+        """
+        if now is None:
+            now = time.time()
+        self.__delete_expired_states(now)
+        root_path: str = self.root.absolute()
+        if not os.path.isdir(root_path):
+            return []
+
+        # (mtime, task_id, caminho, tamanho) das tarefas que podem ser removidas.
+        candidates: list[tuple[float, str, str, int]] = []
+        total_bytes: int = 0
+        for task_id in os.listdir(root_path):
+            path = os.path.join(root_path, task_id)
+            if not os.path.isdir(path):
+                continue
+            try:
+                size, mtime = _get_dir_stats(path)
+            except OSError:
+                continue
+            total_bytes += size
+            if is_task_dir_active(task_id) or self.__is_running(self.backend.get(task_id), mtime, now):
+                continue
+            if (now - mtime) < self.grace:
+                # Diretório em uso recente (ex: spool de outro processo ainda gravando).
+                continue
+            candidates.append((mtime, task_id, path, size))
+        candidates.sort()
+
+        removed: list[str] = []
+        for mtime, task_id, path, size in candidates:
+            expired: bool = (now - mtime) > self.ttl
+            if (not expired) and (total_bytes <= self.max_bytes):
+                continue
+            self.__remove_task(task_id, path, now)
+            total_bytes -= size
+            removed.append(task_id)
+        if len(removed) > 0:
+            print(f'DEBUG: {__class__.__name__} {len(removed)} diretórios de tarefas removidos')
+        return removed
+
+    def __run(self) -> None:
+        while not self.__stop.wait(self.interval):
+            try:
+                self.reap_once()
+            except Exception as err:
+                print(f'DEBUG: {__class__.__name__} falha na limpeza: {err}')
+
+    def start(self) -> None:
+        if (self.__thread is not None) and self.__thread.is_alive():
+            return
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, name='organize-task-reaper', daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stop.set()
+
+
+_TASK_REAPER: TaskReaper | None = None
+_TASK_REAPER_LOCK = threading.Lock()
+
+
+def start_task_reaper() -> TaskReaper:
+    """
+    Inicia (uma única vez) a limpeza dos diretórios das tarefas, configurada com
+    ORGANIZE_TASK_TTL_SECONDS (padrão 6h), ORGANIZE_TASK_QUOTA_MB (padrão 2048),
+    ORGANIZE_TASK_REAP_INTERVAL (padrão 60s), ORGANIZE_TASK_GRACE_SECONDS (padrão 300s),
+    ORGANIZE_TASK_STATE_GRACE_SECONDS (padrão 1h) e ORGANIZE_TASK_STALE_SECONDS (padrão 6h).
+    """
+    global _TASK_REAPER
+    with _TASK_REAPER_LOCK:
+        if _TASK_REAPER is None:
+            _TASK_REAPER = TaskReaper(
+                get_tasks_root(),
+                ttl=float(os.environ.get(ENV_TASK_TTL, str(6 * 3600))),
+                max_bytes=int(os.environ.get(ENV_TASK_QUOTA_MB, '2048')) * 1024 * 1024,
+                interval=float(os.environ.get(ENV_TASK_REAP_INTERVAL, '60')),
+                grace=float(os.environ.get(ENV_TASK_GRACE, '300')),
+                state_grace=float(os.environ.get(ENV_TASK_STATE_GRACE, '3600')),
+                stale=float(os.environ.get(ENV_TASK_STALE, str(6 * 3600))),
+            )
+        _TASK_REAPER.start()
+        return _TASK_REAPER
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from collections import OrderedDict, deque
+from typing import Any
+import asyncio
+import json
+import threading
+import time
+import soup_files as sp
+
+
+class TaskEvent(object):
+    """
+    Evento de uma tarefa (file_started, page, file_named, zip_ready, ...), com um
+    número sequencial usado como id do Server-Sent Event.
+    """
+
+    def __init__(self, seq: int, task_id: str, event: str, data: dict[str, Any]):
+        self.seq: int = seq
+        self.task_id: str = task_id
+        self.event: str = event
+        self.data: dict[str, Any] = data
+        self.created: float = time.time()
+
+    def __repr__(self) -> str:
+        return f'{__class__.__name__}({self.seq}, {self.event}, {self.data})'
+
+    def to_sse(self) -> str:
+        return format_sse(self.event, self.data, event_id=self.seq)
+
+
+def format_sse(event: str, data: dict[str, Any], *, event_id: int | None = None) -> str:
+    """
+    Formata uma mensagem no padrão text/event-stream.
+    """
+    lines: list[str] = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data, default=str)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+class TaskSubscription(object):
+    """
+    Fila de eventos de uma tarefa para um cliente conectado, criada no loop do asyncio.
+    """
+
+    def __init__(self, task_id: str):
+        self.task_id: str = task_id
+        self.loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[TaskEvent] = asyncio.Queue()
+
+    def put(self, event: TaskEvent) -> None:
+        # Chamado pelas threads de processamento.
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+
+    async def get(self, timeout: float | None = None) -> TaskEvent | None:
+        """
+        Aguarda o próximo evento, retorna None se nada chegar em timeout segundos.
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def drain(self) -> list[TaskEvent]:
+        """
+        Retorna, sem aguardar, todos os eventos que já estão na fila.
+        """
+        events: list[TaskEvent] = []
+        while not self.queue.empty():
+            events.append(self.queue.get_nowait())
+        return events
+
+
+class TaskEventBus(object):
+    """
+    Distribui os eventos publicados pelas threads de processamento para os clientes
+    conectados em /progress/{task_id}/events. Os últimos eventos de cada tarefa
+    ficam guardados para os clientes que conectam (ou reconectam) depois.
+
+    Os eventos existem apenas no processo atual, com vários workers do uvicorn
+    a rota também acompanha o estado gravado no backend das tarefas.
+    """
+
+    def __init__(self, *, history: int = 200, max_tasks: int = 1000):
+        self.history: int = history
+        self.max_tasks: int = max_tasks
+        self.__seq: int = 0
+        self.__events: OrderedDict[str, deque[TaskEvent]] = OrderedDict()
+        self.__subscribers: dict[str, list[TaskSubscription]] = {}
+        self.__lock = threading.Lock()
+
+    def publish(self, task_id: str, event: str, data: dict[str, Any] | None = None) -> TaskEvent:
+        with self.__lock:
+            self.__seq += 1
+            task_event = TaskEvent(self.__seq, task_id, event, dict(data) if data else {})
+            events = self.__events.get(task_id)
+            if events is None:
+                events = deque(maxlen=self.history)
+                self.__events[task_id] = events
+            self.__events.move_to_end(task_id)
+            events.append(task_event)
+            # Descarta o histórico das tarefas mais antigas.
+            while len(self.__events) > self.max_tasks:
+                self.__events.popitem(last=False)
+            subscribers = list(self.__subscribers.get(task_id, []))
+        for subscription in subscribers:
+            try:
+                subscription.put(task_event)
+            except RuntimeError:
+                # O loop do cliente já foi fechado.
+                self.unsubscribe(subscription)
+        return task_event
+
+    def subscribe(self, task_id: str, *, last_seq: int = 0) -> TaskSubscription:
+        """
+        Inscreve um cliente (deve ser chamado no loop do asyncio). Os eventos guardados
+        com número maior que last_seq são entregues primeiro.
+        """
+        subscription = TaskSubscription(task_id)
+        with self.__lock:
+            for task_event in self.__events.get(task_id, []):
+                if task_event.seq > last_seq:
+                    subscription.queue.put_nowait(task_event)
+            self.__subscribers.setdefault(task_id, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: TaskSubscription) -> None:
+        with self.__lock:
+            subscribers = self.__subscribers.get(subscription.task_id, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if len(subscribers) == 0:
+                self.__subscribers.pop(subscription.task_id, None)
+
+    def discard(self, task_id: str) -> None:
+        """
+        Remove o histórico de eventos da tarefa.
+        """
+        with self.__lock:
+            self.__events.pop(task_id, None)
+
+
+class EventProgressBar(sp.ABCProgressBar):
+    """
+    Barra de progresso que publica um evento a cada atualização, use com
+    sp.ProgressBarAdapter no 'pbar' dos extratores para enviar o progresso
+    de cada página.
+    """
+
+    def __init__(self, bus: TaskEventBus, task_id: str, *, event: str = 'page'):
+        super().__init__()
+        self.bus: TaskEventBus = bus
+        self.task_id: str = task_id
+        self.event: str = event
+        # Valores adicionados em todos os eventos (por exemplo, o arquivo atual).
+        self.extra: dict[str, Any] = {}
+
+    def set_percent(self, percent: float):
+        self.num_progress = percent
+
+    def set_text(self, text: str):
+        # ProgressBarAdapter.update() atualiza a porcentagem e depois o texto.
+        data: dict[str, Any] = {'percent': round(self.num_progress, 2), 'text': text}
+        data.update(self.extra)
+        self.bus.publish(self.task_id, self.event, data)
+
+
+_TASK_EVENT_BUS: TaskEventBus | None = None
+_TASK_EVENT_BUS_LOCK = threading.Lock()
+
+
+def get_task_event_bus() -> TaskEventBus:
+    global _TASK_EVENT_BUS
+    with _TASK_EVENT_BUS_LOCK:
+        if _TASK_EVENT_BUS is None:
+            _TASK_EVENT_BUS = TaskEventBus()
+        return _TASK_EVENT_BUS
+
+
+def publish_task_event(task_id: str, event: str, /, **data: Any) -> None:
+    get_task_event_bus().publish(task_id, event, data)
+
+
+def create_event_pbar(task_id: str) -> tuple[sp.ProgressBarAdapter, EventProgressBar]:
+    """
+    Retorna o ProgressBarAdapter para os extratores e a barra que publica os eventos.
+    """
+    event_bar = EventProgressBar(get_task_event_bus(), task_id)
+    return sp.ProgressBarAdapter(event_bar), event_bar
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import cProfile
+import io
+import os
+import pstats
+import threading
+import zipfile
+
+# Variável de ambiente que ativa o perfil de todas as tarefas.
+ENV_TASK_PROFILE: str = 'ORGANIZE_TASK_PROFILE'
+# Número de funções no relatório texto (ordenadas pelo tempo acumulado).
+PROFILE_TOP_FUNCTIONS: int = 60
+# Perfil em execução: apenas uma tarefa é medida por vez (no Python 3.12+ o cProfile
+# usa sys.monitoring, que aceita um único profiler no processo).
+_ACTIVE_PROFILER: cProfile.Profile | None = None
+_ACTIVE_PROFILER_LOCK = threading.Lock()
+
+
+def is_profile_enabled(flag: bool | None = None) -> bool:
+    """
+    True se a requisição pediu o perfil (flag) ou se ORGANIZE_TASK_PROFILE=1.
+    """
+    if flag:
+        return True
+    return os.environ.get(ENV_TASK_PROFILE, '0').lower() in ('1', 'true', 'yes')
+
+
+def create_profile_report(profiler: cProfile.Profile, *, top: int = PROFILE_TOP_FUNCTIONS) -> str:
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    return stream.getvalue()
+
+
+def start_task_profile(enabled: bool) -> cProfile.Profile | None:
+    """
+    Inicia o cProfile na thread da tarefa, retorna None (sem custo) se o perfil
+    não foi pedido. Apenas a thread da tarefa é medida, o OCR feito no pool de
+    processos aparece como tempo de espera.
+
+    Se outra tarefa já estiver com o perfil ativo (ou o cProfile não puder ser
+    ativado), a tarefa continua sem perfil e retorna None.
+    """
+    global _ACTIVE_PROFILER
+    if not enabled:
+        return None
+    with _ACTIVE_PROFILER_LOCK:
+        if _ACTIVE_PROFILER is not None:
+            print('DEBUG: outra tarefa já está com o perfil ativo, tarefa executada sem perfil.')
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as err:
+            print(f'DEBUG: falha ao iniciar o perfil da tarefa: {err}')
+            return None
+        _ACTIVE_PROFILER = profiler
+    return profiler
+
+
+def stop_task_profile(profiler: cProfile.Profile | None) -> None:
+    """
+    Finaliza o perfil da tarefa e libera o perfil para a próxima (pode ser chamada mais de uma vez).
+    """
+    global _ACTIVE_PROFILER
+    if profiler is None:
+        return
+    profiler.disable()
+    with _ACTIVE_PROFILER_LOCK:
+        if _ACTIVE_PROFILER is profiler:
+            _ACTIVE_PROFILER = None
+
+
+def add_profile_to_zip(profiler: cProfile.Profile | None, zip_path: str) -> bool:
+    """
+    Finaliza o perfil e adiciona profile.txt (funções com maior tempo acumulado)
+    e profile.prof (estatísticas completas, para pstats/snakeviz) ao zip de resultado.
+    Uma falha no relatório não interrompe a tarefa.
+    """
+    if profiler is None:
+        return False
+    stop_task_profile(profiler)
+    try:
+        prof_path: str = os.path.join(os.path.dirname(zip_path), 'profile.prof')
+        profiler.dump_stats(prof_path)
+        with zipfile.ZipFile(zip_path, 'a', zipfile.ZIP_DEFLATED) as zipf:
+            zipf.writestr('profile.txt', create_profile_report(profiler))
+            zipf.write(prof_path, 'profile.prof')
+    except Exception as err:
+        print(f'DEBUG: falha ao adicionar o perfil ao zip: {err}')
+        return False
+    return True
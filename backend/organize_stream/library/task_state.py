@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Any
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+# Variáveis de ambiente para escolher onde o estado das tarefas é gravado.
+ENV_TASK_STATE: str = 'ORGANIZE_TASK_STATE'
+ENV_TASK_STATE_DB: str = 'ORGANIZE_TASK_STATE_DB'
+
+
+class TaskStateBackend(ABC):
+    """
+    Armazena o estado (progresso, caminho do zip, ...) de cada tarefa, identificada pelo task_id.
+    """
+
+    @abstractmethod
+    def get(self, task_id: str) -> dict[str, Any] | None:
+        """Retorna uma cópia do estado da tarefa ou None."""
+        pass
+
+    @abstractmethod
+    def set(self, task_id: str, state: dict[str, Any]) -> None:
+        """Cria/substitui o estado da tarefa."""
+        pass
+
+    @abstractmethod
+    def update(self, task_id: str, values: dict[str, Any]) -> None:
+        """
+        Atualiza apenas as chaves informadas, mantendo as demais. Se a tarefa não
+        existir (removida/expirada) nada é gravado.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, task_id: str) -> None:
+        pass
+
+    @abstractmethod
+    def keys(self) -> list[str]:
+        pass
+
+    def contains(self, task_id: str) -> bool:
+        return self.get(task_id) is not None
+
+
+class MemoryTaskState(TaskStateBackend):
+    """
+    Estado em um dicionário do processo atual (funciona com apenas um worker do uvicorn).
+    """
+
+    def __init__(self):
+        self.__states: dict[str, dict[str, Any]] = {}
+        self.__lock = threading.Lock()
+
+    def get(self, task_id: str) -> dict[str, Any] | None:
+        with self.__lock:
+            state = self.__states.get(task_id)
+            return None if state is None else dict(state)
+
+    def set(self, task_id: str, state: dict[str, Any]) -> None:
+        with self.__lock:
+            self.__states[task_id] = dict(state)
+
+    def update(self, task_id: str, values: dict[str, Any]) -> None:
+        with self.__lock:
+            state = self.__states.get(task_id)
+            if state is not None:
+                state.update(values)
+
+    def delete(self, task_id: str) -> None:
+        with self.__lock:
+            self.__states.pop(task_id, None)
+
+    def keys(self) -> list[str]:
+        with self.__lock:
+            return list(self.__states.keys())
+
+
+class SqliteTaskState(TaskStateBackend):
+    """
+    Estado gravado em um arquivo SQLite, compartilhado pelos processos (workers do
+    uvicorn) do mesmo servidor. Cada thread usa a própria conexão.
+    """
+
+    def __init__(self, db_path: str, *, timeout: float = 30):
+        self.db_path: str = db_path
+        self.timeout: float = timeout
+        self.__local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self.__connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS task_state ('
+                'task_id TEXT PRIMARY KEY, state TEXT NOT NULL, updated REAL NOT NULL)'
+            )
+
+    def __connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self.__local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self.__local.conn = conn
+        return conn
+
+    @staticmethod
+    def __dumps(state: dict[str, Any]) -> str:
+        return json.dumps(state, default=str)
+
+    def get(self, task_id: str) -> dict[str, Any] | None:
+        row = self.__connection().execute(
+            'SELECT state FROM task_state WHERE task_id = ?', (task_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def set(self, task_id: str, state: dict[str, Any]) -> None:
+        self.__connection().execute(
+            'INSERT OR REPLACE INTO task_state (task_id, state, updated) VALUES (?, ?, ?)',
+            (task_id, self.__dumps(state), time.time()),
+        )
+
+    def update(self, task_id: str, values: dict[str, Any]) -> None:
+        conn = self.__connection()
+        # BEGIN IMMEDIATE bloqueia outros escritores entre a leitura e a gravação.
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT state FROM task_state WHERE task_id = ?', (task_id,)).fetchone()
+            if row is not None:
+                state: dict[str, Any] = json.loads(row[0])
+                state.update(values)
+                conn.execute(
+                    'UPDATE task_state SET state = ?, updated = ? WHERE task_id = ?',
+                    (self.__dumps(state), time.time(), task_id),
+                )
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+
+    def delete(self, task_id: str) -> None:
+        self.__connection().execute('DELETE FROM task_state WHERE task_id = ?', (task_id,))
+
+    def keys(self) -> list[str]:
+        return [row[0] for row in self.__connection().execute('SELECT task_id FROM task_state')]
+
+
+class ProgressState(dict):
+    """
+    Dicionário do estado de uma tarefa que grava cada alteração (state[k] = v e
+    state.update(...)) no backend. As threads de processamento continuam usando
+    o estado como um dict comum.
+
+    Cada alteração também grava 'updated_at', usado pelo TaskReaper para
+    identificar as tarefas que pararam sem terminar.
+    """
+
+    def __init__(self, backend: TaskStateBackend, task_id: str, values: dict[str, Any] = None):
+        super().__init__(values if values is not None else {})
+        self.backend: TaskStateBackend = backend
+        self.task_id: str = task_id
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.update({key: value})
+
+    def update(self, *args, **kwargs) -> None:
+        values: dict[str, Any] = dict(*args, **kwargs)
+        values["updated_at"] = time.time()
+        super().update(values)
+        self.backend.update(self.task_id, values)
+
+
+_DEFAULT_BACKEND: TaskStateBackend | None = None
+_DEFAULT_BACKEND_LOCK = threading.Lock()
+
+
+def get_task_state_backend() -> TaskStateBackend:
+    """
+    Retorna o backend do estado das tarefas: ORGANIZE_TASK_STATE=memory (padrão) ou
+    sqlite, com o arquivo definido em ORGANIZE_TASK_STATE_DB.
+    """
+    global _DEFAULT_BACKEND
+    with _DEFAULT_BACKEND_LOCK:
+        if _DEFAULT_BACKEND is None:
+            kind: str = os.environ.get(ENV_TASK_STATE, 'memory').lower()
+            if kind == 'sqlite':
+                db_path = os.environ.get(
+                    ENV_TASK_STATE_DB, os.path.join(tempfile.gettempdir(), 'organize_stream', 'tasks.db')
+                )
+                _DEFAULT_BACKEND = SqliteTaskState(db_path)
+            else:
+                if kind != 'memory':
+                    print(f'DEBUG: {ENV_TASK_STATE}={kind} inválido, usando o estado em memória.')
+                _DEFAULT_BACKEND = MemoryTaskState()
+        return _DEFAULT_BACKEND
+
+
+def set_task_state_backend(backend: TaskStateBackend) -> None:
+    global _DEFAULT_BACKEND
+    with _DEFAULT_BACKEND_LOCK:
+        _DEFAULT_BACKEND = backend
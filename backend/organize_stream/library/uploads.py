@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import Any, Iterable
+import os
+import shutil
+import uuid
+import soup_files as sp
+from organize_stream.erros import UploadTooLargeError
+from organize_stream.library.task_dirs import create_task_dir, set_task_dir_active
+from organize_stream.metrics import UPLOAD_BYTES, UPLOAD_FILES, UPLOAD_REJECTED
+
+# Variável de ambiente com o limite (MB) dos arquivos enviados em cada requisição.
+ENV_UPLOAD_MAX_MB: str = 'ORGANIZE_UPLOAD_MAX_MB'
+# Tamanho dos blocos lidos do upload e gravados no disco.
+UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+
+
+def get_upload_max_bytes() -> int:
+    """
+    Limite total (bytes) dos arquivos de uma requisição, ORGANIZE_UPLOAD_MAX_MB (padrão 512).
+    """
+    return int(os.environ.get(ENV_UPLOAD_MAX_MB, '512')) * 1024 * 1024
+
+
+def get_upload_filename(filename: str | None, default: str) -> str:
+    """
+    Nome seguro para gravar o upload (sem diretórios informados pelo cliente).
+    """
+    if filename is None:
+        return default
+    name = os.path.basename(filename.replace('\\', '/')).strip()
+    if name in ('', '.', '..'):
+        return default
+    return name
+
+
+class UploadSpool(object):
+    """
+    Grava os arquivos enviados em uma requisição no disco, lendo blocos de
+    UPLOAD_CHUNK_SIZE, sem manter o arquivo inteiro na memória. Se o total
+    da requisição passar de max_bytes, o arquivo parcial é removido e
+    UploadTooLargeError é lançado (a rota responde com HTTP 413).
+    """
+
+    def __init__(
+                self,
+                spool_dir: sp.Directory, *,
+                max_bytes: int | None = None,
+                chunk_size: int = UPLOAD_CHUNK_SIZE,
+            ):
+        self.spool_dir: sp.Directory = spool_dir
+        self.max_bytes: int = max_bytes if max_bytes is not None else get_upload_max_bytes()
+        self.chunk_size: int = chunk_size
+        self.__total_bytes: int = 0
+        self.__files: list[sp.File] = []
+
+    @property
+    def total_bytes(self) -> int:
+        return self.__total_bytes
+
+    @property
+    def files(self) -> list[sp.File]:
+        return self.__files
+
+    def __get_output_path(self, filename: str) -> str:
+        self.spool_dir.mkdir()
+        output_path: str = self.spool_dir.join_file(filename).absolute()
+        # Arquivos com o mesmo nome recebem um sufixo numérico.
+        name, extension = os.path.splitext(filename)
+        count = 1
+        while os.path.exists(output_path):
+            output_path = self.spool_dir.join_file(f'{name}_{count}{extension}').absolute()
+            count += 1
+        return output_path
+
+    async def save(self, upload: Any, filename: str | None = None) -> sp.File:
+        """
+        Grava um UploadFile no diretório do spool e retorna o arquivo gravado.
+        """
+        if filename is None:
+            filename = get_upload_filename(upload.filename, f'arquivo_{len(self.__files) + 1}')
+        output_path: str = self.__get_output_path(filename)
+        file_bytes: int = 0
+        try:
+            with open(output_path, 'wb') as fp:
+                while True:
+                    chunk: bytes = await upload.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    file_bytes += len(chunk)
+                    self.__total_bytes += len(chunk)
+                    if self.__total_bytes > self.max_bytes:
+                        UPLOAD_REJECTED.inc()
+                        raise UploadTooLargeError(
+                            f'Os arquivos enviados passam do limite de {self.max_bytes // (1024 * 1024)} MB'
+                        )
+                    fp.write(chunk)
+        except Exception:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise
+        finally:
+            await upload.close()
+        UPLOAD_BYTES.inc(file_bytes)
+        UPLOAD_FILES.inc()
+        file = sp.File(output_path)
+        self.__files.append(file)
+        return file
+
+    async def save_all(self, uploads: Iterable[Any]) -> list[sp.File]:
+        """
+        Grava todos os uploads (ignorando os nulos) e retorna os arquivos na mesma ordem.
+        """
+        files: list[sp.File] = []
+        for upload in uploads:
+            if upload is None:
+                continue
+            files.append(await self.save(upload))
+        return files
+
+    def cleanup(self) -> None:
+        """
+        Remove o diretório do spool e os arquivos gravados.
+        """
+        shutil.rmtree(self.spool_dir.absolute(), ignore_errors=True)
+        self.__files.clear()
+        set_task_dir_active(os.path.basename(self.spool_dir.absolute()), False)
+
+
+def create_request_spool(*, max_bytes: int | None = None) -> UploadSpool:
+    """
+    Spool para as rotas que respondem na própria requisição (sem task_id), em um
+    diretório próprio dentro da raiz das tarefas (também coberto pelo TaskReaper).
+    """
+    name: str = f'req-{uuid.uuid4().hex}'
+    # O diretório fica marcado como em uso até UploadSpool.cleanup().
+    set_task_dir_active(name, True)
+    return UploadSpool(create_task_dir(name), max_bytes=max_bytes)
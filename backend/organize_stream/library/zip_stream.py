@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
+import io
+import zipfile
+
+
+class ZipStreamBuffer(io.RawIOBase):
+    """
+    Destino (sem seek) para o zipfile.ZipFile que acumula os bytes gravados até
+    serem retirados com take(). O ZipFile detecta que o destino não aceita seek
+    e grava cada entrada com descritor de dados, permitindo enviar o zip em partes.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.__chunks: list[bytes] = []
+        self.__position: int = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self.__chunks.append(chunk)
+        self.__position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self.__position
+
+    def take(self) -> bytes:
+        """
+        Retorna e descarta os bytes gravados desde a última chamada.
+        """
+        data: bytes = b''.join(self.__chunks)
+        self.__chunks.clear()
+        return data
+
+
+def iter_zip_stream(
+            entries: Iterable[tuple[str, bytes]], *,
+            compression: int = zipfile.ZIP_STORED,
+        ) -> Iterator[bytes]:
+    """
+    Gera o zip em partes, uma parte por entrada (nome, bytes), enquanto as entradas
+    são produzidas. Apenas a entrada atual fica na memória, use com StreamingResponse.
+    """
+    buffer = ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression) as zipf:
+        for name, data in entries:
+            zipf.writestr(name, data)
+            chunk: bytes = buffer.take()
+            if len(chunk) > 0:
+                yield chunk
+    # Diretório central do zip, gravado ao fechar o arquivo.
+    chunk = buffer.take()
+    if len(chunk) > 0:
+        yield chunk
+
+
+async def aiter_zip_stream(
+            entries: AsyncIterable[tuple[str, bytes]], *,
+            compression: int = zipfile.ZIP_STORED,
+        ) -> AsyncIterator[bytes]:
+    """
+    Igual a iter_zip_stream(), para entradas produzidas de forma assíncrona
+    (por exemplo, páginas geradas com RouteExecutor.run_blocking).
+    """
+    buffer = ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression) as zipf:
+        async for name, data in entries:
+            zipf.writestr(name, data)
+            chunk: bytes = buffer.take()
+            if len(chunk) > 0:
+                yield chunk
+    chunk = buffer.take()
+    if len(chunk) > 0:
+        yield chunk
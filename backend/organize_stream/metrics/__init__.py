@@ -0,0 +1,4 @@
+from .registry import (
+    Counter, Gauge, Histogram, MetricsRegistry, get_metrics_registry, counter, gauge, histogram,
+)
+from .stage_metrics import *
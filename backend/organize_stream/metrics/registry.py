@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from contextlib import ContextDecorator
+from typing import Iterable
+import bisect
+import math
+import threading
+import time
+
+# Limites (segundos) padrão dos histogramas de latência.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120,
+)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if len(labels) == 0:
+        return ''
+    items = ','.join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+    return '{' + items + '}'
+
+
+class _Metric(object):
+    """
+    Base das métricas: nome, descrição e valores separados pelos labels.
+    """
+
+    type_name: str = 'untyped'
+
+    def __init__(self, name: str, documentation: str, *, labelnames: Iterable[str] = ()):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labelnames: tuple[str, ...] = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels.keys()) != set(self.labelnames):
+            raise ValueError(f'{self.name} requer os labels {self.labelnames}, recebido: {tuple(labels.keys())}')
+        return tuple(f'{labels[name]}' for name in self.labelnames)
+
+    def _labels_dict(self, key: tuple[str, ...]) -> dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError()
+
+    def render(self) -> str:
+        lines: list[str] = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.type_name}',
+        ]
+        lines.extend(self._samples())
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+
+    type_name = 'counter'
+
+    def __init__(self, name: str, documentation: str, *, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames=labelnames)
+        self.__values: dict[tuple[str, ...], float] = {}
+        if len(self.labelnames) == 0:
+            self.__values[()] = 0
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError(f'{self.name} um contador não pode diminuir')
+        key = self._key(labels)
+        with self._lock:
+            self.__values[key] = self.__values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        with self._lock:
+            return self.__values.get(self._key(labels), 0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self.__values.items())
+        return [f'{self.name}{_format_labels(self._labels_dict(k))} {_format_value(v)}' for k, v in values]
+
+
+class Gauge(_Metric):
+
+    type_name = 'gauge'
+
+    def __init__(self, name: str, documentation: str, *, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames=labelnames)
+        self.__values: dict[tuple[str, ...], float] = {}
+        if len(self.labelnames) == 0:
+            self.__values[()] = 0
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.__values[key] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.__values[key] = self.__values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def get(self, **labels: str) -> float:
+        with self._lock:
+            return self.__values.get(self._key(labels), 0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self.__values.items())
+        return [f'{self.name}{_format_labels(self._labels_dict(k))} {_format_value(v)}' for k, v in values]
+
+
+class _HistogramTimer(ContextDecorator):
+    """
+    Mede o tempo de um bloco 'with' (ou de uma função decorada) no histograma.
+    """
+
+    def __init__(self, histogram: Histogram, labels: dict[str, str]):
+        self.histogram: Histogram = histogram
+        self.labels: dict[str, str] = labels
+        self.__start: float = 0
+
+    def _recreate_cm(self) -> _HistogramTimer:
+        # Usado como decorador, cada chamada (e cada thread) mede o próprio tempo.
+        return _HistogramTimer(self.histogram, self.labels)
+
+    def __enter__(self) -> _HistogramTimer:
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.histogram.observe(time.perf_counter() - self.__start, **self.labels)
+        return False
+
+
+class Histogram(_Metric):
+
+    type_name = 'histogram'
+
+    def __init__(
+                self, name: str, documentation: str, *,
+                labelnames: Iterable[str] = (),
+                buckets: Iterable[float] = DEFAULT_BUCKETS,
+            ):
+        super().__init__(name, documentation, labelnames=labelnames)
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        # Para cada combinação de labels: (contagem por bucket, soma, total).
+        self.__values: dict[tuple[str, ...], tuple[list[int], float, int]] = {}
+        if len(self.labelnames) == 0:
+            self.__values[()] = ([0] * len(self.buckets), 0.0, 0)
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total_sum, count = self.__values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            if idx < len(counts):
+                counts[idx] += 1
+            self.__values[key] = (counts, total_sum + value, count + 1)
+
+    def time(self, **labels: str) -> _HistogramTimer:
+        """
+        Uso: 'with HISTOGRAM.time():' ou '@HISTOGRAM.time()'.
+        """
+        self._key(labels)
+        return _HistogramTimer(self, labels)
+
+    def get_count(self, **labels: str) -> int:
+        with self._lock:
+            return self.__values.get(self._key(labels), ([], 0.0, 0))[2]
+
+    def get_sum(self, **labels: str) -> float:
+        with self._lock:
+            return self.__values.get(self._key(labels), ([], 0.0, 0))[1]
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self.__values.items())
+        lines: list[str] = []
+        for key, (counts, total_sum, count) in values:
+            labels = self._labels_dict(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(
+                    f'{self.name}_bucket{_format_labels({**labels, "le": _format_value(bound)})} {cumulative}'
+                )
+            lines.append(f'{self.name}_bucket{_format_labels({**labels, "le": "+Inf"})} {count}')
+            lines.append(f'{self.name}_sum{_format_labels(labels)} {_format_value(total_sum)}')
+            lines.append(f'{self.name}_count{_format_labels(labels)} {count}')
+        return lines
+
+
+class MetricsRegistry(object):
+    """
+    Conjunto de métricas do processo, exportadas no formato texto do Prometheus.
+    """
+
+    def __init__(self):
+        self.__metrics: dict[str, _Metric] = {}
+        self.__lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self.__lock:
+            if metric.name in self.__metrics:
+                raise ValueError(f'{__class__.__name__} métrica duplicada: {metric.name}')
+            self.__metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> _Metric | None:
+        with self.__lock:
+            return self.__metrics.get(name)
+
+    def render(self) -> str:
+        with self.__lock:
+            metrics = list(self.__metrics.values())
+        return '\n'.join(m.render() for m in metrics) + '\n'
+
+
+_DEFAULT_REGISTRY = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    return _DEFAULT_REGISTRY
+
+
+def counter(name: str, documentation: str, *, labelnames: Iterable[str] = ()) -> Counter:
+    return get_metrics_registry().register(Counter(name, documentation, labelnames=labelnames))
+
+
+def gauge(name: str, documentation: str, *, labelnames: Iterable[str] = ()) -> Gauge:
+    return get_metrics_registry().register(Gauge(name, documentation, labelnames=labelnames))
+
+
+def histogram(
+            name: str, documentation: str, *,
+            labelnames: Iterable[str] = (),
+            buckets: Iterable[float] = DEFAULT_BUCKETS,
+        ) -> Histogram:
+    return get_metrics_registry().register(
+        Histogram(name, documentation, labelnames=labelnames, buckets=buckets)
+    )
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Métricas das etapas do processamento (upload, renderização, OCR, nomes, zip e fila)
+e do pool de engines do tesseract.
+As métricas são do processo atual, com vários workers do uvicorn cada worker
+exporta os próprios valores.
+"""
+from __future__ import annotations
+from organize_stream.metrics.registry import counter, gauge, histogram
+
+UPLOAD_BYTES = counter(
+    'organize_upload_bytes_total', 'Bytes recebidos nos uploads gravados em disco.',
+)
+UPLOAD_FILES = counter(
+    'organize_upload_files_total', 'Arquivos recebidos nos uploads.',
+)
+UPLOAD_REJECTED = counter(
+    'organize_upload_rejected_total', 'Requisições recusadas por passar do limite de upload.',
+)
+RASTERIZE_SECONDS = histogram(
+    'organize_rasterize_seconds', 'Tempo para renderizar uma página do PDF em imagem.',
+)
+OCR_PAGE_SECONDS = histogram(
+    'organize_ocr_page_seconds', 'Tempo de OCR de uma página ou imagem.',
+    labelnames=('mode',),
+)
+READ_DOCUMENT_SECONDS = histogram(
+    'organize_read_document_seconds', 'Tempo total de read_document() por documento.',
+)
+PAGES_READ = counter(
+    'organize_pages_read_total', 'Páginas lidas, pela camada de texto ou pelo OCR.',
+    labelnames=('source',),
+)
+PAGES_ESCALATED = counter(
+    'organize_pages_escalated_total', 'Páginas lidas novamente com DPI maior (DPI adaptativo).',
+)
+NAMING_SECONDS = histogram(
+    'organize_naming_seconds', 'Tempo para gerar o novo nome de um arquivo.',
+    labelnames=('stage',),
+)
+ZIP_WRITE_SECONDS = histogram(
+    'organize_zip_write_seconds', 'Tempo para gravar o zip de resultado de uma tarefa.',
+    labelnames=('job',),
+)
+QUEUE_WAIT_SECONDS = histogram(
+    'organize_queue_wait_seconds', 'Tempo de espera das tarefas na fila de processamento.',
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+JOB_SECONDS = histogram(
+    'organize_job_seconds', 'Tempo de execução das tarefas da fila de processamento.',
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600),
+)
+ACTIVE_TASKS = gauge(
+    'organize_active_tasks', 'Tarefas em execução nos workers da fila.',
+)
+QUEUED_TASKS = gauge(
+    'organize_queued_tasks', 'Tarefas aguardando na fila de processamento.',
+)
+OCR_ENGINES = gauge(
+    'organize_ocr_engines', 'Engines do pool do tesseract: size (limite), created, in_use e idle.',
+    labelnames=('lang', 'tessdata', 'state'),
+)
+OCR_ENGINE_CALLS = counter(
+    'organize_ocr_engine_calls_total', 'Chamadas de OCR atendidas pelas engines do pool.',
+    labelnames=('lang', 'tessdata'),
+)
+OCR_ENGINE_WAITS = counter(
+    'organize_ocr_engine_waits_total', 'Chamadas que aguardaram uma engine livre no pool.',
+    labelnames=('lang', 'tessdata'),
+)
+OCR_ENGINE_WAIT_SECONDS = counter(
+    'organize_ocr_engine_wait_seconds_total', 'Tempo total de espera por uma engine livre.',
+    labelnames=('lang', 'tessdata'),
+)
+OCR_ENGINE_BUSY_SECONDS = counter(
+    'organize_ocr_engine_busy_seconds_total',
+    'Tempo total de uso das engines (utilização = taxa / organize_ocr_engines{state="size"}).',
+    labelnames=('lang', 'tessdata'),
+)
@@ -0,0 +1,7 @@
+from .engine_pool import (
+    MOD_TESSEROCR, TesseractEnginePool, get_engine_pool, get_ocr_engine_name, get_ocr_engine_version,
+)
+
+__all__ = [
+    'MOD_TESSEROCR', 'TesseractEnginePool', 'get_engine_pool', 'get_ocr_engine_name', 'get_ocr_engine_version',
+]
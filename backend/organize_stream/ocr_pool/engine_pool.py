@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Any, Iterator
+import os
+import shutil
+import subprocess
+import threading
+import time
+from organize_stream.utils import cs, sp
+from organize_stream.metrics import (
+    OCR_ENGINES, OCR_ENGINE_CALLS, OCR_ENGINE_WAITS, OCR_ENGINE_WAIT_SECONDS, OCR_ENGINE_BUSY_SECONDS,
+)
+
+try:
+    import tesserocr
+    MOD_TESSEROCR: bool = True
+except ImportError:
+    tesserocr = None
+    MOD_TESSEROCR: bool = False
+
+# Variáveis de ambiente do pool de engines do tesseract.
+ENV_OCR_ENGINE: str = 'ORGANIZE_OCR_ENGINE'
+ENV_OCR_ENGINE_POOL_SIZE: str = 'ORGANIZE_OCR_ENGINE_POOL_SIZE'
+
+
+class TesseractEnginePool(object):
+    """
+    Pool de engines do tesseract (tesserocr.PyTessBaseAPI) inicializadas uma única
+    vez, com os dados de idioma (traineddata) já carregados. Cada engine é usada por
+    apenas uma thread de cada vez, as engines livres são reutilizadas nas chamadas
+    seguintes (sem iniciar um processo do tesseract e sem arquivos temporários por página).
+
+    Implementa image_to_string() igual a ocr.RecognizeImage, pode ser usado como
+    'recognize' em read_image() e nas demais funções de leitura. A utilização é
+    exportada nas métricas organize_ocr_engine* (labels lang e tessdata).
+    """
+
+    def __init__(self, size: int | None = None, *, lang: str | None = None, tessdata_dir: str | None = None):
+        if not MOD_TESSEROCR:
+            raise ImportError(f'{__class__.__name__} requer o pacote tesserocr')
+        self.size: int = size if (size is not None) and (size > 0) else (os.cpu_count() or 1)
+        self.lang: str | None = lang
+        self.tessdata_dir: str | None = tessdata_dir
+        self.__idle: list[Any] = []
+        self.__created: int = 0
+        self.__in_use: int = 0
+        self.__cond = threading.Condition()
+        self.__closed: bool = False
+        # Contadores de utilização.
+        self.__calls: int = 0
+        self.__waits: int = 0
+        self.__wait_seconds: float = 0
+        self.__busy_seconds: float = 0
+        self.__started: float = time.monotonic()
+        self.__labels: dict[str, str] = {'lang': lang or '', 'tessdata': tessdata_dir or ''}
+        self.__update_gauges()
+
+    def __update_gauges(self) -> None:
+        # Chamado com o lock adquirido (ou no construtor).
+        OCR_ENGINES.set(self.size, state='size', **self.__labels)
+        OCR_ENGINES.set(self.__created, state='created', **self.__labels)
+        OCR_ENGINES.set(self.__in_use, state='in_use', **self.__labels)
+        OCR_ENGINES.set(len(self.__idle), state='idle', **self.__labels)
+
+    def __create_engine(self) -> Any:
+        kwargs: dict[str, Any] = {}
+        if self.lang is not None:
+            kwargs['lang'] = self.lang
+        if (self.tessdata_dir is not None) and os.path.isdir(self.tessdata_dir):
+            kwargs['path'] = self.tessdata_dir
+        return tesserocr.PyTessBaseAPI(**kwargs)
+
+    def __acquire(self, timeout: float | None) -> Any:
+        start = time.monotonic()
+        with self.__cond:
+            if self.__closed:
+                raise RuntimeError(f'{__class__.__name__} o pool foi fechado')
+            waited: bool = False
+            while (len(self.__idle) == 0) and (self.__created >= self.size):
+                waited = True
+                if not self.__cond.wait(timeout):
+                    raise TimeoutError(f'{__class__.__name__} nenhuma engine livre em {timeout}s')
+            if waited:
+                wait_seconds: float = time.monotonic() - start
+                self.__waits += 1
+                self.__wait_seconds += wait_seconds
+                OCR_ENGINE_WAITS.inc(**self.__labels)
+                OCR_ENGINE_WAIT_SECONDS.inc(wait_seconds, **self.__labels)
+            self.__in_use += 1
+            if len(self.__idle) > 0:
+                engine = self.__idle.pop()
+                self.__update_gauges()
+                return engine
+            # A engine é criada fora do lock (carregar o traineddata é lento).
+            self.__created += 1
+            self.__update_gauges()
+        try:
+            return self.__create_engine()
+        except Exception:
+            with self.__cond:
+                self.__created -= 1
+                self.__in_use -= 1
+                self.__update_gauges()
+                self.__cond.notify()
+            raise
+
+    def __release(self, engine: Any, busy_seconds: float) -> None:
+        with self.__cond:
+            self.__in_use -= 1
+            self.__calls += 1
+            self.__busy_seconds += busy_seconds
+            OCR_ENGINE_CALLS.inc(**self.__labels)
+            OCR_ENGINE_BUSY_SECONDS.inc(busy_seconds, **self.__labels)
+            if self.__closed:
+                self.__created -= 1
+                engine.End()
+            else:
+                self.__idle.append(engine)
+            self.__update_gauges()
+            self.__cond.notify()
+
+    @contextmanager
+    def engine(self, timeout: float | None = None) -> Iterator[Any]:
+        """
+        Empresta uma engine do pool, aguardando uma livre se todas estiverem em uso.
+        """
+        engine = self.__acquire(timeout)
+        start = time.monotonic()
+        try:
+            yield engine
+        finally:
+            engine.Clear()
+            self.__release(engine, time.monotonic() - start)
+
+    def image_to_string(self, img: cs.ImageObject | sp.File) -> str:
+        if isinstance(img, sp.File):
+            img = cs.ImageObject.create_from_file(img)
+        with self.engine() as engine:
+            engine.SetImage(img.to_pil())
+            return engine.GetUTF8Text()
+
+    @property
+    def stats(self) -> dict[str, float | int]:
+        """
+        Utilização do pool: engines criadas, em uso e livres, chamadas, esperas por
+        uma engine livre e fração do tempo em que as engines estiveram ocupadas.
+        """
+        with self.__cond:
+            elapsed = max(time.monotonic() - self.__started, 1e-9)
+            return {
+                'size': self.size,
+                'created': self.__created,
+                'in_use': self.__in_use,
+                'idle': len(self.__idle),
+                'calls': self.__calls,
+                'waits': self.__waits,
+                'wait_seconds': round(self.__wait_seconds, 6),
+                'busy_seconds': round(self.__busy_seconds, 6),
+                'utilization': round(self.__busy_seconds / (elapsed * self.size), 6),
+            }
+
+    def close(self) -> None:
+        """
+        Finaliza as engines livres, as que estão em uso são finalizadas ao serem devolvidas.
+        """
+        with self.__cond:
+            self.__closed = True
+            for engine in self.__idle:
+                engine.End()
+            self.__created -= len(self.__idle)
+            self.__idle.clear()
+            self.__update_gauges()
+            self.__cond.notify_all()
+
+
+# Versão da engine de OCR, a chave é (engine, binário do tesseract).
+_ENGINE_VERSIONS: dict[tuple[str, str], str] = {}
+_ENGINE_VERSIONS_LOCK = threading.Lock()
+
+
+def get_ocr_engine_name() -> str:
+    """
+    Engine usada por OcrImage.image_to_string() no processo atual: tesserocr ou pytesseract.
+    """
+    if MOD_TESSEROCR and (os.environ.get(ENV_OCR_ENGINE, 'tesserocr').lower() == 'tesserocr'):
+        return 'tesserocr'
+    return 'pytesseract'
+
+
+def get_ocr_engine_version(tesseract_cmd: str | None = None) -> str:
+    """
+    Versão do tesseract usado pela engine atual ('unknown' se não puder ser lida),
+    obtida uma única vez para cada binário.
+    """
+    engine: str = get_ocr_engine_name()
+    if (tesseract_cmd is None) or (tesseract_cmd == ''):
+        tesseract_cmd = shutil.which('tesseract') or ''
+    key: tuple[str, str] = (engine, tesseract_cmd)
+    with _ENGINE_VERSIONS_LOCK:
+        version: str | None = _ENGINE_VERSIONS.get(key)
+    if version is not None:
+        return version
+    version = 'unknown'
+    try:
+        if engine == 'tesserocr':
+            version = tesserocr.tesseract_version().splitlines()[0].strip()
+        elif tesseract_cmd != '':
+            proc = subprocess.run([tesseract_cmd, '--version'], capture_output=True, text=True, timeout=30)
+            # As versões antigas do tesseract escrevem a versão em stderr.
+            lines: list[str] = (proc.stdout or proc.stderr).splitlines()
+            if len(lines) > 0:
+                version = lines[0].strip()
+    except Exception as err:
+        print(f'DEBUG: falha ao ler a versão do tesseract: {err}')
+    with _ENGINE_VERSIONS_LOCK:
+        _ENGINE_VERSIONS[key] = version
+    return version
+
+
+# Pools do processo atual, a chave é (lang, tessdata_dir).
+_ENGINE_POOLS: dict[tuple[str | None, str | None], TesseractEnginePool] = {}
+_ENGINE_POOLS_LOCK = threading.Lock()
+
+
+def get_engine_pool(*, lang: str | None = None, tessdata_dir: str | None = None) -> TesseractEnginePool | None:
+    """
+    Retorna o pool de engines do processo atual para o idioma e o diretório tessdata
+    informados, ou None se o tesserocr não estiver instalado ou se
+    ORGANIZE_OCR_ENGINE=pytesseract. O pool é opcional: sem o pacote tesserocr (não
+    incluído em bin/requirements.txt) o OCR usa o pytesseract. O tamanho de cada
+    pool é definido em ORGANIZE_OCR_ENGINE_POOL_SIZE (padrão: número de CPUs).
+    """
+    if not MOD_TESSEROCR:
+        return None
+    if os.environ.get(ENV_OCR_ENGINE, 'tesserocr').lower() != 'tesserocr':
+        return None
+    key: tuple[str | None, str | None] = (lang, tessdata_dir)
+    with _ENGINE_POOLS_LOCK:
+        pool = _ENGINE_POOLS.get(key)
+        if pool is None:
+            size: str | None = os.environ.get(ENV_OCR_ENGINE_POOL_SIZE)
+            pool = TesseractEnginePool(int(size) if size else None, lang=lang, tessdata_dir=tessdata_dir)
+            _ENGINE_POOLS[key] = pool
+        return pool
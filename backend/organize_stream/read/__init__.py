@@ -1,10 +1,25 @@
 #!/usr/bin/env python3
 from __future__ import annotations
-from typing import Callable, Optional
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+from typing import Callable, Iterable, Iterator, Optional
+import multiprocessing
+import os
+import pickle
+import threading
+import time
 from organize_stream.utils import (
     cs, sp, sheet, ocr, HeadValues, ListColumnBody, HeadCell, ListString,
-    ColumnsTable, TableDocuments,
+    ColumnsTable, TableDocuments, fitz,
 )
+from organize_stream.ocr_pool import TesseractEnginePool, get_engine_pool
+from organize_stream.metrics import (
+    RASTERIZE_SECONDS, OCR_PAGE_SECONDS, READ_DOCUMENT_SECONDS, PAGES_READ, PAGES_ESCALATED,
+)
+
+# DPI adaptativo padrão dos extratores, ex: ORGANIZE_OCR_DPI_STEPS=150,300 (vazio = desativado).
+ENV_OCR_DPI_STEPS: str = 'ORGANIZE_OCR_DPI_STEPS'
 
 
 class OcrImage(ocr.RecognizeImage):
@@ -29,6 +44,97 @@ class OcrImage(ocr.RecognizeImage):
             super().__init__(bin_tess, lib_ocr=lib_ocr)
             self._initialized = True
 
+    @property
+    def engine_pool(self) -> TesseractEnginePool | None:
+        """
+        Pool de engines do tesserocr do processo atual (None se não estiver disponível).
+        """
+        return get_engine_pool(
+            lang=self.bin_tesseract.get_lang(), tessdata_dir=self.bin_tesseract.get_tessdata_dir(),
+        )
+
+    def image_to_string(self, img: cs.ImageObject | sp.File) -> str:
+        # Com o tesserocr instalado o texto é lido pelas engines já inicializadas,
+        # sem iniciar um processo do tesseract por imagem.
+        pool = self.engine_pool
+        if pool is None:
+            return super().image_to_string(img)
+        return pool.image_to_string(img)
+
+
+# Pools de processos compartilhados pelo OCR paralelo, a chave é o número de workers.
+_POOLS_OCR: dict[int, ProcessPoolExecutor] = {}
+_POOLS_OCR_LOCK = threading.Lock()
+# Páginas pendentes por worker no OCR paralelo, limita as imagens renderizadas na memória.
+PAGE_WINDOW_FACTOR: int = 2
+# Mínimo de letras/dígitos na camada de texto do PDF para dispensar o OCR da página.
+MIN_CHARS_TEXT_LAYER: int = 20
+# Fração mínima de palavras legíveis no texto do OCR, abaixo disso a página é lida com DPI maior.
+MIN_OCR_QUALITY: float = 0.5
+
+
+def get_default_dpi_steps() -> list[int] | None:
+    """
+    Retorna os valores de DPI adaptativo definidos em ORGANIZE_OCR_DPI_STEPS,
+    None se a variável não existir ou for inválida.
+    """
+    value: str = os.environ.get(ENV_OCR_DPI_STEPS, '').strip()
+    if value == '':
+        return None
+    try:
+        steps: list[int] = [int(v) for v in value.split(',') if v.strip() != '']
+    except ValueError:
+        print(f'DEBUG: {ENV_OCR_DPI_STEPS} inválido: {value}')
+        return None
+    return steps if len(steps) > 0 else None
+
+
+class OcrStats(object):
+    """
+    Contadores das páginas lidas: camada de texto, OCR e páginas que precisaram
+    de um novo OCR com DPI maior.
+    """
+
+    def __init__(self):
+        self.pages_text_layer: int = 0
+        self.pages_ocr: int = 0
+        self.pages_escalated: int = 0
+
+    def __repr__(self) -> str:
+        return f'{__class__.__name__}({self.to_dict()})'
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            'pages_text_layer': self.pages_text_layer,
+            'pages_ocr': self.pages_ocr,
+            'pages_escalated': self.pages_escalated,
+        }
+
+
+def get_pool_ocr(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Retorna o pool de processos usado para aplicar OCR nas páginas em paralelo.
+    O pool é criado uma única vez para cada número de workers e reutilizado
+    nas chamadas seguintes (os processos usam 'spawn' para não herdar as
+    threads do servidor).
+    """
+    with _POOLS_OCR_LOCK:
+        pool = _POOLS_OCR.get(max_workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+            _POOLS_OCR[max_workers] = pool
+        return pool
+
+
+def _discard_pool_ocr(max_workers: int) -> None:
+    with _POOLS_OCR_LOCK:
+        pool = _POOLS_OCR.pop(max_workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
 
 def update_column_table(tb: TableDocuments, *, name: ColumnsTable, new_value: str) -> TableDocuments:
     col = tb.get_column(name)
@@ -105,45 +211,457 @@ def read_image(img: cs.ImageObject, recognize: ocr.RecognizeImage = OcrImage())
         return tb
 
 
+class OcrRegion(object):
+    """
+    Região da página enviada ao OCR, em coordenadas relativas (0 a 1):
+    (esquerda, topo, direita, base).
+    """
+
+    def __init__(self, name: str, box: tuple[float, float, float, float]):
+        x0, y0, x1, y1 = box
+        if not ((0 <= x0 < x1 <= 1) and (0 <= y0 < y1 <= 1)):
+            raise ValueError(f'{__class__.__name__} região inválida: {name} {box}')
+        self.name: str = name
+        self.box: tuple[float, float, float, float] = box
+
+    def __repr__(self) -> str:
+        return f'{__class__.__name__}({self.name}, {self.box})'
+
+    def crop(self, img: cs.ImageObject) -> cs.ImageObject:
+        pil_img = img.to_pil()
+        width, height = pil_img.size
+        x0, y0, x1, y1 = self.box
+        return cs.ImageObject.create_from_pil(
+            pil_img.crop((int(x0 * width), int(y0 * height), int(x1 * width), int(y1 * height)))
+        )
+
+
+class OcrProfile(object):
+    """
+    Perfil de OCR de um tipo de documento com layout fixo: apenas as regiões
+    declaradas são enviadas ao tesseract. Pode ser usado como func_read_image
+    em DocumentTextExtract (também no OCR paralelo, pois pode ser serializado).
+    """
+
+    def __init__(self, name: str, regions: list[OcrRegion]):
+        if len(regions) == 0:
+            raise ValueError(f'{__class__.__name__} o perfil {name} não possui regiões.')
+        self.name: str = name
+        self.regions: list[OcrRegion] = regions
+
+    def __repr__(self) -> str:
+        # Usado na chave do cache de OCR, alterar as regiões invalida as entradas anteriores.
+        return f'{__class__.__name__}({self.name}, {self.regions})'
+
+    def __call__(self, img: cs.ImageObject, recognize: ocr.RecognizeImage = OcrImage()) -> TableDocuments:
+        return read_image_regions(img, recognize, regions=self.regions)
+
+
+def read_image_regions(
+            img: cs.ImageObject,
+            recognize: ocr.RecognizeImage = OcrImage(), *,
+            regions: list[OcrRegion],
+        ) -> TableDocuments:
+    """
+    Aplica OCR apenas nas regiões informadas e gera uma única tabela com as
+    linhas de todas as regiões, na ordem das regiões.
+    """
+    lines: list[str] = []
+    for region in regions:
+        try:
+            txt_region: str = recognize.image_to_string(region.crop(img))
+        except Exception as err:
+            print(f'DEBUG: falha no OCR da região {region.name} de: {img.metadata.file_path}\n{err}')
+            continue
+        lines.extend(txt_region.split('\n'))
+    try:
+        tb = TableDocuments.create_from_values(
+            lines,
+            file_path=img.metadata.file_path,
+            dir_path=img.metadata.dir_path,
+            file_type=img.metadata.extension,
+        )
+    except Exception as err:
+        print(f'DEBUG: falha ao tentar gerar a tabela de: {img.metadata.file_path}\n{err}')
+        return TableDocuments.create_void_dict()
+    return tb
+
+
+def _read_page_worker(
+            page_idx: int,
+            img_bytes: bytes,
+            metadata: sheet.MetaDataFile,
+            func_read_image: Callable[[cs.ImageObject, Optional[ocr.RecognizeImage]], TableDocuments],
+        ) -> tuple[int, TableDocuments, float]:
+    """
+    Executado no processo filho: reconstrói a imagem da página e aplica o OCR
+    com o OcrImage() do próprio processo. Retorna também o tempo do OCR, as
+    métricas são registradas no processo principal.
+    """
+    img = cs.ImageObject.create_from_bytes(img_bytes, lib_image=cs.LibImage.PIL)
+    img.metadata.name = metadata.name
+    img.metadata.file_path = metadata.file_path
+    start = time.perf_counter()
+    tb = func_read_image(img, OcrImage())
+    return page_idx, tb, time.perf_counter() - start
+
+
+def _is_picklable(obj: object) -> bool:
+    try:
+        pickle.dumps(obj)
+    except Exception:
+        return False
+    return True
+
+
+def _get_fitz_document(document: cs.DocumentPdf) -> fitz.Document:
+    if document.lib_pdf == cs.LibPDF.FITZ:
+        return document.get_real_document()
+    return fitz.Document(stream=document.to_bytes().getvalue(), filetype='pdf')
+
+
+def render_page(document: cs.DocumentPdf, page_idx: int, *, dpi: int = 200) -> bytes:
+    """
+    Renderiza apenas uma página do documento e retorna os bytes PNG da imagem.
+    """
+    with RASTERIZE_SECONDS.time():
+        pix: fitz.Pixmap = _get_fitz_document(document).load_page(page_idx).get_pixmap(dpi=dpi)
+        return pix.tobytes('png')
+
+
+def is_usable_text(text: str | None, *, min_chars: int = MIN_CHARS_TEXT_LAYER) -> bool:
+    """
+    Verifica se o texto extraído da camada de texto do PDF pode substituir o OCR:
+    precisa ter pelo menos min_chars letras/dígitos e poucos caracteres inválidos
+    (fontes sem mapeamento unicode geram '\ufffd').
+    """
+    if text is None:
+        return False
+    num_chars: int = sum(1 for c in text if c.isalnum())
+    if num_chars < min_chars:
+        return False
+    return text.count('\ufffd') < (num_chars * 0.1)
+
+
+def ocr_text_quality(tb: TableDocuments | None) -> float:
+    """
+    Estima a qualidade do texto gerado pelo OCR (0 a 1): fração das palavras com
+    pelo menos 2 caracteres e maioria de letras/dígitos. Imagens com resolução
+    baixa geram muitos símbolos soltos e palavras quebradas.
+    """
+    if (tb is None) or (tb.length == 0):
+        return 0.0
+    words: list[str] = ' '.join(tb.get_column(sheet.ColumnsTable.TEXT)).split()
+    if len(words) == 0:
+        return 0.0
+    num_good: int = 0
+    for w in words:
+        if (len(w) >= 2) and (sum(1 for c in w if c.isalnum()) * 2 > len(w)):
+            num_good += 1
+    return num_good / len(words)
+
+
+def is_good_ocr_table(tb: TableDocuments | None) -> bool:
+    """
+    Critério padrão para aceitar o OCR de uma página sem aumentar o DPI.
+    """
+    if (tb is None) or (tb.length == 0):
+        return False
+    if not is_usable_text(' '.join(tb.get_column(sheet.ColumnsTable.TEXT))):
+        return False
+    return ocr_text_quality(tb) >= MIN_OCR_QUALITY
+
+
+def read_page_text_layer(
+            document: cs.DocumentPdf, page_idx: int, *, min_chars: int = MIN_CHARS_TEXT_LAYER
+        ) -> TableDocuments | None:
+    """
+    Gera a tabela da página a partir do texto embutido no PDF, sem OCR.
+    Retorna None se a página não possuir texto utilizável (ex: páginas digitalizadas).
+    """
+    try:
+        text: str = _get_fitz_document(document).load_page(page_idx).get_text()
+    except Exception as err:
+        print(f'DEBUG: falha ao ler o texto da página {page_idx+1}: {err}')
+        return None
+    if not is_usable_text(text, min_chars=min_chars):
+        return None
+    metadata: sheet.MetaDataFile = document.metadata
+    return TableDocuments.create_from_values(
+        [line.strip() for line in text.split('\n')],
+        file_path=metadata.file_path,
+        dir_path=metadata.dir_path,
+        file_type=metadata.extension,
+    )
+
+
+def iter_pages_png(
+            document: cs.DocumentPdf, *, dpi: int = 200, pages: Iterable[int] | None = None,
+        ) -> Iterator[tuple[int, bytes]]:
+    """
+    Renderiza as páginas do documento uma de cada vez, gerando (índice, bytes PNG).
+    Apenas a página atual fica na memória, ao contrário de ConvertPdfToImages.to_images().
+
+    :param pages: índices das páginas a renderizar, se for None todas as páginas.
+    """
+    doc_fitz: fitz.Document = _get_fitz_document(document)
+    if pages is None:
+        pages = range(doc_fitz.page_count)
+    for page_idx in pages:
+        with RASTERIZE_SECONDS.time():
+            pix: fitz.Pixmap = doc_fitz.load_page(page_idx).get_pixmap(dpi=dpi)
+            png_bytes: bytes = pix.tobytes('png')
+        del pix
+        yield page_idx, png_bytes
+
+
+def iter_images(
+            document: cs.DocumentPdf, *, dpi: int = 200, pages: Iterable[int] | None = None,
+        ) -> Iterator[tuple[int, cs.ImageObject]]:
+    """
+    Gera (índice, ImageObject) para cada página, renderizando sob demanda.
+    """
+    metadata: sheet.MetaDataFile = document.metadata
+    for page_idx, png_bytes in iter_pages_png(document, dpi=dpi, pages=pages):
+        img = cs.ImageObject.create_from_bytes(png_bytes, lib_image=cs.LibImage.PIL)
+        img.metadata.name = metadata.name
+        img.metadata.file_path = metadata.file_path
+        yield page_idx, img
+
+
+def _read_page_at_dpi(
+            document: cs.DocumentPdf,
+            page_idx: int,
+            recognize: ocr.RecognizeImage,
+            func_read_image: Callable[[cs.ImageObject, Optional[ocr.RecognizeImage]], TableDocuments], *,
+            dpi: int,
+        ) -> TableDocuments | None:
+    metadata: sheet.MetaDataFile = document.metadata
+    try:
+        img = cs.ImageObject.create_from_bytes(render_page(document, page_idx, dpi=dpi), lib_image=cs.LibImage.PIL)
+        img.metadata.name = metadata.name
+        img.metadata.file_path = metadata.file_path
+        with OCR_PAGE_SECONDS.time(mode='escalated'):
+            return func_read_image(img, recognize)
+    except Exception as err:
+        print(f'DEBUG: falha no OCR da página {page_idx+1} com {dpi} DPI: {err}')
+        return None
+
+
+def _iter_tables_sequential(
+            document: cs.DocumentPdf,
+            recognize: ocr.RecognizeImage,
+            func_read_image: Callable[[cs.ImageObject, Optional[ocr.RecognizeImage]], TableDocuments], *,
+            dpi: int,
+            pages: Iterable[int] | None = None,
+        ) -> Iterator[tuple[int, TableDocuments | None]]:
+    for page_idx, img in iter_images(document, dpi=dpi, pages=pages):
+        with OCR_PAGE_SECONDS.time(mode='sequential'):
+            current_tb: TableDocuments = func_read_image(img, recognize)
+        del img
+        yield page_idx, current_tb
+
+
+def _iter_tables_parallel(
+            document: cs.DocumentPdf,
+            func_read_image: Callable[[cs.ImageObject, Optional[ocr.RecognizeImage]], TableDocuments], *,
+            dpi: int,
+            max_workers: int,
+            pages: Iterable[int] | None = None,
+        ) -> Iterator[tuple[int, TableDocuments | None]]:
+    """
+    Envia as páginas ao pool de processos à medida que são renderizadas, mantendo no
+    máximo max_workers * PAGE_WINDOW_FACTOR páginas pendentes. As tabelas são geradas
+    na ordem das páginas (None para as páginas que falharam).
+    """
+    pool: ProcessPoolExecutor = get_pool_ocr(max_workers)
+    metadata: sheet.MetaDataFile = document.metadata
+    max_pending: int = max_workers * PAGE_WINDOW_FACTOR
+    pending: deque[tuple[int, Future]] = deque()
+
+    def _next_result() -> tuple[int, TableDocuments | None]:
+        _idx, _fut = pending.popleft()
+        try:
+            _, _tb, _seconds = _fut.result()
+            OCR_PAGE_SECONDS.observe(_seconds, mode='parallel')
+            return _idx, _tb
+        except BrokenProcessPool as err:
+            print(f'DEBUG: o pool de OCR foi interrompido na página {_idx+1}: {err}')
+            _discard_pool_ocr(max_workers)
+        except Exception as err:
+            print(f'DEBUG: falha no OCR paralelo da página {_idx+1}: {err}')
+        return _idx, None
+
+    try:
+        for page_idx, png_bytes in iter_pages_png(document, dpi=dpi, pages=pages):
+            pending.append(
+                (page_idx, pool.submit(_read_page_worker, page_idx, png_bytes, metadata, func_read_image))
+            )
+            del png_bytes
+            if len(pending) >= max_pending:
+                yield _next_result()
+        while len(pending) > 0:
+            yield _next_result()
+    finally:
+        # O consumidor pode interromper a leitura antes do fim do documento.
+        for _, _fut in pending:
+            _fut.cancel()
+
+
+def _merge_page_tables(
+            text_tables: dict[int, TableDocuments],
+            page_tables: Iterator[tuple[int, TableDocuments | None]],
+        ) -> Iterator[tuple[int, TableDocuments | None]]:
+    """
+    Intercala as tabelas da camada de texto com as tabelas do OCR, na ordem das páginas.
+    """
+    text_pages: deque[int] = deque(sorted(text_tables.keys()))
+    for page_idx, current_tb in page_tables:
+        while (len(text_pages) > 0) and (text_pages[0] < page_idx):
+            _idx = text_pages.popleft()
+            yield _idx, text_tables.pop(_idx)
+        yield page_idx, current_tb
+    while len(text_pages) > 0:
+        _idx = text_pages.popleft()
+        yield _idx, text_tables.pop(_idx)
+
+
+def iter_document_tables(
+            document: cs.DocumentPdf,
+            recognize: ocr.RecognizeImage = OcrImage(), *,
+            dpi: int = 200,
+            func_read_image: Callable[[cs.ImageObject, Optional[ocr.RecognizeImage]], TableDocuments] = None,
+            max_workers: int = 1,
+            use_text_layer: bool = True,
+            dpi_steps: list[int] | None = None,
+            func_accept_page: Callable[[TableDocuments | None], bool] | None = None,
+            stats: OcrStats | None = None,
+        ) -> Iterator[TableDocuments]:
+    """
+    Aplica OCR página a página e gera a tabela de cada página, já com as colunas
+    TIPO_ARQUIVO e PÁGINA preenchidas. Páginas sem texto são ignoradas.
+
+    :param dpi_steps: DPI adaptativo, ex: [150, 300]. As páginas são lidas com o
+        primeiro valor (ignorando 'dpi') e apenas as páginas recusadas por
+        func_accept_page (padrão: is_good_ocr_table) são lidas novamente com os
+        valores seguintes, até serem aceitas. As páginas da camada de texto não
+        são reavaliadas.
+
+    :param stats: se informado, recebe a contagem das páginas lidas/reprocessadas.
+
+    :param use_text_layer: usa o texto embutido no PDF nas páginas que possuem
+        texto utilizável (PDFs digitais), apenas as demais páginas são renderizadas
+        e passam pelo OCR.
+
+    :param max_workers: número de processos usados no OCR. Com valores maiores que 1
+        as páginas são lidas em paralelo e geradas na ordem original; nesse modo
+        'recognize' não é enviado aos processos (cada um usa o próprio OcrImage())
+        e 'func_read_image' precisa ser uma função de módulo.
+    """
+    if func_read_image is None:
+        func_read_image = read_image
+    if (max_workers > 1) and (not _is_picklable(func_read_image)):
+        print(f'DEBUG: {func_read_image} não pode ser enviada ao pool de processos, usando OCR sequencial.')
+        max_workers = 1
+    if func_accept_page is None:
+        func_accept_page = is_good_ocr_table
+    if stats is None:
+        stats = OcrStats()
+    escalation_dpi: list[int] = []
+    if (dpi_steps is not None) and (len(dpi_steps) > 0):
+        dpi = dpi_steps[0]
+        escalation_dpi = list(dpi_steps[1:])
+
+    # Tabelas obtidas da camada de texto, as páginas restantes passam pelo OCR.
+    text_tables: dict[int, TableDocuments] = {}
+    ocr_pages: list[int] = list(range(document.lenght))
+    if use_text_layer:
+        for page_idx in ocr_pages:
+            _tb = read_page_text_layer(document, page_idx)
+            if _tb is not None:
+                text_tables[page_idx] = _tb
+        ocr_pages = [idx for idx in ocr_pages if idx not in text_tables]
+
+    page_tables: Iterator[tuple[int, TableDocuments | None]]
+    if len(ocr_pages) == 0:
+        page_tables = iter([])
+    elif (max_workers > 1) and (len(ocr_pages) > 1):
+        page_tables = _iter_tables_parallel(
+            document, func_read_image, dpi=dpi, max_workers=max_workers, pages=ocr_pages
+        )
+    else:
+        page_tables = _iter_tables_sequential(document, recognize, func_read_image, dpi=dpi, pages=ocr_pages)
+
+    text_pages: set[int] = set(text_tables.keys())
+    for page_pdf_idx, current_tb in _merge_page_tables(text_tables, page_tables):
+        if page_pdf_idx in text_pages:
+            stats.pages_text_layer += 1
+            PAGES_READ.inc(source='text_layer')
+        else:
+            stats.pages_ocr += 1
+            PAGES_READ.inc(source='ocr')
+            if (len(escalation_dpi) > 0) and (not func_accept_page(current_tb)):
+                stats.pages_escalated += 1
+                PAGES_ESCALATED.inc()
+                for next_dpi in escalation_dpi:
+                    _tb = _read_page_at_dpi(document, page_pdf_idx, recognize, func_read_image, dpi=next_dpi)
+                    if (_tb is not None) and (_tb.length > 0):
+                        current_tb = _tb
+                    if func_accept_page(current_tb):
+                        break
+        if (current_tb is None) or (current_tb.length == 0):
+            continue
+        current_tb = update_column_table(
+            current_tb, name=sheet.ColumnsTable.FILETYPE, new_value=document.metadata.extension
+        )
+        current_tb = update_column_table(
+            current_tb, name=sheet.ColumnsTable.NUM_PAGE, new_value=f'{page_pdf_idx+1}'
+        )
+        yield current_tb
+
+
 def read_document(
             document: cs.DocumentPdf,
             recognize: ocr.RecognizeImage = OcrImage(), *,
             pbar: sp.ProgressBarAdapter = sp.ProgressBarAdapter(),
             dpi: int = 200,
             func_read_image: Callable[[cs.ImageObject, Optional[ocr.RecognizeImage]], TableDocuments] = None,
+            max_workers: int = 1,
+            use_text_layer: bool = True,
+            dpi_steps: list[int] | None = None,
+            stats: OcrStats | None = None,
         ) -> TableDocuments:
     """
     Aplicar OCR em documento PDF e retornar uma tabela
     dos textos presentes no documento.
+
+    As páginas são renderizadas uma de cada vez (veja iter_document_tables), a
+    imagem de cada página é descartada assim que a sua tabela é gerada. Com
+    use_text_layer=True as páginas que já possuem texto embutido não passam pelo OCR.
+    Com dpi_steps as páginas com OCR ruim são lidas novamente com DPI maior.
     """
-    if func_read_image is None:
-        func_read_image = read_image
+    read_start: float = time.perf_counter()
     list_tables: list[TableDocuments] = []
     text_progress = sp.TextProgress()
     text_progress.pbar = pbar
     text_progress.start_pbar()
     text_progress.pbar.update(0, 'Iniciando a extração da tabela PDF')
-
-    convert = cs.ConvertPdfToImages.create(document)
-    convert.set_pbar(pbar)
-    images: list[cs.ImageObject] = convert.to_images(dpi=dpi)
-    text_progress.total = len(images)
+    text_progress.total = document.lenght
     text_progress.text = 'OCR PDF'
 
-    for page_pdf_idx, img in enumerate(images):
+    current_tb: TableDocuments
+    for current_tb in iter_document_tables(
+                document, recognize,
+                dpi=dpi,
+                func_read_image=func_read_image,
+                max_workers=max_workers,
+                use_text_layer=use_text_layer,
+                dpi_steps=dpi_steps,
+                stats=stats,
+            ):
         text_progress.set_update()
-        current_tb: TableDocuments = func_read_image(img, recognize)
-        if current_tb.length > 0:
-            current_tb = update_column_table(
-                current_tb, name=sheet.ColumnsTable.FILETYPE, new_value=document.metadata.extension
-            )
-            current_tb = update_column_table(
-                current_tb, name=sheet.ColumnsTable.NUM_PAGE, new_value=f'{page_pdf_idx+1}'
-            )
-            list_tables.append(current_tb)
+        list_tables.append(current_tb)
     text_progress.pbar.update(100, 'Extração finalizada!')
     text_progress.stop_pbar()
+    READ_DOCUMENT_SECONDS.observe(time.perf_counter() - read_start)
     return concat_tables(list_tables)
-
-
-
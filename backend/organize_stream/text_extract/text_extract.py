@@ -2,15 +2,54 @@
 from __future__ import annotations
 from typing import Callable, Optional
 from io import BytesIO
+import os
 from sheet_stream import TableDocuments, IterRows, ListItems
 from organize_stream.utils import ocr, cs, sp, sheet
 from organize_stream.type_utils import (
     NotifyTableExtract, TextProgress, DiskFile, ColumnsKeyFiles, DictKeyWordFiles,
 )
-from organize_stream.read import read_image, read_document, OcrImage, concat_tables
+from organize_stream.read import (
+    read_image, read_document, iter_document_tables, OcrImage, OcrStats, concat_tables,
+    update_column_table, is_good_ocr_table, get_default_dpi_steps,
+)
+from organize_stream.cache import OcrCache, get_default_ocr_cache
+from organize_stream.ocr_pool import get_ocr_engine_name, get_ocr_engine_version
+from organize_stream.metrics import OCR_PAGE_SECONDS
 import pandas as pd
 
 
+def get_content_bytes(file: DiskFile | cs.ImageObject | cs.DocumentPdf) -> bytes:
+    """
+    Retorna os bytes do arquivo/documento, usados para gerar a chave do cache de OCR.
+    """
+    if isinstance(file, bytes):
+        return file
+    elif isinstance(file, BytesIO):
+        return file.getvalue()
+    elif isinstance(file, str):
+        return sp.File(file).path.read_bytes()
+    elif isinstance(file, sp.File):
+        return file.path.read_bytes()
+    return file.to_bytes().getvalue()
+
+
+def update_table_origin(
+            tb: TableDocuments, metadata: sheet.MetaDataFile, *, update_dir: bool = True
+        ) -> TableDocuments:
+    """
+    Atualiza as colunas de origem (arquivo, nome, extensão e pasta) de uma tabela
+    recuperada do cache, pois o mesmo conteúdo pode ter sido enviado com outro nome.
+    """
+    tb = update_column_table(tb, name=sheet.ColumnsTable.FILE_PATH, new_value=metadata.file_path)
+    tb = update_column_table(
+        tb, name=sheet.ColumnsTable.FILE_NAME, new_value=os.path.basename(metadata.file_path)
+    )
+    tb = update_column_table(tb, name=sheet.ColumnsTable.FILETYPE, new_value=metadata.extension)
+    if update_dir:
+        tb = update_column_table(tb, name=sheet.ColumnsTable.DIR, new_value=metadata.dir_path)
+    return tb
+
+
 class DocumentTextExtract(NotifyTableExtract):
     """
 
@@ -23,6 +62,10 @@ class DocumentTextExtract(NotifyTableExtract):
         apply_threshold: bool = False,
         notify_observers: bool = True,
         func_read_image: Callable[[cs.ImageObject, Optional[ocr.RecognizeImage]], TableDocuments] = None,
+        max_workers: int = 1,
+        ocr_cache: OcrCache | None = None,
+        use_text_layer: bool = True,
+        dpi_steps: list[int] | None = None,
     ):
         super().__init__()
         if func_read_image is None:
@@ -36,6 +79,17 @@ class DocumentTextExtract(NotifyTableExtract):
         self.apply_threshold: bool = apply_threshold
         self.notify_observers: bool = notify_observers
         self.dpi: int = dpi
+        # DPI adaptativo nos PDFs, ex: [150, 300] (None = ORGANIZE_OCR_DPI_STEPS ou self.dpi). As páginas
+        # são lidas com o primeiro valor e apenas as páginas com OCR ruim usam os seguintes.
+        self.dpi_steps: list[int] | None = dpi_steps if dpi_steps is not None else get_default_dpi_steps()
+        # Contagem das páginas lidas pela camada de texto, OCR e com DPI aumentado.
+        self.stats: OcrStats = OcrStats()
+        # Número de processos usados no OCR das páginas PDF (1 = sequencial).
+        self.max_workers: int = max_workers
+        # Usa o texto embutido nos PDFs digitais, aplicando OCR apenas nas páginas sem texto.
+        self.use_text_layer: bool = use_text_layer
+        # Cache das tabelas já extraídas, se for None usa o cache padrão (quando ativo).
+        self.ocr_cache: OcrCache | None = ocr_cache if ocr_cache is not None else get_default_ocr_cache()
         self.__count_idx: int = 0
         self.text_progress: TextProgress = TextProgress()
         self.text_progress.set_pbar(sp.ProgressBarAdapter())
@@ -49,6 +103,10 @@ class DocumentTextExtract(NotifyTableExtract):
     def length(self) -> int:
         return self.__collection_tables.length
 
+    @property
+    def escalated_pages(self) -> int:
+        return self.stats.pages_escalated
+
     @property
     def pbar(self) -> sp.ProgressBarAdapter:
         return self.text_progress.get_pbar()
@@ -102,7 +160,7 @@ class DocumentTextExtract(NotifyTableExtract):
             image = cs.ImageObject(image, lib_image=cs.LibImage.OPENCV)
         if self.apply_threshold:
             image.set_threshold_black()
-        self.add_table(self._func_read_image(image, self.recognize_image))
+        self.add_table(self.read_image(image))
 
     def add_document(self, document: cs.DocumentPdf | sp.File | bytes | BytesIO) -> None:
         if isinstance(document, cs.DocumentPdf):
@@ -117,8 +175,7 @@ class DocumentTextExtract(NotifyTableExtract):
             _stream.add_document(document)
             _stream.thresold()
             document = _stream.to_document()
-        _tb = read_document(document, self.recognize_image, dpi=self.dpi, func_read_image=self._func_read_image)
-        self.add_table(_tb)
+        self.add_table(self.read_document(document))
 
     def to_table(self) -> TableDocuments:
         if len(self.__collection_tables) == 0:
@@ -134,26 +191,146 @@ class DocumentTextExtract(NotifyTableExtract):
         except Exception as e:
             print(f'Error: {e}')
 
+    def get_cache_key(self, content: bytes, *, is_document: bool) -> str:
+        """
+        Chave do cache: conteúdo do arquivo mais as configurações que alteram o resultado do OCR.
+        """
+        try:
+            lang = self.recognize_image.bin_tesseract.get_lang()
+        except Exception:
+            lang = None
+        try:
+            tesseract_cmd: str | None = self.recognize_image.bin_tesseract.get_tesseract().absolute()
+        except Exception:
+            tesseract_cmd = None
+        settings: dict[str, object] = {
+            'type': 'pdf' if is_document else 'image',
+            'threshold': self.apply_threshold,
+            'lang': lang,
+            # Resultados do tesserocr e do pytesseract (e de versões diferentes) não são compartilhados.
+            'engine': get_ocr_engine_name(),
+            'engine_version': get_ocr_engine_version(tesseract_cmd),
+            'func': getattr(self._func_read_image, '__qualname__', f'{self._func_read_image}'),
+        }
+        if is_document:
+            settings['dpi'] = self.dpi if self.dpi_steps is None else self.dpi_steps
+            settings['text_layer'] = self.use_text_layer
+        return OcrCache.create_key(content, **settings)
+
     def read_image(self, image: DiskFile | cs.ImageObject) -> TableDocuments:
+        cache_key: str | None = None
+        if self.ocr_cache is not None:
+            cache_key = self.get_cache_key(get_content_bytes(image), is_document=False)
         if isinstance(image, cs.ImageObject):
             pass
         else:
             image = cs.ImageObject(image)
-        return self._func_read_image(image, self.recognize_image)
 
-    def read_document(self, document: DiskFile | cs.DocumentPdf) -> TableDocuments:
+        if cache_key is not None:
+            cached_tb: TableDocuments | None = self.ocr_cache.get(cache_key)
+            if cached_tb is not None:
+                return update_table_origin(cached_tb, image.metadata)
+        with OCR_PAGE_SECONDS.time(mode='image'):
+            tb: TableDocuments = self._func_read_image(image, self.recognize_image)
+        if cache_key is not None:
+            self.ocr_cache.set(cache_key, tb)
+        return tb
+
+    def _get_cached_document(
+                self, document: DiskFile | cs.DocumentPdf
+            ) -> tuple[cs.DocumentPdf, str | None, TableDocuments | None]:
+        """
+        Converte a entrada em DocumentPdf e consulta o cache, retorna (documento, chave, tabela do cache).
+        """
+        cache_key: str | None = None
+        if self.ocr_cache is not None:
+            cache_key = self.get_cache_key(get_content_bytes(document), is_document=True)
         if isinstance(document, cs.DocumentPdf):
             pass
         elif isinstance(document, bytes):
             document = cs.DocumentPdf.create_from_bytes(BytesIO(document))
         else:
             document = cs.DocumentPdf(document)
-        return read_document(
+
+        if cache_key is not None:
+            cached_tb: TableDocuments | None = self.ocr_cache.get(cache_key)
+            if cached_tb is not None:
+                # As páginas renderizadas não possuem pasta de origem, mantém a coluna do cache.
+                return document, cache_key, update_table_origin(cached_tb, document.metadata, update_dir=False)
+        return document, cache_key, None
+
+    def read_document(self, document: DiskFile | cs.DocumentPdf) -> TableDocuments:
+        document, cache_key, cached_tb = self._get_cached_document(document)
+        if cached_tb is not None:
+            return cached_tb
+        tb: TableDocuments = read_document(
             document,
             self.recognize_image,
             dpi=self.dpi,
             pbar=self.pbar,
-            func_read_image=self._func_read_image
+            func_read_image=self._func_read_image,
+            max_workers=self.max_workers,
+            use_text_layer=self.use_text_layer,
+            dpi_steps=self.dpi_steps,
+            stats=self.stats,
         )
+        if cache_key is not None:
+            self.ocr_cache.set(cache_key, tb)
+        return tb
+
+    def read_document_until(
+                self,
+                document: DiskFile | cs.DocumentPdf,
+                func_stop: Callable[[TableDocuments], bool],
+            ) -> TableDocuments:
+        """
+        Lê o documento página a página e interrompe a leitura (sem OCR nas páginas
+        restantes) assim que func_stop(tabela_parcial) retornar True. A tabela
+        parcial contém todas as páginas lidas até o momento.
+
+        Apenas a tabela do documento completo é gravada no cache. Com DPI adaptativo,
+        a página também é lida novamente com DPI maior se a tabela parcial não
+        atender func_stop.
+        """
+        document, cache_key, cached_tb = self._get_cached_document(document)
+        if cached_tb is not None:
+            return cached_tb
+
+        list_tables: list[TableDocuments] = []
+        total_pages: int = document.lenght
+        tb: TableDocuments = TableDocuments.create_void_dict()
+        # Resultado de func_stop para a última versão avaliada da página atual.
+        page_stop: bool | None = None
 
+        def _accept_page(page_tb: TableDocuments | None) -> bool:
+            nonlocal page_stop
+            page_stop = None
+            if not is_good_ocr_table(page_tb):
+                return False
+            page_stop = func_stop(concat_tables(list_tables + [page_tb]))
+            return page_stop
 
+        current_tb: TableDocuments
+        for current_tb in iter_document_tables(
+                    document, self.recognize_image,
+                    dpi=self.dpi,
+                    func_read_image=self._func_read_image,
+                    max_workers=self.max_workers,
+                    use_text_layer=self.use_text_layer,
+                    dpi_steps=self.dpi_steps,
+                    func_accept_page=_accept_page,
+                    stats=self.stats,
+                ):
+            list_tables.append(current_tb)
+            tb = concat_tables(list_tables)
+            num_page: str = current_tb.get_column(sheet.ColumnsTable.NUM_PAGE)[0]
+            if total_pages > 0:
+                self.pbar.update((int(num_page) / total_pages) * 100, f'OCR PDF página {num_page}/{total_pages}')
+            if page_stop is None:
+                page_stop = func_stop(tb)
+            if page_stop:
+                return tb
+            page_stop = None
+        if cache_key is not None:
+            self.ocr_cache.set(cache_key, tb)
+        return tb
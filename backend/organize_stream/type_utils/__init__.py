@@ -2,6 +2,7 @@ from .observer import (
     Observer, NotifyProvider, ObserverTableExtraction, NotifyTableExtract
 )
 from .digitalized import DigitalizedDocument, FilterText, FilterData
+from .match_index import TextMatchIndex
 from .keyword_files import (
     DestFilePath, OriginFileName, EnumDigitalDoc, ColumnsKeyFiles,
     DictKeyWordFiles, DiskFile, DynamicFile, DictOriginInfo, DictOutputInfo, DictFileInfo
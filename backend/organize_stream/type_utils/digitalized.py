@@ -1,5 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+import re
 import pandas as pd
 from organize_stream.erros import TableFileEmptyError, ExtensionFileEmptyError
 from sheet_stream import (
@@ -7,6 +8,10 @@ from sheet_stream import (
     ListColumnBody
 )
 import soup_files as sp
+from .match_index import TextMatchIndex
+
+# Valores ignorados ao incluir as colunas da planilha no nome do arquivo.
+_NULL_CELL_VALUES: set[str] = {'nan', 'NaN', 'NaD', 'NaT', '', 'None'}
 
 
 class FilterText(object):
@@ -27,6 +32,43 @@ class FilterText(object):
         self.iqual: bool = iqual
         self.separator: str = separator
         self.key_words: list[str] = key_words
+        # Regex compilada (find_txt, case, iqual) -> padrão, recriada apenas se os atributos mudarem.
+        self.__compiled: tuple[tuple[str, bool, bool], re.Pattern | None] | None = None
+
+    @property
+    def patterns(self) -> list[str]:
+        """Padrões de find_txt, separados por '|'."""
+        if self.find_txt is None:
+            return []
+        return [p.strip() for p in self.find_txt.split('|') if p.strip()]
+
+    def get_matcher(self) -> re.Pattern | None:
+        """
+        Retorna a regex compilada com todos os padrões de find_txt (None se não houver
+        padrões válidos). Com iqual=True a linha inteira deve ser igual a um dos padrões
+        e com case=False maiúsculas/minúsculas são ignoradas.
+        """
+        _key = (self.find_txt, self.case, self.iqual)
+        if (self.__compiled is not None) and (self.__compiled[0] == _key):
+            return self.__compiled[1]
+
+        patterns: list[str] = self.patterns
+        matcher: re.Pattern | None = None
+        if len(patterns) > 0:
+            if self.iqual:
+                regex_pattern = '^(?:' + '|'.join(patterns) + ')$'
+            else:
+                regex_pattern = '(?:' + '|'.join(patterns) + ')'
+            matcher = re.compile(regex_pattern, 0 if self.case else re.IGNORECASE)
+        self.__compiled = (_key, matcher)
+        return matcher
+
+    def filter_lines(self, lines: list[str]) -> list[str]:
+        """Retorna as linhas que contêm algum dos padrões, na ordem original."""
+        matcher: re.Pattern | None = self.get_matcher()
+        if matcher is None:
+            return []
+        return [line for line in lines if matcher.search(line) is not None]
 
 
 class FilterData(object):
@@ -42,6 +84,77 @@ class FilterData(object):
         self.col_new_name: str = col_new_name
         self.cols_in_name: list[str] = cols_in_name
         self.src_df: pd.DataFrame = src_df.astype('str')
+        self.__values_find: list[str] | None = None
+        self.__values_new_name: list[str] | None = None
+        self.__match_index: TextMatchIndex | None = None
+        # Sufixo do nome de cada linha da planilha, composto pelas colunas cols_in_name.
+        self.__include_names: list[str | None] = self.__create_include_names()
+
+    def __create_include_names(self) -> list[str | None]:
+        num_rows: int = len(self.src_df.index)
+        if (self.cols_in_name is None) or (len(self.cols_in_name) == 0):
+            return [None] * num_rows
+        columns: list[list[str]] = []
+        for col in self.cols_in_name:
+            if col not in self.src_df.columns:
+                print(f'DEBUG: {__class__.__name__} a coluna {col} não existe na planilha.')
+                continue
+            columns.append(self.src_df[col].values.tolist())
+
+        include_names: list[str | None] = []
+        for idx in range(num_rows):
+            new_name = ''
+            for values in columns:
+                current_text = values[idx]
+                # Com o pandas 3 as células vazias continuam NaN (float) depois de astype('str').
+                if (current_text is None) or (f'{current_text}' in _NULL_CELL_VALUES):
+                    continue
+                new_name = f'{new_name}-{current_text}'
+            include_names.append(new_name if new_name != '' else None)
+        return include_names
+
+    def get_include_names(self, idx: int) -> str | None:
+        """
+        Retorna o sufixo do nome (valores de cols_in_name separados por '-') da linha idx.
+        """
+        if (idx < 0) or (idx >= len(self.__include_names)):
+            return None
+        return self.__include_names[idx]
+
+    def __get_column(self, col: str) -> list[str]:
+        try:
+            return self.src_df[col].astype('str').values.tolist()
+        except Exception as e:
+            print(e)
+            return []
+
+    @property
+    def values_find(self) -> list[str]:
+        """Valores da coluna col_find (lidos da planilha uma única vez)."""
+        if self.__values_find is None:
+            self.__values_find = self.__get_column(self.col_find)
+        return self.__values_find
+
+    @property
+    def values_new_name(self) -> list[str]:
+        """Valores da coluna col_new_name (lidos da planilha uma única vez)."""
+        if self.__values_new_name is None:
+            self.__values_new_name = self.__get_column(self.col_new_name)
+        return self.__values_new_name
+
+    @property
+    def match_index(self) -> TextMatchIndex:
+        """Índice dos valores de col_find, criado no primeiro uso."""
+        if self.__match_index is None:
+            self.__match_index = TextMatchIndex(self.values_find)
+        return self.__match_index
+
+    def find_rows(self, lines: list[str]) -> list[int]:
+        """
+        Retorna, em ordem crescente, as linhas da planilha cujo valor de col_find
+        está contido (sem diferenciar maiúsculas) em alguma linha do documento.
+        """
+        return self.match_index.find_sorted(lines)
 
 
 class DigitalizedDocument(ABC):
@@ -113,6 +226,14 @@ class DigitalizedDocument(ABC):
     def get_line_key(self) -> str:
         pass
 
+    def is_complete(self) -> bool:
+        """
+        True quando a tabela já contém todos os campos usados no nome de saída, a
+        leitura das páginas restantes pode ser interrompida sem mudar o nome. Os
+        documentos sem campos fixos retornam False e são lidos por inteiro.
+        """
+        return False
+
     def get_lines_keys(self) -> ArrayString:
         return self.tb.get_column(ColumnsTable.TEXT)
 
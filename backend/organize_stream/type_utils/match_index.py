@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+from collections import deque
+from typing import Iterable
+
+
+class TextMatchIndex(object):
+    """
+    Índice de vários padrões de texto (autômato Aho-Corasick), criado uma única vez.
+
+    Retorna os índices dos padrões que aparecem como substring em alguma das linhas
+    informadas, percorrendo cada linha uma única vez (em vez de testar padrão por padrão).
+    A comparação ignora maiúsculas/minúsculas, igual a ArrayString.contains(case=False).
+    Padrões vazios estão contidos em qualquer linha.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        # Cada nó: transições (char -> nó), link de falha e padrões que terminam no nó.
+        self.__goto: list[dict[str, int]] = [{}]
+        self.__fail: list[int] = [0]
+        self.__out: list[list[int]] = [[]]
+        # Índices dos padrões vazios.
+        self.__empty: list[int] = []
+        self.__length: int = 0
+        for idx, pattern in enumerate(patterns):
+            self.__length += 1
+            self.__add_pattern(idx, '' if pattern is None else f'{pattern}'.upper())
+        self.__build_links()
+
+    @property
+    def length(self) -> int:
+        return self.__length
+
+    def __add_pattern(self, idx: int, pattern: str) -> None:
+        if pattern == '':
+            self.__empty.append(idx)
+            return
+        node = 0
+        for char in pattern:
+            next_node = self.__goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.__goto)
+                self.__goto.append({})
+                self.__fail.append(0)
+                self.__out.append([])
+                self.__goto[node][char] = next_node
+            node = next_node
+        self.__out[node].append(idx)
+
+    def __build_links(self) -> None:
+        queue: deque[int] = deque(self.__goto[0].values())
+        while len(queue) > 0:
+            node = queue.popleft()
+            for char, child in self.__goto[node].items():
+                queue.append(child)
+                fail = self.__fail[node]
+                while (fail != 0) and (char not in self.__goto[fail]):
+                    fail = self.__fail[fail]
+                child_fail = self.__goto[fail].get(char, 0)
+                self.__fail[child] = child_fail if child_fail != child else 0
+                # Os padrões do link de falha também terminam neste nó.
+                self.__out[child].extend(self.__out[self.__fail[child]])
+
+    def find_all(self, lines: Iterable[str]) -> set[int]:
+        """
+        Retorna os índices de todos os padrões encontrados nas linhas.
+        """
+        found: set[int] = set()
+        has_lines: bool = False
+        goto, fail, out = self.__goto, self.__fail, self.__out
+        for line in lines:
+            if line is None:
+                continue
+            has_lines = True
+            node = 0
+            for char in f'{line}'.upper():
+                while (node != 0) and (char not in goto[node]):
+                    node = fail[node]
+                node = goto[node].get(char, 0)
+                if len(out[node]) > 0:
+                    found.update(out[node])
+        if has_lines:
+            found.update(self.__empty)
+        return found
+
+    def find_sorted(self, lines: Iterable[str]) -> list[int]:
+        """
+        Índices dos padrões encontrados em ordem crescente (o primeiro é o mesmo
+        que seria obtido testando os padrões um a um, na ordem original).
+        """
+        return sorted(self.find_all(lines))
@@ -9,6 +9,11 @@ import convert_stream as cs
 import ocr_stream as ocr
 import sheet_stream as sheet
 
+try:
+    import pymupdf as fitz
+except ImportError:
+    import fitz
+
 _remove_end_name: list[str] = ['-']
 _remove_start_name: list[str] = ['-']
 
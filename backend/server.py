@@ -5,14 +5,15 @@
 from __future__ import annotations
 import os
 import sys
-from fastapi import FastAPI, UploadFile, File
+from fastapi import FastAPI, UploadFile, File, Request
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import UploadFile, File
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi import Form
+from starlette.background import BackgroundTask
 import base64
-from typing import Any
+from typing import Any, AsyncIterator
 import uuid
 
 import io
@@ -22,7 +23,6 @@ import ocr_stream as ocr
 import soup_files as sp
 import pandas as pd
 import tempfile
-import threading
 import shutil
 from sheet_stream import ListItems
 
@@ -53,13 +53,32 @@ from organize_stream.library.common import (
     get_json_info, get_temp_dir 
 )
 from organize_stream.library.progress_route import (
-    create_progress_with_id, thread_images_to_pdfs, TASK_PROGRESS_STATE, router as progress_router,
+    create_progress_with_id, thread_images_to_pdfs, delete_progress_state, router as progress_router,
     get_id_progress_state, get_json_progress, thread_organize_documents,
-    thread_organize_documents_with_sheet,
+    thread_organize_documents_with_sheet, get_job_scheduler,
 )
+from organize_stream.erros import QueueFullError, UploadTooLargeError
+from organize_stream.library.task_dirs import create_task_dir, get_tasks_root, start_task_reaper
+from organize_stream.library.task_profile import is_profile_enabled
+from organize_stream.library.uploads import (
+    UploadSpool, create_request_spool, get_upload_filename, get_upload_max_bytes,
+)
+from organize_stream.library.zip_stream import aiter_zip_stream
+from organize_stream.library.route_executor import RouteExecutor, get_route_executor
+from organize_stream.library import route_jobs
+from organize_stream.metrics import UPLOAD_REJECTED, get_metrics_registry
+
+# Caminho do tesseract, ex: ORGANIZE_TESS_FILE=/opt/tesseract/bin/tesseract (ou o substituto
+# usado nos testes de carga, veja benchmarks/fake_tesseract.py).
+ENV_TESS_FILE: str = 'ORGANIZE_TESS_FILE'
 
-TESS_FILE: str | None = None
-if sp.KERNEL_TYPE == 'Linux':
+TESS_FILE: str | None = os.environ.get(ENV_TESS_FILE)
+if TESS_FILE is not None:
+    if not os.path.exists(TESS_FILE):
+        raise FileNotFoundError(f'Arquivo não encontrado: {TESS_FILE} ({ENV_TESS_FILE})')
+    # Os reconhecedores criados depois daqui usam o mesmo binário.
+    ocr.BinTesseract().set_tesseract(sp.File(TESS_FILE))
+elif sp.KERNEL_TYPE == 'Linux':
     TESS_FILE = '/usr/bin/tesseract'
     if not os.path.exists(TESS_FILE):
         raise FileNotFoundError(f'Arquivo não encontrado: {TESS_FILE}')
@@ -67,7 +86,7 @@ elif sp.KERNEL_TYPE == 'Windows':
     TESS_FILE = shutil.which('tesseract.exe')
 if TESS_FILE is None:
     raise FileNotFoundError(
-        f'tesseract.exe não encontrado em PATH, instale o tesseract ou defina um valor para TESS_FILE em {__file__}'
+        f'tesseract.exe não encontrado em PATH, instale o tesseract ou defina o caminho em {ENV_TESS_FILE}'
     )    
 
     
@@ -93,6 +112,101 @@ print(route_info)
 app.include_router(progress_router, prefix="") # Inclui o roteador de progresso
 
 
+# Margem do Content-Length para os cabeçalhos do multipart e os campos do formulário.
+UPLOAD_FORM_OVERHEAD: int = 1024 * 1024
+
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    # Rejeita antes de receber o corpo quando o cliente informa um tamanho acima do limite,
+    # os uploads sem Content-Length são limitados pelo UploadSpool.
+    content_length: str | None = request.headers.get('content-length')
+    if (content_length is not None) and content_length.isdigit():
+        if int(content_length) > get_upload_max_bytes() + UPLOAD_FORM_OVERHEAD:
+            UPLOAD_REJECTED.inc()
+            return upload_too_large_response(
+                UploadTooLargeError(f'Os arquivos enviados passam do limite de {get_upload_max_bytes() // (1024 * 1024)} MB')
+            )
+    return await call_next(request)
+
+
+@app.on_event("startup")
+async def startup_task_reaper():
+    # Remove os diretórios das tarefas expiradas (uploads e resultado.zip).
+    start_task_reaper()
+
+
+@app.on_event("shutdown")
+async def shutdown_route_executor():
+    get_route_executor().shutdown()
+
+
+def queue_full_response() -> JSONResponse:
+    return JSONResponse(
+        {"error": "A fila de processamento está cheia, tente novamente em alguns minutos."},
+        status_code=429,
+    )
+
+
+def submit_job(task_id: str, func, /, *args, **kwargs) -> dict[str, Any] | JSONResponse:
+    """
+    Envia a tarefa para a fila de processamento, retorna HTTP 429 se a fila estiver cheia.
+    """
+    try:
+        position: int = get_job_scheduler().submit(task_id, func, *args, **kwargs)
+    except QueueFullError as e:
+        print(f'DEBUG: {e}')
+        # Remove também os uploads já gravados no diretório da tarefa.
+        delete_progress_state(task_id)
+        shutil.rmtree(get_tasks_root().concat(task_id).absolute(), ignore_errors=True)
+        return queue_full_response()
+    return {"message": "Processamento iniciado", "task_id": task_id, "queue_position": position}
+
+
+def upload_too_large_response(err: UploadTooLargeError) -> JSONResponse:
+    return JSONResponse({"error": str(err)}, status_code=413)
+
+
+async def check_uploaded_files(
+            spool: UploadSpool, route: str, func_check, uploaded_files: list[sp.File],
+        ) -> JSONResponse | None:
+    """
+    Abre cada arquivo no executor antes da resposta em partes. Retorna HTTP 400 (e
+    remove os uploads) se algum arquivo for inválido, ou None se todos abriram.
+    """
+    executor: RouteExecutor = get_route_executor()
+    for f in uploaded_files:
+        try:
+            await executor.run_blocking(route, func_check, f.absolute())
+        except Exception as e:
+            print(f'DEBUG: arquivo inválido {f.basename()}: {e}')
+            spool.cleanup()
+            return JSONResponse({"error": f"Arquivo inválido: {f.basename()}"}, status_code=400)
+    return None
+
+
+def reject_task_upload(task_id: str, err: UploadTooLargeError) -> JSONResponse:
+    """
+    Remove o estado e o diretório da tarefa cujos uploads passaram do limite, retorna HTTP 413.
+    """
+    print(f'DEBUG: {err}')
+    delete_progress_state(task_id)
+    shutil.rmtree(get_tasks_root().concat(task_id).absolute(), ignore_errors=True)
+    return upload_too_large_response(err)
+
+
+# =============== ROTA MÉTRICAS ==================
+@app.get("/metrics")
+async def metrics():
+    """
+    Métricas das etapas do processamento no formato texto do Prometheus (por worker do uvicorn).
+    """
+    return PlainTextResponse(
+        get_metrics_registry().render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 # =============== ROTA DOWNLOAD ==================
 @app.get("/download/{task_id}")
 async def download_result(task_id: str):
@@ -101,15 +215,16 @@ async def download_result(task_id: str):
     if current_progress is None:
         return JSONResponse({"error": "Barra de progresso inválida ou vazia."}, status_code=400)
     
+    if current_progress.get("expired", False):
+        return JSONResponse({"error": "O resultado expirou e foi removido do servidor."}, status_code=410)
     if (not current_progress["done"]) or (not current_progress["zip_path"]):
         return JSONResponse({"error": "Arquivo ainda não está pronto"}, status_code=400)
 
     print(f'Baixando: {current_progress["zip_path"]}')
     zip_path = current_progress["zip_path"]
     
-    # Após o download, remove a tarefa do dicionário global para limpeza
-    if task_id in TASK_PROGRESS_STATE:
-        del TASK_PROGRESS_STATE[task_id]
+    # Após o download, remove a tarefa do estado compartilhado para limpeza
+    delete_progress_state(task_id)
         
     return StreamingResponse(
         open(zip_path, "rb"),
@@ -126,23 +241,32 @@ async def ocr_images(
     """
         Aplica OCR em imagens enviadas e retorna um ZIP com os PDFs resultantes.
     """
-    zip_buffer = io.BytesIO()
-    recognize_img = ocr.RecognizeImage(
-        ocr.BinTesseract(File(TESS_FILE))
-    )
-    with zipfile.ZipFile(zip_buffer, "w") as zipf:
-        for i, file in enumerate(files):
-            content = await file.read()
-            image = cs.ImageObject.create_from_bytes(content)
-            doc_pdf = recognize_img.image_recognize(image).to_document()
-            zipf.writestr(f"ocr_documento_{i + 1}.pdf", doc_pdf.to_bytes().getvalue())
-            del doc_pdf
-    zip_buffer.seek(0)
+    spool: UploadSpool = create_request_spool()
+    try:
+        uploaded_files: list[sp.File] = await spool.save_all(files)
+    except UploadTooLargeError as e:
+        spool.cleanup()
+        return upload_too_large_response(e)
+    executor: RouteExecutor = get_route_executor()
+
+    # As imagens são abertas antes da resposta, uma imagem inválida ainda retorna erro.
+    invalid = await check_uploaded_files(spool, 'rt_ocr', route_jobs.check_image, uploaded_files)
+    if invalid is not None:
+        return invalid
+
+    async def iter_documents_pdf() -> AsyncIterator[tuple[str, bytes]]:
+        # O OCR de cada imagem roda no executor, o loop continua livre para outras requisições.
+        for i, file in enumerate(uploaded_files):
+            pdf_bytes: bytes = await executor.run_blocking(
+                'rt_ocr', route_jobs.ocr_image_to_pdf, file.absolute(), TESS_FILE
+            )
+            yield f"ocr_documento_{i + 1}.pdf", pdf_bytes
 
     return StreamingResponse(
-        zip_buffer,
+        aiter_zip_stream(iter_documents_pdf()),
         media_type="application/zip",
         headers={"Content-Disposition": "attachment; filename=ocr_documents.zip"},
+        background=BackgroundTask(spool.cleanup),
     )
 
 
@@ -152,31 +276,35 @@ async def convert_pdfs(files: list[UploadFile] = File(...)):
     """
         Rota para converter PDFs em imagens
     """
-    final_list_imgs: list[cs.ImageObject] = []
-    for file in files:
-        file_bytes = await file.read()
-        tmp_doc = cs.DocumentPdf(io.BytesIO(file_bytes))
-        conv_pdf_to_images = cs.ConvertPdfToImages.create(tmp_doc)
-        current_imgs: list[cs.ImageObject] = conv_pdf_to_images.to_images()
-        final_list_imgs.extend(current_imgs)
-        current_imgs.clear()
-        del tmp_doc
-        del conv_pdf_to_images
-    
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w") as zipf:
-        # Compactar as imagens da lista em formato zip.
-        for n, img in enumerate(final_list_imgs):
-            _bytes_img: bytes = img.to_bytes().getvalue()
-            zipf.writestr(f"imagem_{n + 1}.png", _bytes_img)
-            del _bytes_img 
-    final_list_imgs.clear()
-    del final_list_imgs
-    zip_buffer.seek(0)
+    spool: UploadSpool = create_request_spool()
+    try:
+        uploaded_files: list[sp.File] = await spool.save_all(files)
+    except UploadTooLargeError as e:
+        spool.cleanup()
+        return upload_too_large_response(e)
+    executor: RouteExecutor = get_route_executor()
+
+    # Os documentos são abertos antes da resposta, um PDF inválido ainda retorna erro.
+    invalid = await check_uploaded_files(spool, 'rt_convert_pdf', route_jobs.count_pdf_pages, uploaded_files)
+    if invalid is not None:
+        return invalid
+
+    async def iter_images_png() -> AsyncIterator[tuple[str, bytes]]:
+        # Renderiza uma página por vez no executor (o PDF é aberto uma vez), cada imagem
+        # é enviada antes da próxima ser gerada.
+        num = 0
+        for file in uploaded_files:
+            async for png_bytes in executor.iter_blocking(
+                        'rt_convert_pdf', route_jobs.iter_pdf_pages_png, file.absolute(), route_jobs.CONVERT_PDF_DPI
+                    ):
+                num += 1
+                yield f"imagem_{num}.png", png_bytes
+
     return StreamingResponse(
-        zip_buffer,
+        aiter_zip_stream(iter_images_png()),
         media_type="application/zip",
         headers={"Content-Disposition": "attachment; filename=pdf-para-imagens.zip"},
+        background=BackgroundTask(spool.cleanup),
     )
 
 
@@ -187,28 +315,35 @@ async def split_pdf(files: list[UploadFile] = File(...)):
         Recebe uma lista de arquivos PDFs, converte cada página de cada
     PDF será convertida em arquivo PDF individual.
     """
-    pages: list[cs.PageDocumentPdf] = []
-    for file_pdf in files:
-        current_bytes = await file_pdf.read()
-        doc = cs.DocumentPdf(io.BytesIO(current_bytes))
-        pages.extend(doc.to_pages())
-        del doc
-
-    # Criar um ZIP em memória
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w") as zipf:
-        for i, page in enumerate(pages):
-            current_doc = cs.DocumentPdf.create_from_pages([page])
-            current_bytes = current_doc.to_bytes()
-            zipf.writestr(f"pag_{i + 1}.pdf", current_bytes.getvalue())
-            del current_doc
-            del current_bytes
-
-    zip_buffer.seek(0)
+    spool: UploadSpool = create_request_spool()
+    try:
+        uploaded_files: list[sp.File] = await spool.save_all(files)
+    except UploadTooLargeError as e:
+        spool.cleanup()
+        return upload_too_large_response(e)
+    executor: RouteExecutor = get_route_executor()
+
+    # Os documentos são abertos antes da resposta, um PDF inválido ainda retorna erro.
+    invalid = await check_uploaded_files(spool, 'rt_split_pdf', route_jobs.count_pdf_pages, uploaded_files)
+    if invalid is not None:
+        return invalid
+
+    async def iter_pages_pdf() -> AsyncIterator[tuple[str, bytes]]:
+        # Gera um PDF por página no executor (o PDF é aberto uma vez), o zip é enviado
+        # enquanto as páginas são geradas.
+        num = 0
+        for file in uploaded_files:
+            async for page_bytes in executor.iter_blocking(
+                        'rt_split_pdf', route_jobs.iter_split_pdf_pages, file.absolute()
+                    ):
+                num += 1
+                yield f"pag_{num}.pdf", page_bytes
+
     return StreamingResponse(
-        zip_buffer,
+        aiter_zip_stream(iter_pages_pdf()),
         media_type="application/zip",
         headers={"Content-Disposition": "attachment; filename=paginas_divididas.zip"},
+        background=BackgroundTask(spool.cleanup),
     )
 
 
@@ -220,43 +355,51 @@ async def join_pdfs(files: list[UploadFile] = File(...)):
     """
     # Nome do arquivo a ser baixado.
     output_filename = 'Documento-juntado.pdf'
-    collection_pages: cs.CollectionPagePdf = cs.CollectionPagePdf([])
-
-    for file in files:
-        pdf_bytes: bytes = await file.read()
-        _doc = cs.DocumentPdf(io.BytesIO(pdf_bytes))
-        collection_pages.add_pages(_doc.to_pages())
-        del _doc
-    new_doc = cs.DocumentPdf.create_from_pages(collection_pages)
+    spool: UploadSpool = create_request_spool()
+    try:
+        uploaded_files: list[sp.File] = await spool.save_all(files)
+    except UploadTooLargeError as e:
+        spool.cleanup()
+        return upload_too_large_response(e)
+
+    # O PDF final é gravado no diretório do spool e enviado a partir do disco.
+    output_path: str = await get_route_executor().run_blocking(
+        'rt_join_pdf',
+        route_jobs.join_pdfs_to_file,
+        [f.absolute() for f in uploaded_files],
+        spool.spool_dir.join_file(output_filename).absolute(),
+    )
     # Retornar como resposta HTTP
     return StreamingResponse(
-        new_doc.to_bytes(),
+        open(output_path, "rb"),
         media_type="application/pdf",
-        headers={"Content-Disposition": "attachment; filename={}".format(output_filename)}
+        headers={"Content-Disposition": "attachment; filename={}".format(output_filename)},
+        background=BackgroundTask(spool.cleanup),
     )
 
 
 # 05 =============== CONVERTER IMAGENS EM PDF ===============
 @app.post(f"/{route_info['rt_imgs_to_pdf']}")
 async def process_images(files: list[UploadFile] = File(...)):
+    if get_job_scheduler().is_full():
+        return queue_full_response()
     # 1. Gera um ID único para esta tarefa
     task_id = str(uuid.uuid4())
     # 2. Inicializa o estado de progresso para este ID
     create_progress_with_id(task_id)
     
     image_files: list[str] = []
+    spool = UploadSpool(create_task_dir(task_id).concat('uploads'))
 
-    # Salvar os uploads em arquivos temporários
-    for upload in files:
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".jpg")
-        content: bytes = await upload.read()
-        temp_file.write(content)
-        temp_file.close()
-        image_files.append(temp_file.name)
-    # Rodar conversão em thread
-    thread = threading.Thread(target=thread_images_to_pdfs, args=(image_files, task_id))
-    thread.start()
-    return {"message": "Processamento iniciado", "task_id": task_id}
+    # Salvar os uploads no diretório da tarefa
+    try:
+        for num, upload in enumerate(files):
+            uploaded: sp.File = await spool.save(upload, f'imagem_{num}.jpg')
+            image_files.append(uploaded.absolute())
+    except UploadTooLargeError as e:
+        return reject_task_upload(task_id, e)
+    # Rodar conversão na fila de processamento
+    return submit_job(task_id, thread_images_to_pdfs, image_files, task_id)
 
 
 # ===================== ROTA UNIFICADA PROCESSAR DOCUMENTOS =====================
@@ -267,14 +410,22 @@ async def organize_documents_with_sheet(
             images: list[UploadFile] = File(default=[]),
             file_sheet: UploadFile = File(default=None),
             column_name: str = Form(default=None),  
+            cols_in_name: str = Form(default=None),
+            profile: bool = Form(default=False),
         ):
     """
     Rota unificada para processar PDFs, imagens e renomear com base em uma planilha Excel.
+
+    cols_in_name: colunas da planilha separadas por vírgula, os valores são incluídos
+    no final do novo nome do arquivo.
+    profile: adiciona o relatório do cProfile da tarefa ao zip (ou ORGANIZE_TASK_PROFILE=1).
     """
+    if get_job_scheduler().is_full():
+        return queue_full_response()
     task_id = str(uuid.uuid4())
     progress_data = create_progress_with_id(task_id)
 
-    temp_dir: sp.Directory = sp.Directory(tempfile.mkdtemp())
+    temp_dir: sp.Directory = create_task_dir(task_id)
     progress_data.update({"current": 0, "total": 0, "done": False, "zip_path": None})
     list_files: list[UploadFile] = []
     list_files.extend(pdfs)
@@ -285,21 +436,17 @@ async def organize_documents_with_sheet(
     src_df: pd.DataFrame
     
     # Salvar todos os arquivos recebidos
+    spool = UploadSpool(temp_dir)
     try:
-        sheet_bytes: bytes = await file_sheet.read()
-        src_df: pd.DataFrame = ReadFileSheet(io.BytesIO(sheet_bytes), lib_sheet=LibSheet.EXCEL).get_dataframe()
-        for current_file in list_files:
-            if current_file is None:
-                continue
-            
-            file_name = current_file.filename
-            if file_name is None:
-                continue
-            
-            content: bytes = await current_file.read()
-            file_path: str = temp_dir.join_file(file_name).absolute()
-            with open(file_path, "wb") as f:
-                f.write(content)
+        # A planilha é removida após a leitura para não entrar na lista de documentos.
+        sheet_file: sp.File = await spool.save(file_sheet)
+        src_df: pd.DataFrame = ReadFileSheet(sheet_file, lib_sheet=LibSheet.EXCEL).get_dataframe()
+        os.remove(sheet_file.absolute())
+        await spool.save_all(
+            [f for f in list_files if (f is not None) and (f.filename is not None)]
+        )
+    except UploadTooLargeError as e:
+        return reject_task_upload(task_id, e)
     except Exception as e:
         progress_data.update({"done": True, "zip_path": None})
         print(f"[ERRO] Falha ao processar documentos: {e}")
@@ -311,6 +458,7 @@ async def organize_documents_with_sheet(
     df: pd.Dataframe: aponta para um dataframe com dados base para o filtro de dados
     col_find: str: coluna onde o texto deve ser filtrado
     col_new_name: str: coluna que aponta para o novo nome de arquivo.
+    cols_in_name: list[str]: colunas incluídas no final do novo nome.
     files: list[File]: aponta para uma lista de arquivos.
     output_dir: Directory: diretório destino dos arquivos.
     """
@@ -323,12 +471,12 @@ async def organize_documents_with_sheet(
         'df': src_df,
         'col_find': column_name,
         'col_new_name': column_name,
+        'cols_in_name': [c.strip() for c in cols_in_name.split(',') if c.strip() != ''] if cols_in_name else [],
         'files': files_path,
         'output_dir': temp_dir,
+        'profile': is_profile_enabled(profile),
     }
-    thread = threading.Thread(target=thread_organize_documents_with_sheet, kwargs=send_args)
-    thread.start()
-    return {"message": "Processamento iniciado", "task_id": task_id}
+    return submit_job(task_id, thread_organize_documents_with_sheet, **send_args)
     
     """
     except Exception as e:
@@ -351,6 +499,7 @@ async def organize_documents_with_pattern(
             images: list[UploadFile] = File(default=[]),
             pattern: str = Form(default=None), 
             digitalized_type: str = Form(default=None),
+            profile: bool = Form(default=False),
         ):
     """
     Rota alternativa usada quando o usuário digita um padrão de texto
@@ -358,12 +507,15 @@ async def organize_documents_with_pattern(
     Retorna um ZIP com os arquivos processados.
     
     :param document_type: CARTA/EPI/GERNÉRICO
+    :param profile: adiciona o relatório do cProfile da tarefa ao zip (ou ORGANIZE_TASK_PROFILE=1).
     """
     if not pattern:
         if not digitalized_type:
             e = "O parâmetro 'pattern' é obrigatório para documentos genéricos."
             print()
             return JSONResponse({"error": str(e)}, status_code=500)
+    if get_job_scheduler().is_full():
+        return queue_full_response()
 
     task_id = str(uuid.uuid4())
     progress_data = create_progress_with_id(task_id)
@@ -374,21 +526,27 @@ async def organize_documents_with_pattern(
     pdfs.extend(images)
     images.clear()
     input_files_document: ListItems[DictOriginInfo] = ListItems()
+    # Os arquivos ficam no diretório da tarefa, o processamento lê pelo caminho.
+    spool = UploadSpool(create_task_dir(task_id).concat('uploads'))
     try:
-        for document in pdfs:
+        for idx, document in enumerate(pdfs, start=1):
             if document is None:
                 continue
 
             file_name = document.filename
             if file_name is None:
                 continue
+            # Nomes sem arquivo (ex: '..' ou 'pasta/') são gravados como arquivo_<n>.
+            file_name = get_upload_filename(file_name, f'arquivo_{idx}{os.path.splitext(file_name)[1]}')
             current = DictOriginInfo()
             extension_file = f".{file_name.split('.')[-1]}"
             current.set_name(file_name.replace(extension_file, ''))
             current.set_filename_with_extension(file_name)
             current.set_extension(extension_file)
-            current.set_file_bytes(await document.read())
+            current.set_abspath(await spool.save(document, file_name))
             input_files_document.append(current)
+    except UploadTooLargeError as e:
+        return reject_task_upload(task_id, e)
     except Exception as e:
         print(e)
         return {"message": "Falha ao tentar ler os arquivos", "task_id": task_id}
@@ -399,10 +557,9 @@ async def organize_documents_with_pattern(
         'images': ListItems(),
         'pattern': pattern,
         'digitalized_type': digitalized_type,
+        'profile': is_profile_enabled(profile),
     }
-    thread = threading.Thread(target=thread_organize_documents, kwargs=send_args)
-    thread.start()
-    return {"message": "Processamento iniciado", "task_id": task_id}
+    return submit_job(task_id, thread_organize_documents, **send_args)
 
 
 
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Configuração comum dos testes (executar a partir de backend/: python -m pytest tests).
+
+O ocr_stream cria um RecognizeImage ao ser importado e exige o binário tesseract
+no PATH. Quando ele não está instalado, os testes usam o substituto do
+benchmarks/fake_tesseract.py (sem OCR real).
+"""
+from __future__ import annotations
+import os
+import shutil
+import sys
+import tempfile
+
+BACKEND_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+if shutil.which('tesseract') is None:
+    from benchmarks.fake_tesseract import create_script
+
+    _bin_dir: str = tempfile.mkdtemp(prefix='organize-tests-bin-')
+    create_script(_bin_dir)
+    os.environ['PATH'] = f"{_bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"
+
+# Sem cache de OCR compartilhado entre os testes.
+os.environ.setdefault('ORGANIZE_OCR_CACHE', '0')
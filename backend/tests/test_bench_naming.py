@@ -0,0 +1,61 @@
+from __future__ import annotations
+import math
+from benchmarks.bench_naming import (
+    MicroBench, bench_documents, bench_find_name, create_name_samples, create_table, scaling_exponent,
+)
+from benchmarks.synthetic import KIND_CARTA_CALCULO, KIND_EPI, KIND_GENERIC
+
+
+def _points(values: list[int], func) -> list[dict]:
+    return [{'value': v, 'seconds_per_op': {'p50': func(v)}} for v in values]
+
+
+def _quick_bench() -> MicroBench:
+    return MicroBench(repeat=1, min_time=0)
+
+
+def test_scaling_exponent():
+    sizes = [10, 100, 1000]
+    assert math.isclose(scaling_exponent(_points(sizes, lambda v: 2e-6 * v)), 1.0)
+    assert math.isclose(scaling_exponent(_points(sizes, lambda v: 1e-9 * v * v)), 2.0)
+    assert math.isclose(scaling_exponent(_points(sizes, lambda v: 5e-6)), 0.0, abs_tol=1e-12)
+    # Menos de dois pontos válidos (ou todos com o mesmo tamanho) não definem a curva.
+    assert scaling_exponent(_points([10], lambda v: 1e-6)) is None
+    assert scaling_exponent(_points([10, 10], lambda v: 1e-6)) is None
+    assert scaling_exponent(_points([0, 10], lambda v: 1e-6)) is None
+
+
+def test_micro_bench_reports_per_operation():
+    result = _quick_bench().run(lambda: None, ops=4)
+    assert result['loops'] >= 1
+    assert len(result['samples']) == 1
+    assert result['ops_per_sec'] > 0
+
+
+def test_synthetic_inputs_are_deterministic():
+    assert create_name_samples(32, count=3) == create_name_samples(32, count=3)
+    assert all(len(n) == 32 for n in create_name_samples(32, count=3))
+    for kind in (KIND_CARTA_CALCULO, KIND_EPI, KIND_GENERIC):
+        tb, key = create_table(kind, 40)
+        assert tb.length == 40
+        assert create_table(kind, 40)[1] == key
+
+
+def test_document_results_at_every_size():
+    # As linhas de preenchimento não podem esconder os campos do documento.
+    kinds = {'CartaCalculo': KIND_CARTA_CALCULO, 'FichaEpi': KIND_EPI, 'GenericDocument': KIND_GENERIC}
+    for case in bench_documents(_quick_bench(), [10, 200], seed=0):
+        kind = kinds[case['case'].split('.')[0]]
+        for p in case['points']:
+            assert p['result'] != 'None', case['case']
+            if case['case'].endswith(('get_line_key', '_get_value_with_str')):
+                assert create_table(kind, p['value'])[1] in p['result'], case['case']
+
+
+def test_find_name_result_does_not_depend_on_sheet_rows():
+    cases = bench_find_name(_quick_bench(), [1, 500], num_lines=20, seed=0)
+    lookups = [c for c in cases if c['case'].startswith('FindNameInnerData.get_new_name')]
+    assert len(lookups) == 3
+    for case in lookups:
+        results = [p['result'] for p in case['points']]
+        assert results[0] == results[1], case['case']
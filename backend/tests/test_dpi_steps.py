@@ -0,0 +1,18 @@
+from __future__ import annotations
+from organize_stream.read import ENV_OCR_DPI_STEPS, get_default_dpi_steps
+from organize_stream.text_extract import DocumentTextExtract
+
+
+def test_dpi_steps_from_env(monkeypatch):
+    monkeypatch.setenv(ENV_OCR_DPI_STEPS, '150, 300')
+    assert get_default_dpi_steps() == [150, 300]
+    assert DocumentTextExtract(notify_observers=False).dpi_steps == [150, 300]
+    # O valor informado no construtor tem prioridade.
+    assert DocumentTextExtract(notify_observers=False, dpi_steps=[200]).dpi_steps == [200]
+
+
+def test_dpi_steps_disabled_or_invalid(monkeypatch):
+    monkeypatch.delenv(ENV_OCR_DPI_STEPS, raising=False)
+    assert get_default_dpi_steps() is None
+    monkeypatch.setenv(ENV_OCR_DPI_STEPS, '150,alto')
+    assert get_default_dpi_steps() is None
@@ -0,0 +1,108 @@
+from __future__ import annotations
+from io import BytesIO
+try:
+    import pymupdf as fitz
+except ImportError:
+    import fitz
+import convert_stream as cs
+from organize_stream.document.create_name import CreateFileNames
+from organize_stream.metrics import NAMING_SECONDS
+from organize_stream.text_extract import DocumentTextExtract
+from organize_stream.type_utils import EnumDigitalDoc, FilterText
+
+
+def _create_document(pages: list[list[str]]) -> cs.DocumentPdf:
+    doc = fitz.open()
+    for lines in pages:
+        page = doc.new_page()
+        page.insert_text((72, 72), '\n'.join(lines), fontsize=11)
+    data = doc.tobytes()
+    doc.close()
+    return cs.DocumentPdf.create_from_bytes(BytesIO(data))
+
+
+def _pages_read(extractor: DocumentTextExtract) -> int:
+    return extractor.stats.pages_text_layer + extractor.stats.pages_ocr
+
+
+# A cidade está na primeira página e UC/TOI/medidor na segunda, a terceira não é necessária.
+_CARTA_PAGES: list[list[str]] = [
+    ['CARTA AO CLIENTE', 'LOCALIDADE GUAJARA MIRIM'],
+    ['UC 123456 TOI 987654', 'MEDIDOR A1B2C3'],
+    ['ANEXO SEM DADOS DO NOME'],
+]
+
+
+def _read_carta(*, early_exit: bool) -> tuple[str | None, int]:
+    extractor = DocumentTextExtract(notify_observers=False)
+    names = CreateFileNames(
+        extractor=extractor, lib_digitalized=EnumDigitalDoc.CARTA_CALCULO,
+        early_exit=early_exit, use_ocr_profile=False,
+    )
+    dest_info = names.read_document_table(_create_document(_CARTA_PAGES), '.pdf')[1]
+    name = None if dest_info is None else dest_info.get_filename_with_extension()
+    return name, _pages_read(extractor)
+
+
+def test_early_exit_keeps_full_carta_name():
+    full_name, full_pages = _read_carta(early_exit=False)
+    name, pages = _read_carta(early_exit=True)
+    assert full_pages == 3
+    assert name == full_name
+    assert 'GUAJARA MIRIM' in name
+    assert '123456' in name and '987654' in name and 'A1B2C3' in name
+    # A leitura termina na segunda página, quando todos os campos do nome foram encontrados.
+    assert pages == 2
+
+
+def test_generic_document_reads_all_pages():
+    extractor = DocumentTextExtract(notify_observers=False)
+    names = CreateFileNames(extractor=extractor, filters=FilterText('LOCALIDADE'), early_exit=True)
+    names.read_document_table(_create_document(_CARTA_PAGES), '.pdf')
+    assert _pages_read(extractor) == 3
+
+
+def test_ocr_profile_is_opt_in():
+    assert CreateFileNames(lib_digitalized=EnumDigitalDoc.CARTA_CALCULO).get_ocr_profile() is None
+
+
+def test_incomplete_profile_falls_back_to_full_page():
+    # O OCR das regiões (substituto do tesseract) não contém os campos da carta.
+    names = CreateFileNames(
+        extractor=DocumentTextExtract(notify_observers=False),
+        lib_digitalized=EnumDigitalDoc.CARTA_CALCULO,
+        use_ocr_profile=True,
+    )
+    assert names.get_ocr_profile() is not None
+    expected, _ = _read_carta(early_exit=True)
+    dest_info = names.read_document_table(_create_document(_CARTA_PAGES), '.pdf')[1]
+    assert dest_info is not None
+    assert dest_info.get_filename_with_extension() == expected
+
+
+def test_naming_metric_counts_one_call_per_document():
+    before = NAMING_SECONDS.get_count(stage='create_output_info')
+    _read_carta(early_exit=True)
+    assert NAMING_SECONDS.get_count(stage='create_output_info') == before + 1
+
+
+def test_early_exit_ignores_tol_after_toi():
+    # Comportamento documentado em CartaCalculo.is_complete: com o TOI encontrado o
+    # TOL não é exigido, então um TOL em uma página posterior não entra no nome.
+    pages = [
+        ['LOCALIDADE GUAJARA MIRIM', 'UC 123456 TOI 987654', 'MEDIDOR A1B2C3'],
+        ['TOL 555000 TERMO DE OCORRENCIA COMPLEMENTAR'],
+    ]
+    results: dict[bool, tuple[str, int]] = {}
+    for early_exit in (False, True):
+        extractor = DocumentTextExtract(notify_observers=False)
+        names = CreateFileNames(
+            extractor=extractor, lib_digitalized=EnumDigitalDoc.CARTA_CALCULO,
+            early_exit=early_exit, use_ocr_profile=False,
+        )
+        dest_info = names.read_document_table(_create_document(pages), '.pdf')[1]
+        results[early_exit] = (dest_info.get_filename_with_extension(), _pages_read(extractor))
+    assert '555000' in results[False][0]
+    assert results[False][1] == 2
+    assert '555000' not in results[True][0]
+    assert results[True][1] == 1
@@ -0,0 +1,23 @@
+from __future__ import annotations
+import pytest
+from organize_stream.metrics import OCR_ENGINES
+from organize_stream.ocr_pool import MOD_TESSEROCR, get_engine_pool
+from organize_stream.ocr_pool.engine_pool import ENV_OCR_ENGINE
+
+
+def test_pool_is_optional(monkeypatch):
+    monkeypatch.setenv(ENV_OCR_ENGINE, 'pytesseract')
+    assert get_engine_pool(lang='por') is None
+    if not MOD_TESSEROCR:
+        monkeypatch.delenv(ENV_OCR_ENGINE)
+        assert get_engine_pool(lang='por') is None
+
+
+@pytest.mark.skipif(not MOD_TESSEROCR, reason='tesserocr não instalado')
+def test_pool_per_lang_and_tessdata(monkeypatch):
+    monkeypatch.delenv(ENV_OCR_ENGINE, raising=False)
+    por = get_engine_pool(lang='por', tessdata_dir='/tmp/tessdata-a')
+    assert get_engine_pool(lang='por', tessdata_dir='/tmp/tessdata-a') is por
+    assert get_engine_pool(lang='eng', tessdata_dir='/tmp/tessdata-a') is not por
+    assert get_engine_pool(lang='por', tessdata_dir='/tmp/tessdata-b') is not por
+    assert OCR_ENGINES.get(lang='por', tessdata='/tmp/tessdata-a', state='size') == por.size
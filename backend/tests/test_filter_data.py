@@ -0,0 +1,34 @@
+from __future__ import annotations
+import pandas as pd
+from organize_stream.type_utils import FilterData
+
+
+def _filter_data(cols_in_name: list[str] | None) -> FilterData:
+    df = pd.DataFrame({
+        'UC': ['111', '222', '333'],
+        'NOME': ['ANA', 'BRUNO', 'CARLA'],
+        'CIDADE': ['PVH', None, 'ARIQUEMES'],
+        'LOTE': ['1', '2', ''],
+    })
+    return FilterData(df, col_find='UC', col_new_name='NOME', cols_in_name=cols_in_name)
+
+
+def test_include_names_skip_null_cells():
+    fd = _filter_data(['CIDADE', 'LOTE', 'NAO_EXISTE'])
+    assert fd.get_include_names(0) == '-PVH-1'
+    assert fd.get_include_names(1) == '-2'
+    assert fd.get_include_names(2) == '-ARIQUEMES'
+    assert fd.get_include_names(3) is None
+    assert fd.get_include_names(-1) is None
+
+
+def test_include_names_without_columns():
+    fd = _filter_data(None)
+    assert fd.get_include_names(0) is None
+
+
+def test_find_rows_in_document_lines():
+    fd = _filter_data([])
+    assert fd.values_new_name == ['ANA', 'BRUNO', 'CARLA']
+    assert fd.find_rows(['CARTA UC 333', 'REF 111']) == [0, 2]
+    assert fd.find_rows(['SEM UC']) == []
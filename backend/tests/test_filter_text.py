@@ -0,0 +1,62 @@
+from __future__ import annotations
+import pandas as pd
+import pytest
+from sheet_stream import ColumnsTable, TableDocuments
+from organize_stream import fmt_str_file
+from organize_stream.cartas import GenericDocument
+from organize_stream.type_utils import FilterText
+
+_LINES: list[str] = [
+    'PROTOCOLO 2024-001',
+    'protocolo 2024-002',
+    'Protocolo',
+    'CONTRATO: 555 / ANEXO',
+    'SEM RELACAO',
+    'contrato',
+    '',
+]
+
+_FIND_TXT: list[str] = ['PROTOCOLO', 'protocolo', 'PROTOCOLO|contrato', ' contrato | PROTOCOLO \\d+-\\d+ ']
+
+
+def _pandas_lines(lines: list[str], filters: FilterText) -> list[str]:
+    """Filtro anterior do GenericDocument, com str.contains do pandas."""
+    df = pd.DataFrame({ColumnsTable.TEXT: lines}).astype('str')
+    patterns = [p.strip() for p in filters.find_txt.split('|') if p.strip()]
+    if filters.iqual:
+        regex_pattern = '^(?:' + '|'.join(patterns) + ')$'
+    else:
+        regex_pattern = '(?:' + '|'.join(patterns) + ')'
+    mask = df[ColumnsTable.TEXT].str.contains(regex_pattern, case=filters.case, regex=True, na=False)
+    return df[mask][ColumnsTable.TEXT].tolist()
+
+
+def _pandas_name(lines: list[str], filters: FilterText) -> str | None:
+    names = [fmt_str_file(line.strip()) for line in _pandas_lines(lines, filters)]
+    names = [n for n in names if len(n) >= 4]
+    if len(names) == 0:
+        return None
+    output_name = ' '.join(names)
+    return output_name if len(output_name) >= 4 else None
+
+
+@pytest.mark.parametrize('find_txt', _FIND_TXT)
+@pytest.mark.parametrize('case', [False, True])
+@pytest.mark.parametrize('iqual', [False, True])
+def test_matcher_matches_pandas_filter(find_txt: str, case: bool, iqual: bool):
+    filters = FilterText(find_txt, case=case, iqual=iqual)
+    assert filters.filter_lines(_LINES) == _pandas_lines(_LINES, filters)
+
+    tb = TableDocuments.create_from_values(list(_LINES), file_path='doc.pdf', dir_path='.', file_type='.pdf')
+    document = GenericDocument(tb, filters=filters)
+    assert document._get_value_with_str(tb) == _pandas_name(_LINES, filters)
+
+
+def test_matcher_is_rebuilt_when_filter_changes():
+    filters = FilterText('PROTOCOLO')
+    matcher = filters.get_matcher()
+    assert filters.get_matcher() is matcher
+    filters.case = True
+    assert filters.get_matcher() is not matcher
+    assert filters.filter_lines(_LINES) == ['PROTOCOLO 2024-001']
+    assert FilterText(' | ').get_matcher() is None
@@ -0,0 +1,73 @@
+from __future__ import annotations
+import threading
+import time
+import uuid
+import pytest
+from organize_stream.erros import QueueFullError
+from organize_stream.library.progress_route import (
+    JobScheduler, create_progress_with_id, get_id_progress_state,
+)
+
+
+def _new_task() -> str:
+    task_id = f'test-{uuid.uuid4().hex}'
+    create_progress_with_id(task_id)
+    return task_id
+
+
+def _wait(func, timeout: float = 5.0) -> None:
+    end = time.monotonic() + timeout
+    while not func():
+        if time.monotonic() > end:
+            raise TimeoutError('condição não atendida')
+        time.sleep(0.01)
+
+
+def test_queue_is_fifo_and_limited():
+    scheduler = JobScheduler(1, max_queue=2)
+    release = threading.Event()
+    order: list[str] = []
+
+    def _job(name: str) -> None:
+        order.append(name)
+        release.wait(5)
+
+    first, second, third = _new_task(), _new_task(), _new_task()
+    scheduler.submit(first, _job, 'a')
+    _wait(lambda: scheduler.get_queue_position(first) == 0)
+    assert scheduler.submit(second, _job, 'b') == 1
+    assert scheduler.submit(third, _job, 'c') == 2
+    assert get_id_progress_state(third)['status'] == 'queued'
+    assert get_id_progress_state(third)['queue_position'] == 2
+    assert scheduler.is_full()
+    with pytest.raises(QueueFullError):
+        scheduler.submit(_new_task(), _job, 'd')
+
+    release.set()
+    _wait(lambda: get_id_progress_state(third)['status'] == 'finished')
+    assert order == ['a', 'b', 'c']
+    assert scheduler.queue_length == 0
+    assert scheduler.get_queue_position(first) is None
+
+
+def test_failed_job_is_marked_done():
+    scheduler = JobScheduler(1, max_queue=1)
+    task_id = _new_task()
+
+    def _fail() -> None:
+        raise RuntimeError('falha')
+
+    scheduler.submit(task_id, _fail)
+    _wait(lambda: get_id_progress_state(task_id)['status'] == 'finished')
+    assert get_id_progress_state(task_id)['done'] is True
+
+
+def test_task_id_and_func_are_positional_only():
+    scheduler = JobScheduler(1, max_queue=1)
+    with pytest.raises(TypeError):
+        scheduler.submit(task_id=_new_task(), func=lambda: None)
+
+
+def test_invalid_workers():
+    with pytest.raises(ValueError):
+        JobScheduler(0)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+import random
+from organize_stream.type_utils import TextMatchIndex
+
+
+def _naive_find(patterns: list[str], lines: list[str]) -> list[int]:
+    # Busca anterior: testa cada padrão em todas as linhas, sem diferenciar maiúsculas.
+    found: list[int] = []
+    if len(lines) == 0:
+        return found
+    for idx, pattern in enumerate(patterns):
+        if any(pattern.upper() in line.upper() for line in lines):
+            found.append(idx)
+    return found
+
+
+def test_finds_overlapping_patterns():
+    index = TextMatchIndex(['abc', 'bc', 'c', 'abcd', 'xyz'])
+    assert index.length == 5
+    assert index.find_sorted(['zABCz']) == [0, 1, 2]
+    assert index.find_sorted(['ab', 'cd']) == [2]
+
+
+def test_empty_pattern_and_empty_document():
+    index = TextMatchIndex(['', 'nome'])
+    assert index.find_sorted([]) == []
+    assert index.find_sorted(['outro texto']) == [0]
+
+
+def test_matches_naive_search():
+    rnd = random.Random(1234)
+    alphabet = 'abAB c'
+    for _ in range(300):
+        patterns = [''.join(rnd.choices(alphabet, k=rnd.randint(1, 4))) for _ in range(rnd.randint(1, 8))]
+        lines = [''.join(rnd.choices(alphabet, k=rnd.randint(0, 12))) for _ in range(rnd.randint(0, 4))]
+        assert TextMatchIndex(patterns).find_sorted(lines) == _naive_find(patterns, lines)
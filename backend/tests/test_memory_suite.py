@@ -0,0 +1,80 @@
+from __future__ import annotations
+import json
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+import pytest
+from benchmarks.memory_suite import (
+    CASE_JOIN, CASE_SPLIT, DEFAULT_BUDGETS, ENV_MEMORY_BUDGETS, EXIT_BUDGET, BodySink, MemorySuite,
+    get_budgets, parse_budgets,
+)
+
+BACKEND_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_MB: int = 1024 * 1024
+
+
+def test_parse_budgets():
+    assert parse_budgets('join=64:256, split=:128,ocr=8') == {
+        'join': (64.0, 256.0), 'split': (None, 128.0), 'ocr': (8.0, None),
+    }
+    assert parse_budgets('') == {}
+    for value in ('join', 'nao_existe=1:2', 'join=abc'):
+        with pytest.raises(ValueError):
+            parse_budgets(value)
+
+
+def test_budget_overrides(monkeypatch):
+    monkeypatch.setenv(ENV_MEMORY_BUDGETS, 'join=1:2,split=3:4')
+    budgets = get_budgets(['split=5:'])
+    assert budgets[CASE_JOIN] == (1.0, 2.0)
+    # --budget tem prioridade sobre a variável de ambiente.
+    assert budgets[CASE_SPLIT] == (5.0, None)
+    assert budgets['ocr'] == DEFAULT_BUDGETS['ocr']
+
+
+def test_check_budget():
+    suite = MemorySuite(SimpleNamespace(), '.', {CASE_JOIN: (10, 20), CASE_SPLIT: (None, None)})
+    probe = SimpleNamespace(traced_peak_bytes=11 * _MB, rss_growth_bytes=20 * _MB)
+    failures = suite.check_budget(CASE_JOIN, probe)
+    assert len(failures) == 1 and failures[0].startswith('tracemalloc')
+    probe.rss_growth_bytes = 21 * _MB
+    assert len(suite.check_budget(CASE_JOIN, probe)) == 2
+    assert suite.check_budget(CASE_SPLIT, probe) == []
+    # Medidas indisponíveis (ex: sem tracemalloc) não são comparadas.
+    assert suite.check_budget(CASE_JOIN, SimpleNamespace(traced_peak_bytes=None, rss_growth_bytes=None)) == []
+
+
+def test_body_sink_keeps_only_the_head():
+    sink = BodySink()
+    for chunk in (b'PK', b'\x03\x04abcdef', b'x' * 100):
+        sink(chunk)
+    assert sink.size == 110
+    assert sink.head == b'PK\x03\x04abcd'
+
+
+def _run_suite(tmp_path, *args: str) -> tuple[int, list[dict]]:
+    output = str(tmp_path / 'memory.json')
+    proc = subprocess.run(
+        [
+            sys.executable, '-m', 'benchmarks.memory_suite', '--cases', 'join,split',
+            '--join-files', '3', '--join-pages', '2', '--split-pages', '3',
+            '--workdir', str(tmp_path / 'work'), '--output', output, *args,
+        ],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=300,
+    )
+    with open(output, encoding='utf-8') as f:
+        return proc.returncode, json.load(f)['results']
+
+
+def test_join_and_split_cases_pass(tmp_path):
+    code, results = _run_suite(tmp_path)
+    assert [(r['case'], r['ok'], r['status']) for r in results] == [('join', True, 200), ('split', True, 200)]
+    assert code == 0
+
+
+def test_exceeded_budget_exits_with_budget_code(tmp_path):
+    code, results = _run_suite(tmp_path, '--budget', 'join=0.0001')
+    assert code == EXIT_BUDGET
+    assert results[0]['failures'] != []
+    assert results[1]['failures'] == []
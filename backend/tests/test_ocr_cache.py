@@ -0,0 +1,106 @@
+from __future__ import annotations
+import soup_files as sp
+from sheet_stream import ColumnsTable, TableDocuments
+from organize_stream.cache.ocr_cache import OcrCache
+
+
+def _table(text: str) -> TableDocuments:
+    return TableDocuments.create_from_values([text], page_num='1', file_path='doc.pdf', dir_path='.', file_type='.pdf')
+
+
+def test_set_and_get_round_trip(tmp_path):
+    cache = OcrCache(sp.Directory(str(tmp_path)))
+    key = OcrCache.create_key(b'pagina', dpi=300, lang='por')
+    assert cache.get(key) is None
+    cache.set(key, _table('PROTOCOLO 123'))
+    tb = cache.get(key)
+    assert tb is not None
+    assert list(tb[ColumnsTable.TEXT]) == ['PROTOCOLO 123']
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_key_depends_on_settings():
+    assert OcrCache.create_key(b'x', dpi=300) != OcrCache.create_key(b'x', dpi=200)
+    assert OcrCache.create_key(b'x', dpi=300, lang='por') == OcrCache.create_key(b'x', lang='por', dpi=300)
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = OcrCache(sp.Directory(str(tmp_path)), max_bytes=1)
+    cache.set('a', _table('A' * 100))
+    cache.set('b', _table('B' * 100))
+    # Acima do limite fica só a entrada mais recente.
+    assert cache.length == 1
+    assert cache.get('a') is None
+    assert cache.get('b') is not None
+    assert cache.stats()['evictions'] == 1
+    assert not (tmp_path / 'a.json').exists()
+
+
+def test_get_moves_entry_to_end(tmp_path):
+    cache = OcrCache(sp.Directory(str(tmp_path)))
+    cache.set('a', _table('A' * 100))
+    cache.set('b', _table('B' * 100))
+    size_one = cache.total_bytes // 2
+    cache.max_bytes = size_one * 2 + size_one // 2
+    cache.get('a')
+    cache.set('c', _table('C' * 100))
+    # 'b' é a menos usada depois da leitura de 'a'.
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+
+
+def test_reloads_entries_from_disk(tmp_path):
+    cache = OcrCache(sp.Directory(str(tmp_path)))
+    cache.set('a', _table('A'))
+    other = OcrCache(sp.Directory(str(tmp_path)))
+    assert other.length == 1
+    assert other.get('a') is not None
+
+
+def _reset_default_cache(monkeypatch):
+    import organize_stream.cache.ocr_cache as cache_mod
+    monkeypatch.setattr(cache_mod, '_DEFAULT_CACHE', None)
+    monkeypatch.setenv('ORGANIZE_OCR_CACHE', '1')
+    return cache_mod
+
+
+def test_default_dir_is_private(tmp_path, monkeypatch):
+    cache_mod = _reset_default_cache(monkeypatch)
+    monkeypatch.delenv('ORGANIZE_OCR_CACHE_DIR', raising=False)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    cache = cache_mod.get_default_ocr_cache()
+    assert cache is not None
+    cache_dir = tmp_path / 'organize_stream' / 'ocr_cache'
+    assert cache.cache_dir.absolute() == str(cache_dir)
+    assert (cache_dir.stat().st_mode & 0o777) == 0o700
+
+
+def test_writable_dir_disables_cache(tmp_path, monkeypatch):
+    cache_mod = _reset_default_cache(monkeypatch)
+    shared = tmp_path / 'shared'
+    shared.mkdir()
+    shared.chmod(0o777)
+    monkeypatch.setenv('ORGANIZE_OCR_CACHE_DIR', str(shared))
+    assert cache_mod.get_default_ocr_cache() is None
+
+
+def test_readable_dir_is_restricted(tmp_path, monkeypatch):
+    cache_mod = _reset_default_cache(monkeypatch)
+    own = tmp_path / 'own'
+    own.mkdir()
+    own.chmod(0o755)
+    monkeypatch.setenv('ORGANIZE_OCR_CACHE_DIR', str(own))
+    assert cache_mod.get_default_ocr_cache() is not None
+    assert (own.stat().st_mode & 0o777) == 0o700
+
+
+def test_extract_key_depends_on_engine(monkeypatch):
+    import organize_stream.text_extract.text_extract as extract_mod
+    extractor = extract_mod.DocumentTextExtract(ocr_cache=None)
+    key = extractor.get_cache_key(b'x', is_document=False)
+    monkeypatch.setattr(extract_mod, 'get_ocr_engine_name', lambda: 'tesserocr')
+    assert extractor.get_cache_key(b'x', is_document=False) != key
+    monkeypatch.setattr(extract_mod, 'get_ocr_engine_version', lambda cmd=None: '4.1.1')
+    assert extractor.get_cache_key(b'x', is_document=False) != key
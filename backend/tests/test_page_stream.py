@@ -0,0 +1,45 @@
+from __future__ import annotations
+from io import BytesIO
+try:
+    import pymupdf as fitz
+except ImportError:
+    import fitz
+import convert_stream as cs
+from organize_stream.metrics import RASTERIZE_SECONDS
+from organize_stream.read import iter_images, iter_pages_png, render_page
+
+
+def _create_document(num_pages: int) -> cs.DocumentPdf:
+    doc = fitz.open()
+    for num in range(num_pages):
+        doc.new_page().insert_text((72, 72), f'PAGINA {num + 1}')
+    data = doc.tobytes()
+    doc.close()
+    return cs.DocumentPdf.create_from_bytes(BytesIO(data))
+
+
+def test_pages_rendered_on_demand():
+    document = _create_document(4)
+    before = RASTERIZE_SECONDS.get_count()
+    gen = iter_pages_png(document, dpi=30)
+    assert RASTERIZE_SECONDS.get_count() == before
+    page_idx, png_bytes = next(gen)
+    assert page_idx == 0
+    assert png_bytes.startswith(b'\x89PNG')
+    # Apenas a página atual foi renderizada.
+    assert RASTERIZE_SECONDS.get_count() == before + 1
+    assert [idx for idx, _ in gen] == [1, 2, 3]
+
+
+def test_selected_pages_match_render_page():
+    document = _create_document(4)
+    pages = list(iter_pages_png(document, dpi=30, pages=[3, 1]))
+    assert [idx for idx, _ in pages] == [3, 1]
+    assert pages[0][1] == render_page(document, 3, dpi=30)
+
+
+def test_images_keep_document_metadata():
+    document = _create_document(2)
+    images = list(iter_images(document, dpi=30))
+    assert [idx for idx, _ in images] == [0, 1]
+    assert all(img.metadata.name == document.metadata.name for _, img in images)
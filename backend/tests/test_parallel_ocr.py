@@ -0,0 +1,92 @@
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+from io import BytesIO
+try:
+    import pymupdf as fitz
+except ImportError:
+    import fitz
+import convert_stream as cs
+from sheet_stream import ColumnsTable, TableDocuments
+import organize_stream.read as read_mod
+from organize_stream.metrics import RASTERIZE_SECONDS
+
+
+def _create_document(num_pages: int) -> cs.DocumentPdf:
+    doc = fitz.open()
+    for num in range(num_pages):
+        doc.new_page().insert_text((72, 72), f'PAGINA DIGITALIZADA {num + 1}', fontsize=20)
+    data = doc.tobytes()
+    doc.close()
+    return cs.DocumentPdf.create_from_bytes(BytesIO(data))
+
+
+def _texts(document: cs.DocumentPdf, max_workers: int) -> list[tuple[str, list[str]]]:
+    result = []
+    for tb in read_mod.iter_document_tables(
+                document, dpi=40, max_workers=max_workers, use_text_layer=False,
+            ):
+        result.append((tb.get_column(ColumnsTable.NUM_PAGE)[0], list(tb.get_column(ColumnsTable.TEXT))))
+    return result
+
+
+def test_parallel_matches_sequential_in_page_order():
+    document = _create_document(5)
+    try:
+        sequential = _texts(document, 1)
+        parallel = _texts(document, 2)
+    finally:
+        read_mod._discard_pool_ocr(2)
+    assert [num for num, _ in sequential] == ['1', '2', '3', '4', '5']
+    assert parallel == sequential
+    # O substituto do tesseract gera um texto diferente para cada página.
+    assert len({tuple(lines) for _, lines in parallel}) == 5
+
+
+class _RecordingPool(ThreadPoolExecutor):
+    """Pool de uma thread no lugar do pool de processos, guarda os futures enviados."""
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.futures: list[Future] = []
+
+    def submit(self, *args, **kwargs) -> Future:
+        fut = super().submit(*args, **kwargs)
+        self.futures.append(fut)
+        return fut
+
+
+def _blocking_pool(monkeypatch):
+    pool = _RecordingPool()
+    release = threading.Event()
+    calls: list[int] = []
+
+    def _read(img, recognize=None) -> TableDocuments:
+        # A primeira página é lida na hora, as seguintes aguardam release.
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(5)
+        return TableDocuments.create_from_values(['TEXTO'], file_path='doc.pdf', dir_path='.', file_type='.pdf')
+
+    monkeypatch.setattr(read_mod, 'get_pool_ocr', lambda max_workers: pool)
+    return pool, release, _read
+
+
+def test_stopping_early_cancels_pending_pages(monkeypatch):
+    pool, release, func_read = _blocking_pool(monkeypatch)
+    document = _create_document(10)
+    max_pending = 2 * read_mod.PAGE_WINDOW_FACTOR
+    rendered_before = RASTERIZE_SECONDS.get_count()
+    gen = read_mod._iter_tables_parallel(document, func_read, dpi=20, max_workers=2)
+    try:
+        page_idx, tb = next(gen)
+        assert page_idx == 0
+        # Apenas a janela de páginas pendentes foi renderizada antes da primeira tabela.
+        assert RASTERIZE_SECONDS.get_count() - rendered_before == max_pending
+        assert len(pool.futures) == max_pending
+        gen.close()
+        # A página em execução termina, as demais (ainda na fila) são canceladas.
+        assert all(f.cancelled() for f in pool.futures[2:])
+    finally:
+        release.set()
+        pool.shutdown(wait=True)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+import asyncio
+try:
+    import pymupdf as fitz
+except ImportError:
+    import fitz
+import pytest
+import convert_stream as cs
+from organize_stream.library import route_jobs
+from organize_stream.library.route_executor import RouteExecutor
+
+
+def _create_pdf(path, num_pages: int) -> str:
+    doc = fitz.open()
+    for num in range(num_pages):
+        doc.new_page().insert_text((72, 72), f'PAGINA {num + 1}')
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+async def _collect(executor: RouteExecutor, func, *args, **kwargs) -> list[bytes]:
+    return [item async for item in executor.iter_blocking('teste', func, *args, **kwargs)]
+
+
+def test_thread_mode_opens_pdf_once(tmp_path, monkeypatch):
+    file_path = _create_pdf(tmp_path / 'doc.pdf', 5)
+    opened: list[str] = []
+    create_from_file = cs.DocumentPdf.create_from_file
+
+    def _spy(file, *args, **kwargs):
+        opened.append(file.absolute())
+        return create_from_file(file, *args, **kwargs)
+
+    monkeypatch.setattr(cs.DocumentPdf, 'create_from_file', _spy)
+    executor = RouteExecutor('thread', 2)
+    try:
+        pages = asyncio.run(_collect(executor, route_jobs.iter_split_pdf_pages, file_path))
+    finally:
+        executor.shutdown()
+    assert len(pages) == 5
+    assert all(p.startswith(b'%PDF') for p in pages)
+    assert opened == [file_path]
+
+
+@pytest.mark.parametrize('kind', ['thread', 'process'])
+def test_pages_png_in_order(tmp_path, kind):
+    file_path = _create_pdf(tmp_path / 'doc.pdf', 3)
+    executor = RouteExecutor(kind, 1)
+    try:
+        pages = asyncio.run(_collect(executor, route_jobs.iter_pdf_pages_png, file_path, 50, chunk_size=2))
+    finally:
+        executor.shutdown()
+    assert len(pages) == 3
+    assert all(p.startswith(b'\x89PNG') for p in pages)
+    expected = list(route_jobs.iter_pdf_pages_png(file_path, 50))
+    assert pages == expected
+
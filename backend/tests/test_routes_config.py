@@ -0,0 +1,29 @@
+from __future__ import annotations
+import json
+import os
+import pytest
+from benchmarks.load_test import FILE_ROUTES, warn_shadowed_routes
+
+ROOT_DIR: str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Configurações de rotas usadas pelo servidor e pelos builds do frontend.
+ROUTE_FILES: list[str] = [
+    FILE_ROUTES,
+    os.path.join(ROOT_DIR, 'frontend', 'assets', 'data', 'ips-lan.json'),
+    os.path.join(ROOT_DIR, 'releases', 'web', 'assets', 'assets', 'data', 'ips.json'),
+    os.path.join(ROOT_DIR, 'releases', 'web', 'assets', 'assets', 'data', 'ips-test.json'),
+]
+
+
+def test_shadowed_routes_are_reported():
+    routes = {'ip_server': 'x', 'rt_a': 'uploads/a', 'rt_b': 'uploads/a', 'rt_c': 'uploads/c'}
+    assert warn_shadowed_routes(routes) == [('rt_a', 'rt_b')]
+
+
+@pytest.mark.parametrize('file_path', ROUTE_FILES, ids=lambda p: os.path.relpath(p, ROOT_DIR))
+def test_route_paths_are_unique(file_path: str):
+    if not os.path.isfile(file_path):
+        pytest.skip(f'{file_path} não existe')
+    with open(file_path, encoding='utf-8') as f:
+        routes = json.load(f)
+    assert warn_shadowed_routes(routes) == []
+    assert routes['rt_convert_pdf'] != routes['rt_join_pdf']
@@ -0,0 +1,69 @@
+from __future__ import annotations
+import asyncio
+from io import BytesIO
+import os
+import shutil
+import uuid
+import pytest
+from PIL import Image
+from starlette.datastructures import UploadFile
+from organize_stream.erros import QueueFullError
+from organize_stream.library.task_dirs import ENV_TASK_ROOT, create_task_dir, get_tasks_root
+from organize_stream.library.task_state import get_task_state_backend
+
+# O server.py exige o tesseract ao ser importado.
+os.environ.setdefault('ORGANIZE_TESS_FILE', shutil.which('tesseract') or '/usr/bin/tesseract')
+server = pytest.importorskip('server')
+
+
+@pytest.fixture
+def tasks_root(tmp_path, monkeypatch):
+    monkeypatch.setenv(ENV_TASK_ROOT, str(tmp_path))
+    return tmp_path
+
+
+class _FullScheduler(object):
+
+    def submit(self, task_id: str, func, *args, **kwargs) -> int:
+        raise QueueFullError('fila cheia')
+
+
+def test_queue_full_removes_task_dir(tasks_root, monkeypatch):
+    monkeypatch.setattr(server, 'get_job_scheduler', lambda: _FullScheduler())
+    task_id = str(uuid.uuid4())
+    server.create_progress_with_id(task_id)
+    task_dir = create_task_dir(task_id)
+    with open(os.path.join(task_dir.absolute(), 'upload.pdf'), 'wb') as f:
+        f.write(b'%PDF-1.4')
+    response = server.submit_job(task_id, print)
+    assert response.status_code == 429
+    assert not os.path.exists(get_tasks_root().concat(task_id).absolute())
+    assert os.listdir(tasks_root) == []
+    assert get_task_state_backend().get(task_id) is None
+
+
+def _png_bytes() -> bytes:
+    buffer = BytesIO()
+    Image.new('RGB', (64, 32), 'white').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _run_ocr_route(uploads: list[tuple[str, bytes]]):
+    files = [UploadFile(file=BytesIO(data), filename=name) for name, data in uploads]
+    return asyncio.run(server.ocr_images(files=files))
+
+
+def test_ocr_rejects_invalid_image_before_streaming(tasks_root):
+    response = _run_ocr_route([('valida.png', _png_bytes()), ('invalida.png', b'nao e uma imagem')])
+    assert response.status_code == 400
+    assert b'invalida.png' in response.body
+    # O spool da requisição é removido junto com a resposta de erro.
+    assert os.listdir(tasks_root) == []
+
+
+def test_ocr_streams_valid_images(tasks_root):
+    response = _run_ocr_route([('valida.png', _png_bytes())])
+    assert response.status_code == 200
+    assert response.media_type == 'application/zip'
+    asyncio.run(response.background())
+    assert os.listdir(tasks_root) == []
@@ -0,0 +1,122 @@
+from __future__ import annotations
+import asyncio
+import json
+import uuid
+from starlette.requests import Request
+import organize_stream.library.progress_route as progress_mod
+from organize_stream.library.progress_route import (
+    create_progress_with_id, delete_progress_state, finish_task_with_zip, iter_progress_events,
+    stream_progress_events,
+)
+from organize_stream.library.task_events import TaskEventBus, format_sse, get_task_event_bus, publish_task_event
+
+
+def _parse_sse(messages: list[str]) -> list[tuple[str, dict | None]]:
+    """Lista (evento, dados) das mensagens, ignorando os comentários de ping."""
+    result = []
+    for message in messages:
+        fields = dict(line.split(': ', 1) for line in message.strip().split('\n') if not line.startswith(':'))
+        if 'event' in fields:
+            result.append((fields['event'], json.loads(fields['data'])))
+    return result
+
+
+async def _collect(source) -> list[str]:
+    return [message async for message in source]
+
+
+def test_format_sse():
+    assert format_sse('page', {'percent': 50}) == 'event: page\ndata: {"percent": 50}\n\n'
+    assert format_sse('done', {'ok': True}, event_id=7) == 'id: 7\nevent: done\ndata: {"ok": true}\n\n'
+
+
+def test_bus_replays_history_after_last_seq():
+    bus = TaskEventBus(history=3)
+
+    async def _run():
+        seqs = [bus.publish('t1', 'page', {'n': n}).seq for n in range(5)]
+        bus.publish('t2', 'page', {'n': 99})
+        # Apenas os 3 últimos eventos ficam guardados, e só os de número maior que last_seq são repetidos.
+        subscription = bus.subscribe('t1', last_seq=seqs[3])
+        replay = subscription.drain()
+        assert [e.data['n'] for e in replay] == [4]
+        bus.publish('t1', 'file_named', {'n': 5})
+        event = await subscription.get(1)
+        assert (event.event, event.data) == ('file_named', {'n': 5})
+        bus.unsubscribe(subscription)
+        assert [e.data['n'] for e in bus.subscribe('t1').drain()] == [3, 4, 5]
+        bus.discard('t1')
+        assert bus.subscribe('t1').drain() == []
+
+    asyncio.run(_run())
+
+
+def test_bus_keeps_only_recent_tasks():
+    bus = TaskEventBus(max_tasks=2)
+
+    async def _run():
+        for task_id in ('a', 'b', 'c'):
+            bus.publish(task_id, 'page')
+        assert bus.subscribe('a').drain() == []
+        assert len(bus.subscribe('c').drain()) == 1
+
+    asyncio.run(_run())
+
+
+def _worker(task_id: str, state) -> None:
+    # Eventos publicados de uma vez, antes que o stream leia a fila.
+    publish_task_event(task_id, 'file_named', index=1, new_name='a.pdf')
+    publish_task_event(task_id, 'file_named', index=2, new_name='b.pdf')
+    finish_task_with_zip(state, task_id, '/tmp/resultado.zip')
+
+
+def test_stream_sends_late_events_before_done(monkeypatch):
+    monkeypatch.setattr(progress_mod, 'SSE_POLL_INTERVAL', 0.05)
+    task_id = str(uuid.uuid4())
+    state = create_progress_with_id(task_id)
+
+    async def _run() -> list[str]:
+        messages: list[str] = []
+        async for message in iter_progress_events(task_id):
+            messages.append(message)
+            if len(messages) == 1:
+                await asyncio.get_running_loop().run_in_executor(None, _worker, task_id, state)
+        return messages
+
+    try:
+        events = _parse_sse(asyncio.run(_run()))
+    finally:
+        delete_progress_state(task_id)
+    names = [name for name, _ in events]
+    assert names.count('file_named') == 2
+    assert names.index('zip_ready') < names.index('done')
+    assert names[-1] == 'done'
+    assert events[-1][1]['done'] is True
+
+
+def test_last_event_id_replays_missing_events(monkeypatch):
+    monkeypatch.setattr(progress_mod, 'SSE_POLL_INTERVAL', 0.05)
+    task_id = str(uuid.uuid4())
+    state = create_progress_with_id(task_id)
+    bus = get_task_event_bus()
+    first = bus.publish(task_id, 'file_named', {'index': 1})
+    bus.publish(task_id, 'file_named', {'index': 2})
+    finish_task_with_zip(state, task_id, '/tmp/resultado.zip')
+    request = Request({'type': 'http', 'headers': [(b'last-event-id', str(first.seq).encode())]})
+
+    async def _run() -> list[str]:
+        response = await stream_progress_events(task_id, request)
+        return await _collect(response.body_iterator)
+
+    try:
+        events = _parse_sse(asyncio.run(_run()))
+    finally:
+        delete_progress_state(task_id)
+    assert [data['index'] for name, data in events if name == 'file_named'] == [2]
+    assert [name for name, _ in events] == ['file_named', 'zip_ready', 'progress', 'done']
+
+
+def test_unknown_task_ends_with_not_found(monkeypatch):
+    monkeypatch.setattr(progress_mod, 'SSE_POLL_INTERVAL', 0.05)
+    events = _parse_sse(asyncio.run(_collect(iter_progress_events('nao-existe'))))
+    assert events == [('not_found', {'task_id': 'nao-existe'})]
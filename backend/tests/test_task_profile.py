@@ -0,0 +1,74 @@
+from __future__ import annotations
+import threading
+import zipfile
+from organize_stream.library.task_profile import (
+    ENV_TASK_PROFILE, add_profile_to_zip, is_profile_enabled, start_task_profile, stop_task_profile,
+)
+
+
+def _work() -> int:
+    return sum(i * i for i in range(20000))
+
+
+def test_profile_enabled_by_flag_or_env(monkeypatch):
+    monkeypatch.delenv(ENV_TASK_PROFILE, raising=False)
+    assert is_profile_enabled(True) is True
+    assert is_profile_enabled(False) is False
+    assert is_profile_enabled(None) is False
+    monkeypatch.setenv(ENV_TASK_PROFILE, 'true')
+    assert is_profile_enabled(False) is True
+    monkeypatch.setenv(ENV_TASK_PROFILE, '0')
+    assert is_profile_enabled(None) is False
+
+
+def test_disabled_profile_has_no_cost(tmp_path):
+    assert start_task_profile(False) is None
+    stop_task_profile(None)
+    assert add_profile_to_zip(None, str(tmp_path / 'resultado.zip')) is False
+
+
+def test_profile_is_added_to_zip(tmp_path):
+    zip_path = str(tmp_path / 'resultado.zip')
+    with zipfile.ZipFile(zip_path, 'w') as zipf:
+        zipf.writestr('documento.pdf', b'%PDF')
+    profiler = start_task_profile(True)
+    assert profiler is not None
+    _work()
+    assert add_profile_to_zip(profiler, zip_path) is True
+    with zipfile.ZipFile(zip_path) as zipf:
+        assert sorted(zipf.namelist()) == ['documento.pdf', 'profile.prof', 'profile.txt']
+        assert '_work' in zipf.read('profile.txt').decode('utf-8')
+
+
+def test_concurrent_tasks_fall_back_to_no_profile():
+    first = start_task_profile(True)
+    results: list = []
+    try:
+        # Outra tarefa (outra thread) pede o perfil enquanto o primeiro está ativo.
+        thread = threading.Thread(target=lambda: results.append(start_task_profile(True)))
+        thread.start()
+        thread.join()
+    finally:
+        stop_task_profile(first)
+    assert first is not None
+    assert results == [None]
+    # Depois de finalizado o perfil fica disponível para a próxima tarefa.
+    second = start_task_profile(True)
+    assert second is not None
+    stop_task_profile(second)
+    stop_task_profile(second)
+
+
+def test_enable_error_falls_back_to_no_profile(monkeypatch):
+    import cProfile
+
+    class _BusyProfile(cProfile.Profile):
+        def enable(self, *args, **kwargs):
+            raise ValueError('Another profiling tool is already active')
+
+    monkeypatch.setattr(cProfile, 'Profile', _BusyProfile)
+    assert start_task_profile(True) is None
+    monkeypatch.undo()
+    profiler = start_task_profile(True)
+    assert profiler is not None
+    stop_task_profile(profiler)
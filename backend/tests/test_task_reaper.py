@@ -0,0 +1,101 @@
+from __future__ import annotations
+import os
+import time
+import soup_files as sp
+from organize_stream.library.task_dirs import TaskReaper, set_task_dir_active
+from organize_stream.library.task_state import MemoryTaskState
+
+
+def _create_dir(root, name: str, *, size: int = 10, age: float = 0) -> str:
+    path = root / name
+    path.mkdir()
+    file_path = path / 'arquivo.bin'
+    file_path.write_bytes(b'x' * size)
+    mtime = time.time() - age
+    os.utime(file_path, (mtime, mtime))
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def _reaper(root, backend: MemoryTaskState, **kwargs) -> TaskReaper:
+    kwargs.setdefault('ttl', 3600)
+    kwargs.setdefault('grace', 60)
+    return TaskReaper(sp.Directory(str(root)), backend=backend, **kwargs)
+
+
+def test_removes_expired_dirs_and_later_the_state(tmp_path):
+    backend = MemoryTaskState()
+    backend.set('antiga', {'done': True, 'zip_path': 'resultado.zip'})
+    backend.set('nova', {'done': True})
+    _create_dir(tmp_path, 'antiga', age=7200)
+    _create_dir(tmp_path, 'nova', age=120)
+    reaper = _reaper(tmp_path, backend, state_grace=600)
+    now = time.time()
+
+    assert reaper.reap_once(now) == ['antiga']
+    assert not (tmp_path / 'antiga').exists()
+    assert (tmp_path / 'nova').exists()
+    state = backend.get('antiga')
+    assert state['expired'] is True
+    assert state['zip_path'] is None
+
+    # O estado expirado continua disponível (HTTP 410) até o fim de state_grace.
+    reaper.reap_once(now + 300)
+    assert backend.contains('antiga')
+    reaper.reap_once(now + 601)
+    assert not backend.contains('antiga')
+
+
+def test_quota_skips_running_recent_and_active_dirs(tmp_path):
+    backend = MemoryTaskState()
+    backend.set('executando', {'done': False})
+    _create_dir(tmp_path, 'executando', size=100, age=600)
+    _create_dir(tmp_path, 'finalizada', size=100, age=600)
+    _create_dir(tmp_path, 'recente', size=100, age=5)
+    _create_dir(tmp_path, 'req-aberto', size=100, age=600)
+    set_task_dir_active('req-aberto', True)
+    try:
+        removed = _reaper(tmp_path, backend, max_bytes=0).reap_once()
+    finally:
+        set_task_dir_active('req-aberto', False)
+    assert removed == ['finalizada']
+    for name in ('executando', 'recente', 'req-aberto'):
+        assert (tmp_path / name).exists()
+
+
+def test_closed_spool_is_reaped_by_quota(tmp_path):
+    _create_dir(tmp_path, 'req-fechado', size=100, age=600)
+    assert _reaper(tmp_path, MemoryTaskState(), max_bytes=0).reap_once() == ['req-fechado']
+
+
+def test_recent_file_in_old_dir_is_kept(tmp_path):
+    path = _create_dir(tmp_path, 'req-gravando', size=100, age=7200)
+    # Arquivo ainda sendo gravado: o diretório é antigo, mas o arquivo foi modificado agora.
+    with open(os.path.join(path, 'parcial.bin'), 'wb') as fp:
+        fp.write(b'y')
+    old = time.time() - 7200
+    os.utime(path, (old, old))
+    assert _reaper(tmp_path, MemoryTaskState(), max_bytes=0).reap_once() == []
+
+
+def test_stale_running_task_is_reaped(tmp_path):
+    backend = MemoryTaskState()
+    now = time.time()
+    # Tarefa órfã (o processo terminou sem marcar 'done') e tarefa com progresso recente.
+    backend.set('orfa', {'done': False, 'created_at': now - 7200, 'updated_at': now - 7200})
+    backend.set('ativa', {'done': False, 'created_at': now - 7200, 'updated_at': now - 30})
+    _create_dir(tmp_path, 'orfa', size=100, age=7200)
+    _create_dir(tmp_path, 'ativa', size=100, age=7200)
+    reaper = _reaper(tmp_path, backend, ttl=10 * 3600, max_bytes=0, stale=3600)
+    assert reaper.reap_once(now) == ['orfa']
+    assert backend.get('orfa')['expired'] is True
+    assert backend.get('ativa')['done'] is False
+    assert (tmp_path / 'ativa').exists()
+
+
+def test_state_without_heartbeat_uses_dir_mtime(tmp_path):
+    backend = MemoryTaskState()
+    backend.set('antiga', {'done': False})
+    _create_dir(tmp_path, 'antiga', size=100, age=7200)
+    assert _reaper(tmp_path, backend, max_bytes=0, stale=3600).reap_once() == ['antiga']
+
@@ -0,0 +1,58 @@
+from __future__ import annotations
+import pytest
+from organize_stream.library.task_state import (
+    MemoryTaskState, SqliteTaskState, ProgressState, get_task_state_backend,
+)
+from organize_stream.library.progress_route import get_progress_snapshot
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def backend(request, tmp_path):
+    if request.param == 'sqlite':
+        return SqliteTaskState(str(tmp_path / 'tasks.db'))
+    return MemoryTaskState()
+
+
+def test_set_update_and_delete(backend):
+    backend.set('t1', {'current': 0, 'done': False})
+    backend.update('t1', {'current': 3})
+    assert backend.get('t1') == {'current': 3, 'done': False}
+    assert backend.contains('t1')
+    assert backend.keys() == ['t1']
+    backend.delete('t1')
+    assert backend.get('t1') is None
+    assert backend.keys() == []
+
+
+def test_update_missing_task_is_ignored(backend):
+    backend.update('nao-existe', {'done': True})
+    assert backend.get('nao-existe') is None
+    assert not backend.contains('nao-existe')
+    # Estado removido enquanto a thread da tarefa ainda grava o progresso.
+    state = ProgressState(backend, 't2', {'current': 0})
+    backend.set('t2', dict(state))
+    backend.delete('t2')
+    state['current'] = 5
+    assert backend.get('t2') is None
+
+
+def test_progress_state_writes_to_backend(backend):
+    backend.set('t3', {'current': 0})
+    state = ProgressState(backend, 't3', backend.get('t3'))
+    state['current'] = 2
+    state.update({'done': True})
+    saved = backend.get('t3')
+    # Cada alteração grava também o horário da última atualização (usado pelo TaskReaper).
+    assert saved.pop('updated_at') > 0
+    assert saved == {'current': 2, 'done': True}
+
+
+def test_snapshot_with_partial_state():
+    get_task_state_backend().set('parcial', {'status': 'queued'})
+    snapshot = get_progress_snapshot('parcial')
+    assert snapshot['current'] == 0
+    assert snapshot['total'] == 0
+    assert snapshot['done'] is False
+    assert snapshot['progress'] == 0
+    get_task_state_backend().delete('parcial')
+    assert get_progress_snapshot('parcial') is None
@@ -0,0 +1,95 @@
+from __future__ import annotations
+from io import BytesIO
+try:
+    import pymupdf as fitz
+except ImportError:
+    import fitz
+import convert_stream as cs
+from sheet_stream import ColumnsTable, TableDocuments
+from organize_stream.metrics import PAGES_ESCALATED
+from organize_stream.text_extract import DocumentTextExtract
+
+TEXT_LAYER_LINE: str = 'PROTOCOLO 2024000123 CARTA DE TESTE DIGITAL'
+
+
+def _create_document(*, digital_pages: int = 0, scanned_pages: int = 0) -> cs.DocumentPdf:
+    """PDF com páginas digitais (camada de texto) seguidas de páginas sem texto (digitalizadas)."""
+    doc = fitz.open()
+    for _ in range(digital_pages):
+        doc.new_page().insert_text((72, 72), TEXT_LAYER_LINE, fontsize=12)
+    for _ in range(scanned_pages):
+        page = doc.new_page()
+        page.draw_rect(fitz.Rect(72, 72, 300, 120), color=(0, 0, 0), fill=(0, 0, 0))
+    data = doc.tobytes()
+    doc.close()
+    return cs.DocumentPdf.create_from_bytes(BytesIO(data))
+
+
+class _FakeOcr(object):
+    """
+    Substitui read_image(): guarda a largura de cada imagem recebida e retorna
+    'lines_low' nas primeiras 'num_low' chamadas e 'lines_good' nas seguintes.
+    """
+
+    def __init__(self, *, lines_good: list[str], lines_low: list[str] | None = None, num_low: int = 0):
+        self.lines_good: list[str] = lines_good
+        self.lines_low: list[str] = lines_low or []
+        self.num_low: int = num_low
+        self.widths: list[int] = []
+
+    def __call__(self, img: cs.ImageObject, recognize=None) -> TableDocuments:
+        self.widths.append(img.get_dimensions()[0])
+        lines = self.lines_low if len(self.widths) <= self.num_low else self.lines_good
+        return TableDocuments.create_from_values(list(lines), file_path='doc.pdf', dir_path='.', file_type='.pdf')
+
+
+def _extractor(fake: _FakeOcr, **kwargs) -> DocumentTextExtract:
+    return DocumentTextExtract(notify_observers=False, func_read_image=fake, **kwargs)
+
+
+def test_text_layer_skips_ocr():
+    fake = _FakeOcr(lines_good=['NAO DEVERIA SER USADO'])
+    extractor = _extractor(fake)
+    tb = extractor.read_document(_create_document(digital_pages=2))
+    assert fake.widths == []
+    assert TEXT_LAYER_LINE in list(tb.get_column(ColumnsTable.TEXT))
+    assert extractor.stats.pages_text_layer == 2
+    assert extractor.stats.pages_ocr == 0
+
+
+def test_scanned_page_falls_back_to_ocr():
+    fake = _FakeOcr(lines_good=['PROTOCOLO 999 PAGINA DIGITALIZADA'])
+    extractor = _extractor(fake)
+    tb = extractor.read_document(_create_document(digital_pages=1, scanned_pages=1))
+    # Apenas a página sem texto é renderizada.
+    assert len(fake.widths) == 1
+    assert extractor.stats.pages_text_layer == 1
+    assert extractor.stats.pages_ocr == 1
+    assert list(tb.get_column(ColumnsTable.NUM_PAGE)).count('2') == 1
+    assert 'PROTOCOLO 999 PAGINA DIGITALIZADA' in list(tb.get_column(ColumnsTable.TEXT))
+
+
+def test_low_quality_page_escalates_dpi():
+    fake = _FakeOcr(
+        lines_low=['| ~ . ; i'],
+        lines_good=['PROTOCOLO 12345 DOCUMENTO LIDO COM DPI MAIOR'],
+        num_low=1,
+    )
+    extractor = _extractor(fake, dpi_steps=[50, 100])
+    before: float = PAGES_ESCALATED.get()
+    tb = extractor.read_document(_create_document(scanned_pages=1))
+    assert len(fake.widths) == 2
+    assert fake.widths[1] > fake.widths[0]
+    assert extractor.escalated_pages == 1
+    assert extractor.stats.pages_escalated == 1
+    assert extractor.stats.pages_ocr == 1
+    assert PAGES_ESCALATED.get() == before + 1
+    assert list(tb.get_column(ColumnsTable.TEXT)) == ['PROTOCOLO 12345 DOCUMENTO LIDO COM DPI MAIOR']
+
+
+def test_good_page_is_not_escalated():
+    fake = _FakeOcr(lines_good=['PROTOCOLO 12345 DOCUMENTO LIDO NO PRIMEIRO DPI'])
+    extractor = _extractor(fake, dpi_steps=[50, 100])
+    extractor.read_document(_create_document(scanned_pages=1))
+    assert len(fake.widths) == 1
+    assert extractor.escalated_pages == 0
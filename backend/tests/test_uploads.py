@@ -0,0 +1,46 @@
+from __future__ import annotations
+import asyncio
+from io import BytesIO
+import pytest
+import soup_files as sp
+from starlette.datastructures import UploadFile
+from organize_stream.erros import UploadTooLargeError
+from organize_stream.library.uploads import (
+    ENV_UPLOAD_MAX_MB, UploadSpool, get_upload_filename, get_upload_max_bytes,
+)
+
+
+def _upload(data: bytes, filename: str = 'doc.pdf') -> UploadFile:
+    return UploadFile(file=BytesIO(data), filename=filename)
+
+
+def test_saves_in_chunks_and_renames_duplicates(tmp_path):
+    spool = UploadSpool(sp.Directory(str(tmp_path)), max_bytes=100, chunk_size=7)
+    files = asyncio.run(spool.save_all([_upload(b'a' * 30), None, _upload(b'b' * 20)]))
+    assert [f.basename() for f in files] == ['doc.pdf', 'doc_1.pdf']
+    assert (tmp_path / 'doc.pdf').read_bytes() == b'a' * 30
+    assert spool.total_bytes == 50
+
+
+def test_rejects_request_above_limit(tmp_path):
+    spool = UploadSpool(sp.Directory(str(tmp_path)), max_bytes=40, chunk_size=8)
+    asyncio.run(spool.save(_upload(b'a' * 30, 'primeiro.pdf')))
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(spool.save(_upload(b'b' * 30, 'segundo.pdf')))
+    # O arquivo parcial é removido, os anteriores continuam até cleanup().
+    assert not (tmp_path / 'segundo.pdf').exists()
+    assert (tmp_path / 'primeiro.pdf').exists()
+    spool.cleanup()
+    assert not tmp_path.exists()
+
+
+def test_upload_filename_without_directories():
+    assert get_upload_filename('../../etc/passwd', 'padrao') == 'passwd'
+    assert get_upload_filename('C:\\docs\\carta.pdf', 'padrao') == 'carta.pdf'
+    assert get_upload_filename('..', 'padrao') == 'padrao'
+    assert get_upload_filename(None, 'padrao') == 'padrao'
+
+
+def test_max_bytes_from_env(monkeypatch):
+    monkeypatch.setenv(ENV_UPLOAD_MAX_MB, '3')
+    assert get_upload_max_bytes() == 3 * 1024 * 1024
@@ -0,0 +1,90 @@
+from __future__ import annotations
+import asyncio
+import io
+import zipfile
+import pytest
+from organize_stream.library.zip_stream import ZipStreamBuffer, aiter_zip_stream, iter_zip_stream
+
+_ENTRIES: list[tuple[str, bytes]] = [
+    ('pagina_1.png', b'\x89PNG' + b'1' * 1000),
+    ('pagina_2.png', b'\x89PNG' + b'2' * 2000),
+    ('dados/texto.txt', 'DOCUMENTO DIGITALIZADO'.encode('utf-8')),
+]
+
+
+async def _aiter(entries: list[tuple[str, bytes]], *, fail_at: int | None = None):
+    for idx, entry in enumerate(entries):
+        if idx == fail_at:
+            raise RuntimeError('falha na entrada')
+        await asyncio.sleep(0)
+        yield entry
+
+
+async def _collect(source) -> list[bytes]:
+    return [chunk async for chunk in source]
+
+
+def _read_zip(chunks: list[bytes]) -> dict[str, bytes]:
+    with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as zipf:
+        assert zipf.testzip() is None
+        return {name: zipf.read(name) for name in zipf.namelist()}
+
+
+def test_buffer_take_returns_written_bytes_once():
+    buffer = ZipStreamBuffer()
+    buffer.write(b'abc')
+    buffer.write(memoryview(b'de'))
+    assert buffer.tell() == 5
+    assert buffer.take() == b'abcde'
+    assert buffer.take() == b''
+    # A posição continua contando os bytes já retirados.
+    assert buffer.tell() == 5
+    assert not buffer.seekable()
+
+
+@pytest.mark.parametrize('compression', [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_iter_zip_stream_creates_valid_zip(compression: int):
+    chunks = list(iter_zip_stream(iter(_ENTRIES), compression=compression))
+    # Uma parte por entrada mais o diretório central.
+    assert len(chunks) == len(_ENTRIES) + 1
+    assert _read_zip(chunks) == dict(_ENTRIES)
+
+
+def test_aiter_zip_stream_matches_sync_stream():
+    chunks = asyncio.run(_collect(aiter_zip_stream(_aiter(_ENTRIES))))
+    assert _read_zip(chunks) == dict(_ENTRIES)
+
+
+def test_empty_input_creates_empty_zip():
+    assert _read_zip(list(iter_zip_stream([]))) == {}
+    assert _read_zip(asyncio.run(_collect(aiter_zip_stream(_aiter([]))))) == {}
+
+
+def _failing_entries():
+    yield _ENTRIES[0]
+    raise RuntimeError('falha na entrada')
+
+
+def test_iter_zip_stream_propagates_errors():
+    chunks: list[bytes] = []
+    with pytest.raises(RuntimeError):
+        for chunk in iter_zip_stream(_failing_entries()):
+            chunks.append(chunk)
+    # A primeira entrada já foi enviada, mas o zip fica sem o diretório central.
+    assert len(chunks) == 1
+    with pytest.raises(zipfile.BadZipFile):
+        zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+
+
+def test_aiter_zip_stream_propagates_errors():
+    chunks: list[bytes] = []
+
+    async def _consume():
+        async for chunk in aiter_zip_stream(_aiter(_ENTRIES, fail_at=1)):
+            chunks.append(chunk)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(_consume())
+    assert len(chunks) == 1
+    with pytest.raises(zipfile.BadZipFile):
+        zipfile.ZipFile(io.BytesIO(b''.join(chunks)))